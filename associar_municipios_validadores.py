@@ -1,139 +1,443 @@
 import os
+import time
+import unicodedata
+from bisect import bisect_right
 from collections import defaultdict
 from datetime import datetime
 
+import snapshot_associador
+from indices_busca import CatalogoValidadores, IndiceTrigramas, ResumoValidadores
+from registros import Municipio, RegistroValidador, VisaoResultados, internar
+from tabelas_tfix import ErroLinha, esquema_tabela
+
+def remover_acentos(texto):
+    """Remove acentos de uma string"""
+    nfkd = unicodedata.normalize('NFKD', texto)
+    return ''.join([c for c in nfkd if not unicodedata.combining(c)])
+
+def normalizar_nome(texto: str) -> str:
+    """Normaliza um nome para busca: maiúsculas, sem acentos e sem espaços nas pontas"""
+    return remover_acentos(texto.upper().strip())
+
+# Tamanho do buffer de leitura dos arquivos de dados
+TAMANHO_BLOCO_LEITURA = 1 << 20
+
+# Quantidade máxima de linhas inválidas guardadas com detalhes (as demais só são contadas)
+LIMITE_ERROS_GUARDADOS = 1000
+
+
+def formatar_data(data_str: str) -> str:
+    """Formata uma data do formato YYYYMMDD para DD/MM/YYYY"""
+    if not data_str or data_str == '' or len(data_str) < 8:
+        return ''
+    
+    try:
+        # Remove espaços e verifica se é uma data válida
+        data_str = data_str.strip()
+        if data_str == '19000101':  # Data padrão para "sem data"
+            return ''
+        
+        ano = data_str[:4]
+        mes = data_str[4:6]
+        dia = data_str[6:8]
+        
+        # Valida se são números
+        if ano.isdigit() and mes.isdigit() and dia.isdigit():
+            return f"{dia}/{mes}/{ano}"
+        else:
+            return ''
+    except:
+        return ''
+
+def ler_campos(caminho: str, minimo_campos: int, ao_erro=None):
+    """Lê um arquivo de dados em streaming, gerando os campos de cada linha
+    
+    O arquivo é lido com um buffer grande e percorrido linha a linha, sem
+    carregar o conteúdo inteiro em memória. Linhas em branco são ignoradas;
+    linhas com menos de `minimo_campos` campos são enviadas para `ao_erro`.
+    
+    Yields:
+        Tupla (número da linha, lista de campos separados por tabulação)
+    """
+    with open(caminho, 'r', encoding='latin-1', buffering=TAMANHO_BLOCO_LEITURA) as arquivo:
+        for numero_linha, linha in enumerate(arquivo, start=1):
+            linha = linha.strip()
+            if not linha:
+                continue
+            campos = linha.split('\t')
+            if len(campos) < minimo_campos:
+                if ao_erro:
+                    ao_erro(ErroLinha(caminho, numero_linha,
+                                      f"esperados ao menos {minimo_campos} campos, encontrados {len(campos)}",
+                                      linha))
+                continue
+            yield numero_linha, campos
+
+def parsear_municipios(caminho: str, ao_erro=None):
+    """Gera os municípios (registros Municipio) do arquivo TACES06
+    
+    Linhas malformadas são enviadas para `ao_erro` (ErroLinha) e ignoradas.
+    """
+    # Posições das colunas no arquivo texto, conforme o esquema em tfixes.xml
+    esquema = esquema_tabela('TACES06')
+    p_estado = esquema.posicao('cod_estado')
+    p_municipio = esquema.posicao('cod_municipio')
+    p_descricao = esquema.posicao('descricao')
+    
+    for numero_linha, campos in ler_campos(caminho, 8, ao_erro):
+        try:
+            cod_municipio = int(campos[p_municipio]) if campos[p_municipio].strip() else 0
+        except ValueError:
+            if ao_erro:
+                ao_erro(ErroLinha(caminho, numero_linha,
+                                  f"código de município inválido: {campos[p_municipio].strip()!r}", '\t'.join(campos)))
+            continue
+        yield Municipio(campos[p_estado].strip(), cod_municipio, campos[p_descricao].strip())
+
+def parsear_validadores(caminho: str, ao_erro=None):
+    """Gera os validadores do arquivo TFIX105 como (chave do município, RegistroValidador)
+    
+    Linhas malformadas são enviadas para `ao_erro` (ErroLinha) e ignoradas.
+    """
+    # Posições das colunas no arquivo texto, conforme o esquema em tfixes.xml.
+    # Os nomes dos campos do RegistroValidador são anteriores ao esquema:
+    #   data_inicial    <- coluna valid_validador (início da validade)
+    #   valid_validador <- coluna valid_final (fim da validade)
+    #   valid_final     <- coluna ind_gera_cc (indicador S/N)
+    esquema = esquema_tabela('TFIX105')
+    p_estado = esquema.posicao('cod_estado')
+    p_municipio = esquema.posicao('cod_municipio')
+    p_codigo = esquema.posicao('cod_validador')
+    p_descricao = esquema.posicao('desc_validador')
+    p_inicio = esquema.posicao('valid_validador')
+    p_fim = esquema.posicao('valid_final')
+    p_indicador = esquema.posicao('ind_gera_cc')
+    
+    for numero_linha, campos in ler_campos(caminho, 6, ao_erro):
+        try:
+            cod_municipio = int(campos[p_municipio]) if campos[p_municipio].strip() else 0
+        except ValueError:
+            if ao_erro:
+                ao_erro(ErroLinha(caminho, numero_linha,
+                                  f"código de município inválido: {campos[p_municipio].strip()!r}", '\t'.join(campos)))
+            continue
+        
+        valid_validador = ''
+        if len(campos) > p_fim:
+            valid_validador = formatar_data(campos[p_fim].strip())
+        
+        valid_final = 'N'
+        if len(campos) > p_indicador:
+            valid_final = campos[p_indicador].strip() if campos[p_indicador].strip() in ['S', 'N'] else 'N'
+        
+        chave = (internar(campos[p_estado].strip()), cod_municipio)
+        yield chave, RegistroValidador(
+            campos[p_codigo].strip(),
+            campos[p_descricao].strip(),
+            formatar_data(campos[p_inicio].strip()),
+            valid_validador,  # Data de validação
+            valid_final  # Status S/N
+        )
+
 class AssociadorMunicipiosValidadores:
     """Classe para associar dados de municípios com validadores"""
     
-    def __init__(self, arquivo_municipios: str, arquivo_validadores: str):
+    def __init__(self, arquivo_municipios: str, arquivo_validadores: str, ao_erro=None, ao_progresso=None):
         self.arquivo_municipios = arquivo_municipios
         self.arquivo_validadores = arquivo_validadores
         self.municipios = {}
         self.validadores = defaultdict(list)
         self.resultados = []
         
+        # Índices de busca (construídos em construir_indices)
+        self.indice_nomes = {}  # nome normalizado -> [(cod_estado, cod_municipio), ...]
+        self.nomes_normalizados = []  # [(nome normalizado, chave)] na ordem do arquivo
+        self.indice_trigramas = IndiceTrigramas()  # ids = posições em nomes_normalizados
+        self.validadores_por_municipio = {}  # chave -> registros com validador, sem duplicatas
+        self.catalogo_validadores = CatalogoValidadores()
+        self.candidatos_atual = {}  # chave -> registros que podem ser o validador atual, por preferência
+        self.vencimentos = []  # dias (ordinais) em que algum validador expira, ordenados
+        self.resumo_validadores = None  # totais por validador e por UF (ResumoValidadores)
+        
+        # Versão dos dados (hash do conteúdo das fontes, definida em carregar_dados)
+        self.versao_dados = None
+        
+        # Dataset mapeado em uso (caminho), quando os dados vêm de anexar_dataset
+        self.dataset_mapeado = None
+        
+        # Acompanhamento da carga (consultado pelo status do servidor MCP)
+        self.fase_carga = 'pendente'
+        self.tempos_carga = {}  # fase -> duração em ms
+        
+        # Linhas inválidas encontradas na leitura (ErroLinha); `ao_erro` substitui
+        # o destino padrão (registrar_erro)
+        self.erros_carga = []
+        self.total_erros_carga = 0
+        self.ao_erro = ao_erro or self.registrar_erro
+        
+        # Mensagens de progresso da carga (contagens, origem dos dados); padrão:
+        # print. O servidor MCP as envia para stderr, fora do canal do protocolo
+        self.ao_progresso = ao_progresso or print
+    
+    def registrar_erro(self, erro: ErroLinha):
+        """Destino padrão das linhas inválidas: guarda os primeiros erros e conta todos"""
+        self.total_erros_carga += 1
+        if len(self.erros_carga) < LIMITE_ERROS_GUARDADOS:
+            self.erros_carga.append(erro)
+    
     def carregar_municipios(self):
         """Carrega dados dos municípios do arquivo TACES06.TXT"""
         try:
-            with open(self.arquivo_municipios, 'r', encoding='latin-1') as arquivo:
-                linhas = arquivo.readlines()
-                
-            for linha in linhas:
-                if linha.strip():
-                    campos = linha.strip().split('\t')
-                    if len(campos) >= 8:
-                        cod_estado = campos[0].strip()
-                        cod_municipio = int(campos[1]) if campos[1].strip() else 0
-                        descricao = campos[2].strip()
-                        
-                        chave = (cod_estado, cod_municipio)
-                        self.municipios[chave] = {
-                            'cod_estado': cod_estado,
-                            'cod_municipio': cod_municipio,
-                            'descricao': descricao
-                        }
+            erros_antes = self.total_erros_carga
+            for municipio in parsear_municipios(self.arquivo_municipios, self.ao_erro):
+                self.municipios[(municipio.cod_estado, municipio.cod_municipio)] = municipio
             
-            print(f"Total de municípios carregados: {len(self.municipios)}")
+            self.ao_progresso(f"Total de municípios carregados: {len(self.municipios)}")
+            if self.total_erros_carga > erros_antes:
+                self.ao_progresso(f"Linhas inválidas ignoradas em {self.arquivo_municipios}: "
+                                  f"{self.total_erros_carga - erros_antes}")
             return True
-            
+        
         except Exception as e:
-            print(f"Erro ao carregar municípios: {e}")
+            self.ao_progresso(f"Erro ao carregar municípios: {e}")
             return False
     
     def formatar_data(self, data_str: str) -> str:
         """Formata uma data do formato YYYYMMDD para DD/MM/YYYY"""
-        if not data_str or data_str == '' or len(data_str) < 8:
-            return ''
-        
-        try:
-            # Remove espaços e verifica se é uma data válida
-            data_str = data_str.strip()
-            if data_str == '19000101':  # Data padrão para "sem data"
-                return ''
-            
-            ano = data_str[:4]
-            mes = data_str[4:6]
-            dia = data_str[6:8]
-            
-            # Valida se são números
-            if ano.isdigit() and mes.isdigit() and dia.isdigit():
-                return f"{dia}/{mes}/{ano}"
-            else:
-                return ''
-        except:
-            return ''
+        return formatar_data(data_str)
     
     def carregar_validadores(self):
         """Carrega dados dos validadores do arquivo TFIX105.txt"""
         try:
-            with open(self.arquivo_validadores, 'r', encoding='latin-1') as arquivo:
-                linhas = arquivo.readlines()
-                
-            for linha in linhas:
-                if linha.strip():
-                    campos = linha.strip().split('\t')
-                    if len(campos) >= 6:
-                        cod_estado = campos[0].strip()
-                        cod_municipio = int(campos[1]) if campos[1].strip() else 0
-                        cod_validador = campos[2].strip()
-                        desc_validador = campos[3].strip()
-                        data_inicial = campos[4].strip() if len(campos) > 4 else ''
-                        
-                        # O campo valid_validador é a data no índice 18 (19º campo)
-                        valid_validador = ''
-                        if len(campos) > 18:
-                            valid_validador = self.formatar_data(campos[18].strip())
-                        
-                        # O campo valid_final parece ser um status S/N no índice 17 (18º campo)
-                        valid_final = 'N'
-                        if len(campos) > 17:
-                            valid_final = campos[17].strip() if campos[17].strip() in ['S', 'N'] else 'N'
-                        
-                        chave = (cod_estado, cod_municipio)
-                        self.validadores[chave].append({
-                            'cod_validador': cod_validador,
-                            'desc_validador': desc_validador,
-                            'data_inicial': self.formatar_data(data_inicial),
-                            'valid_validador': valid_validador,  # Data de validação
-                            'valid_final': valid_final  # Status S/N
-                        })
+            erros_antes = self.total_erros_carga
+            for chave, validador in parsear_validadores(self.arquivo_validadores, self.ao_erro):
+                self.validadores[chave].append(validador)
             
-            print(f"Total de registros de validadores carregados: {sum(len(v) for v in self.validadores.values())}")
+            self.ao_progresso(f"Total de registros de validadores carregados: {sum(len(v) for v in self.validadores.values())}")
+            if self.total_erros_carga > erros_antes:
+                self.ao_progresso(f"Linhas inválidas ignoradas em {self.arquivo_validadores}: "
+                                  f"{self.total_erros_carga - erros_antes}")
             return True
-            
+        
         except Exception as e:
-            print(f"Erro ao carregar validadores: {e}")
+            self.ao_progresso(f"Erro ao carregar validadores: {e}")
             return False
     
-    def associar_dados(self):
-        """Associa os dados de municípios com validadores"""
+    def associar_dados(self, indexar: bool = True):
+        """Associa os dados de municípios com validadores
+        
+        `resultados` é uma visão sobre os registros carregados: cada registro
+        associado referencia o município e o validador, sem copiar os campos.
+        Municípios sem validador aparecem com o registro SEM VALIDADOR.
+        
+        Args:
+            indexar: Constrói também os índices de busca (construir_indices);
+                carregar_dados os constrói em uma fase própria
+        """
+        self.resultados = VisaoResultados(self.municipios, self.validadores)
+        
+        self.ao_progresso(f"\nTotal de registros associados: {len(self.resultados)}")
+        
+        if indexar:
+            self.construir_indices()
+    
+    def construir_indices(self):
+        """Constrói os índices de busca a partir dos registros associados
+        
+        A normalização dos nomes (maiúsculas + remoção de acentos) é feita uma
+        única vez por município, e os validadores de cada município já ficam
+        agrupados, sem duplicatas por código de validador.
+        """
+        inicio = time.perf_counter()
+        self.indice_nomes = {}
+        self.nomes_normalizados = []
+        self.indice_trigramas = IndiceTrigramas()
+        self.validadores_por_municipio = {}
+        self.catalogo_validadores = CatalogoValidadores()
+        self.candidatos_atual = {}
+        vencimentos = set()
+        
         for chave, municipio in self.municipios.items():
-            if chave in self.validadores:
-                for validador in self.validadores[chave]:
-                    self.resultados.append({
-                        'cod_estado': municipio['cod_estado'],
-                        'cod_municipio': municipio['cod_municipio'],
-                        'descricao': municipio['descricao'],
-                        'cod_validador': validador['cod_validador'],
-                        'desc_validador': validador['desc_validador'],
-                        'data_inicial': validador['data_inicial'],  # Adicionar data_inicial
-                        'valid_validador': validador['valid_validador'],
-                        'valid_final': validador['valid_final']
-                    })
-            else:
-                # Município sem validador
-                self.resultados.append({
-                    'cod_estado': municipio['cod_estado'],
-                    'cod_municipio': municipio['cod_municipio'],
-                    'descricao': municipio['descricao'],
-                    'cod_validador': '',
-                    'desc_validador': 'SEM VALIDADOR',
-                    'data_inicial': '',  # Adicionar data_inicial vazia
-                    'valid_validador': '',
-                    'valid_final': 'N'
-                })
-        
-        print(f"\nTotal de registros associados: {len(self.resultados)}")
+            nome = normalizar_nome(municipio['descricao'])
+            self.indice_nomes.setdefault(nome, []).append(chave)
+            self.nomes_normalizados.append((nome, chave))
+            self.indice_trigramas.adicionar(nome)
+        
+        # Mantém a regra de deduplicação usada nas buscas: o último registro de
+        # cada (município, validador) prevalece, na posição da primeira ocorrência
+        for chave in self.municipios:
+            unicos = {}
+            for validador in self.validadores.get(chave, ()):
+                if validador.cod_validador:
+                    unicos[validador.cod_validador] = validador
+            self.validadores_por_municipio[chave] = list(unicos.values())
+        
+        # Candidatos a validador atual de cada município: registros com
+        # indicador S, do mais preferido ao menos (sem data de término antes
+        # dos com término; depois o de término mais distante, o de início mais
+        # recente e o último do arquivo). O atual em um dia é o primeiro
+        # candidato ainda ativo nesse dia (validador_atual)
+        for chave, validadores in self.validadores.items():
+            candidatos = []
+            for posicao, validador in enumerate(validadores):
+                if validador.ordinal_validade:
+                    vencimentos.add(validador.ordinal_validade)
+                if validador.cod_validador and validador.valid_final == 'S':
+                    preferencia = (validador.ordinal_validade or float('inf'), validador.ordinal_inicial, posicao)
+                    candidatos.append((preferencia, validador))
+            if candidatos:
+                candidatos.sort(key=lambda candidato: candidato[0], reverse=True)
+                self.candidatos_atual[chave] = tuple(validador for _, validador in candidatos)
+        self.vencimentos = sorted(vencimentos)
+        
+        # Totais por validador (geral e por UF) da listagem e da participação
+        self.resumo_validadores = ResumoValidadores(self.validadores, self.municipios)
+        
+        # Catálogo com todos os validadores carregados (inclusive de municípios
+        # ausentes no TACES06), usado na classificação NOVO x MIGRAÇÃO
+        for chave, validadores in self.validadores.items():
+            for validador in validadores:
+                self.catalogo_validadores.adicionar(
+                    validador['cod_validador'], validador['desc_validador'], chave)
+        
+        self.tempos_carga['indices'] = round((time.perf_counter() - inicio) * 1000, 3)
+    
+    def validador_atual(self, chave, hoje: int):
+        """Validador atual de um município em um dia (ordinal), ou None se nenhum estiver ativo
+        
+        É o candidato preferido (ver construir_indices) entre os registros com
+        indicador S ainda ativos no dia.
+        """
+        for validador in self.candidatos_atual.get(chave, ()):
+            if validador.ativo(hoje):
+                return validador
+        return None
+    
+    def proximo_vencimento(self, hoje: int):
+        """Próximo dia (ordinal) após `hoje` em que algum validador expira, ou None"""
+        posicao = bisect_right(self.vencimentos, hoje)
+        return self.vencimentos[posicao] if posicao < len(self.vencimentos) else None
+    
+    def buscar_municipios(self, nome_municipio: str):
+        """Localiza municípios pelo nome usando o índice normalizado
+        
+        Returns:
+            Tupla (chaves, exata): lista de chaves (cod_estado, cod_municipio) na
+            ordem do arquivo e se a correspondência foi exata. Sem correspondência
+            exata, retorna os municípios cujo nome contém o texto buscado.
+        """
+        nome_busca = normalizar_nome(nome_municipio)
+        
+        chaves = self.indice_nomes.get(nome_busca)
+        if chaves:
+            return list(chaves), True
+        
+        return self.buscar_municipios_parcial(nome_busca), False
+    
+    def buscar_municipios_parcial(self, nome_municipio: str):
+        """Chaves dos municípios cujo nome normalizado contém o texto buscado
+        
+        Os candidatos vêm da interseção das postagens de trigramas; textos com
+        menos de 3 caracteres são verificados contra todos os nomes.
+        """
+        nome_busca = normalizar_nome(nome_municipio)
+        return [self.nomes_normalizados[i][1] for i in self.indice_trigramas.buscar_substring(nome_busca)]
+    
+    def sugerir_municipios(self, nome_municipio: str, limite: int = 20):
+        """Sugere municípios com nomes parecidos com o nome buscado
+        
+        Candidatos que contêm alguma palavra (3+ letras) do nome buscado ou que
+        compartilham trigramas suficientes com ele são ordenados pela
+        sobreposição de trigramas (os mais parecidos primeiro).
+        
+        Returns:
+            Lista de chaves (cod_estado, cod_municipio)
+        """
+        similares = self.indice_trigramas.similares(normalizar_nome(nome_municipio), limite)
+        return [self.nomes_normalizados[i][1] for i, _ in similares]
+    
+    def carregar_dados(self, diretorio_cache: str = None, mapeado: bool = False):
+        """Carrega, associa e indexa os dados, usando um snapshot binário quando possível
+        
+        Args:
+            diretorio_cache: Diretório do snapshot (opcional). Se informado, um
+                snapshot válido é restaurado sem ler os arquivos texto; se estiver
+                ausente, desatualizado ou corrompido, os arquivos são lidos e um
+                novo snapshot é gravado.
+            mapeado: Com `diretorio_cache`, anexa o dataset mapeado em memória
+                (dataset_mapeado) compartilhado entre processos, sem copiar os
+                dados; se ele não existir ou estiver desatualizado, os dados são
+                carregados como acima e o dataset é publicado.
+        
+        Returns:
+            True se os dados foram carregados
+        """
+        # A versão é calculada antes da leitura: se um arquivo mudar durante a
+        # carga, a versão não confere na próxima verificação e os dados são recarregados
+        try:
+            self.versao_dados = snapshot_associador.versao_fontes(
+                [self.arquivo_municipios, self.arquivo_validadores])
+        except OSError as e:
+            self.ao_progresso(f"Erro ao calcular a versão dos dados: {e}")
+        
+        mapeado = mapeado and bool(diretorio_cache)
+        if mapeado:
+            # Importado só quando usado: a carga comum não precisa dele
+            import dataset_mapeado
+            try:
+                self.dataset_mapeado = str(self._executar_fase(
+                    'dataset_mapeado', dataset_mapeado.anexar_dataset, self, diretorio_cache))
+                self.ao_progresso(f"Dados anexados do dataset mapeado: {self.dataset_mapeado}")
+                self.fase_carga = 'pronto'
+                return True
+            except dataset_mapeado.DatasetInvalido as e:
+                self.ao_progresso(f"Dataset mapeado indisponível ({e}), carregando os dados")
+        
+        restaurado = False
+        if diretorio_cache:
+            try:
+                origem = self._executar_fase('snapshot', snapshot_associador.carregar_snapshot,
+                                             self, diretorio_cache)
+                self.ao_progresso(f"Dados carregados do snapshot: {origem}")
+                restaurado = True
+            except snapshot_associador.SnapshotInvalido as e:
+                self.ao_progresso(f"Snapshot indisponível ({e}), lendo arquivos texto")
+        
+        if not restaurado:
+            if not self._executar_fase('municipios', self.carregar_municipios) or \
+               not self._executar_fase('validadores', self.carregar_validadores):
+                self.fase_carga = 'erro'
+                return False
+            # Fases separadas: 'associacao' não inclui o tempo de 'indices'
+            self._executar_fase('associacao', self.associar_dados, False)
+            self._executar_fase('indices', self.construir_indices)
+            
+            if diretorio_cache:
+                try:
+                    destino = self._executar_fase('gravacao_snapshot', snapshot_associador.salvar_snapshot,
+                                                  self, diretorio_cache)
+                    self.ao_progresso(f"Snapshot gravado em: {destino}")
+                except OSError as e:
+                    self.ao_progresso(f"Erro ao gravar snapshot: {e}")
+        
+        if mapeado:
+            try:
+                destino = self._executar_fase('publicacao_dataset', dataset_mapeado.publicar_dataset,
+                                              self, diretorio_cache)
+                self.ao_progresso(f"Dataset mapeado publicado em: {destino}")
+            except OSError as e:
+                self.ao_progresso(f"Erro ao publicar o dataset mapeado: {e}")
+        self.fase_carga = 'pronto'
+        return True
+    
+    def _executar_fase(self, fase: str, funcao, *args):
+        """Executa uma fase da carga registrando a fase atual e sua duração"""
+        self.fase_carga = fase
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self.tempos_carga[fase] = round((time.perf_counter() - inicio) * 1000, 3)
     
     def filtrar_por_estado(self, estado: str):
         """Retorna apenas os registros de um estado específico"""
@@ -157,7 +461,7 @@ class AssociadorMunicipiosValidadores:
             if limite and i >= limite:
                 print(f"\n... e mais {total - limite} registros")
                 break
-                
+            
             print(f"{registro['cod_estado']:2} | {registro['cod_municipio']:4d} | "
                   f"{registro['descricao'][:40]:40} | {registro['cod_validador'][:20]:20} | "
                   f"{registro['desc_validador'][:30]:30} | {registro['valid_validador']:10} | "
@@ -168,7 +472,7 @@ class AssociadorMunicipiosValidadores:
         dados = self.resultados
         if filtro_estado:
             dados = self.filtrar_por_estado(filtro_estado)
-            
+        
         with open(arquivo_saida, 'w', encoding='utf-8') as f:
             f.write("ASSOCIAÇÃO DE MUNICÍPIOS COM VALIDADORES\n")
             f.write("=" * 140 + "\n")
@@ -189,7 +493,7 @@ class AssociadorMunicipiosValidadores:
             
             f.write("\n" + "=" * 140 + "\n")
             f.write(f"Total de registros: {len(dados)}\n")
-            
+        
         print(f"\nResultado salvo em: {arquivo_saida}")
 
 def main():
@@ -0,0 +1,13 @@
+"""
+Benchmarks do associador de municípios e validadores e do servidor MCP
+
+    suite.py            carga, buscas, classificações e listagens (JSON com p50/p95/p99)
+    bench_busca_indice  busca linear x índice de nomes
+    bench_memoria       registros em dicts x registros compactos
+    bench_snapshot      partida a frio: arquivos texto x snapshot
+    bench_dataset       dataset mapeado compartilhado entre processos
+    bench_lote          chamadas individuais x ferramentas em lote
+    bench_http          vazão do transporte HTTP por número de processos
+    bench_partida       importação dos módulos e tempo até a primeira resposta (orçamento)
+    gerar_presetfiles   PresetFiles sintéticos para testes de escala
+"""
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de municípios: varredura linear x índice de nomes normalizados
+
+Compara o custo por consulta da busca antiga (normaliza todos os registros de
+`resultados` a cada chamada) com a busca pelo índice construído no carregamento.
+
+Uso:
+    python benchmarks/bench_busca_indice.py [repeticoes]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from associar_municipios_validadores import (
+    AssociadorMunicipiosValidadores,
+    remover_acentos,
+)
+
+CONSULTAS = ["sao paulo", "Rio de Janeiro", "Jacareí", "nova iguacu", "santo", "xyzabc"]
+
+
+def busca_linear(associador, nome_municipio):
+    """Reproduz a busca anterior ao índice (varredura completa de resultados)"""
+    encontrados = []
+    parciais = []
+    nome_busca = remover_acentos(nome_municipio.upper().strip())
+    for registro in associador.resultados:
+        nome_registro = remover_acentos(registro['descricao'].upper().strip())
+        if nome_busca == nome_registro:
+            encontrados.append(registro)
+        elif nome_busca in nome_registro:
+            parciais.append(registro)
+    return encontrados or parciais
+
+
+def busca_indice(associador, nome_municipio):
+    """Busca pelo índice de nomes normalizados"""
+    chaves, _ = associador.buscar_municipios(nome_municipio)
+    return chaves
+
+
+def medir(funcao, associador, repeticoes):
+    """Retorna o tempo médio por consulta em microssegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for consulta in CONSULTAS:
+            funcao(associador, consulta)
+    return (time.perf_counter() - inicio) / (repeticoes * len(CONSULTAS)) * 1e6
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    
+    associador = AssociadorMunicipiosValidadores(
+        str(BASE_DIR / "PresetFiles" / "TACES06.TXT"),
+        str(BASE_DIR / "PresetFiles" / "TFIX105.txt")
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        associador.carregar_municipios()
+        associador.carregar_validadores()
+        associador.associar_dados(indexar=False)
+    
+    inicio = time.perf_counter()
+    associador.construir_indices()
+    tempo_indice = (time.perf_counter() - inicio) * 1000
+    
+    linear = medir(busca_linear, associador, repeticoes)
+    indice = medir(busca_indice, associador, repeticoes)
+    
+    print(f"Registros associados: {len(associador.resultados)}")
+    print(f"Construção do índice: {tempo_indice:.2f} ms")
+    print(f"Busca linear:         {linear:10.1f} µs/consulta")
+    print(f"Busca por índice:     {indice:10.1f} µs/consulta")
+    print(f"Ganho:                {linear / indice:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
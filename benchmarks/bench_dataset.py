@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark do dataset mapeado: tempo de carga e memória privada por processo trabalhador
+
+Para cada forma de carga, inicia N processos (como os trabalhadores do
+servidor HTTP), carrega os dados em cada um, executa algumas buscas e
+classificações e mede:
+    - o tempo de carga
+    - a memória privada (Private_Clean + Private_Dirty de
+      /proc/self/smaps_rollup) acrescentada pela carga e pelas consultas
+
+Formas de carga:
+    - texto: leitura e associação dos arquivos texto em cada processo
+    - snapshot: restauração do snapshot binário (pickle) em cada processo
+    - mapeado: anexação do dataset mapeado em memória, compartilhado
+
+As páginas do dataset mapeado são do arquivo (compartilhadas entre os
+processos) e não entram na memória privada. Requer Linux.
+
+Uso:
+    python benchmarks/bench_dataset.py [processos]
+"""
+
+import contextlib
+import io
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+ARQUIVO_MUNICIPIOS = BASE_DIR / "PresetFiles" / "TACES06.TXT"
+ARQUIVO_VALIDADORES = BASE_DIR / "PresetFiles" / "TFIX105.txt"
+
+MUNICIPIOS = ["São Paulo", "Jacareí", "Rio de Janeiro", "Nova Iguaçu", "Niterói",
+              "Campinas", "Belo Horizonte", "Curitiba", "xyzabc", "Santo André"]
+VALIDADORES = ["GINFES", "ISSNET", "TESTE", "BETHA"]
+
+
+def memoria_privada_kib() -> int:
+    """Memória privada residente do processo (KiB)"""
+    total = 0
+    with open('/proc/self/smaps_rollup') as arquivo:
+        for linha in arquivo:
+            if linha.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(linha.split()[1])
+    return total
+
+
+def trabalhador(argumentos: tuple) -> tuple:
+    """Carrega os dados e consulta; retorna (ms da carga, KiB privados acrescentados)"""
+    forma, diretorio = argumentos
+    from associar_municipios_validadores import AssociadorMunicipiosValidadores
+    from consultas_municipios import buscar_municipio, classificar_validador
+
+    antes = memoria_privada_kib()
+    inicio = time.perf_counter()
+    associador = AssociadorMunicipiosValidadores(str(ARQUIVO_MUNICIPIOS), str(ARQUIVO_VALIDADORES))
+    with contextlib.redirect_stdout(io.StringIO()):
+        carregado = associador.carregar_dados(
+            diretorio if forma != 'texto' else None, mapeado=forma == 'mapeado')
+    carga = (time.perf_counter() - inicio) * 1000
+    assert carregado and (forma != 'mapeado' or associador.dataset_mapeado)
+
+    for i, municipio in enumerate(MUNICIPIOS):
+        busca = buscar_municipio(associador, municipio)
+        classificar_validador(associador, municipio, VALIDADORES[i % len(VALIDADORES)], busca)
+    return carga, memoria_privada_kib() - antes
+
+
+def main():
+    processos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    diretorio = tempfile.mkdtemp(prefix="bench-dataset-")
+    try:
+        # Publica o snapshot e o dataset uma vez, como o processo principal do servidor
+        from associar_municipios_validadores import AssociadorMunicipiosValidadores
+        with contextlib.redirect_stdout(io.StringIO()):
+            AssociadorMunicipiosValidadores(str(ARQUIVO_MUNICIPIOS), str(ARQUIVO_VALIDADORES)) \
+                .carregar_dados(diretorio, mapeado=True)
+
+        contexto = multiprocessing.get_context('spawn')
+        print(f"Processos trabalhadores: {processos}\n")
+        print(f"{'FORMA':10} | {'CARGA MÉDIA (ms)':>16} | {'PRIVADA/PROC (KiB)':>18} | {'PRIVADA TOTAL (KiB)':>19}")
+        print("-" * 74)
+        for forma in ('texto', 'snapshot', 'mapeado'):
+            with contexto.Pool(processos) as pool:
+                resultados = pool.map(trabalhador, [(forma, diretorio)] * processos)
+            carga = sum(r[0] for r in resultados) / processos
+            privada = sum(r[1] for r in resultados)
+            print(f"{forma:10} | {carga:16.2f} | {privada / processos:18.0f} | {privada:19.0f}")
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
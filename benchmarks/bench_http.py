@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do transporte HTTP: vazão conforme o número de processos trabalhadores
+
+Para cada quantidade de processos, inicia `python -m src.servidor_http` como
+subprocesso, aguarda os dados ficarem prontos e dispara chamadas de
+`buscar_municipio` e `classificar_validador` (POST JSON-RPC em /mcp) a partir
+de vários processos clientes, cada um com várias conexões simultâneas,
+durante alguns segundos. Ao final, encerra o servidor com SIGTERM e mede o
+tempo de drenagem.
+
+O ganho de vazão depende dos núcleos disponíveis: com um único núcleo, mais
+processos apenas dividem a mesma CPU.
+
+Uso:
+    python benchmarks/bench_http.py [--processos 1,2,4] [--clientes 4]
+                                    [--conexoes 8] [--segundos 5] [--porta 8765]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+MUNICIPIOS = ["São Paulo", "Jacareí", "Rio de Janeiro", "Nova Iguaçu", "Niterói",
+              "Campinas", "Belo Horizonte", "Curitiba", "xyzabc", "Santo André"]
+VALIDADORES = ["GINFES", "ISSNET", "TESTE", "BETHA"]
+CABECALHOS = {"Accept": "application/json, text/event-stream"}
+
+
+def mensagem(i: int) -> dict:
+    """Chamada de ferramenta JSON-RPC alternando busca e classificação"""
+    municipio = MUNICIPIOS[i % len(MUNICIPIOS)]
+    if i % 2:
+        chamada = {"name": "classificar_validador",
+                   "arguments": {"nome_municipio": municipio, "nome_validador": VALIDADORES[i % len(VALIDADORES)]}}
+    else:
+        chamada = {"name": "buscar_municipio", "arguments": {"nome_municipio": municipio}}
+    return {"jsonrpc": "2.0", "id": i, "method": "tools/call", "params": chamada}
+
+
+async def _carga(url: str, conexoes: int, segundos: float) -> list:
+    """Latências (ms) das chamadas feitas por `conexoes` conexões até o fim do prazo"""
+    import httpx
+    
+    latencias = []
+    fim = time.monotonic() + segundos
+    
+    async def conexao(cliente, deslocamento):
+        i = deslocamento
+        while time.monotonic() < fim:
+            inicio = time.perf_counter()
+            resposta = await cliente.post(url, json=mensagem(i), headers=CABECALHOS)
+            resposta.raise_for_status()
+            assert "result" in resposta.json(), resposta.text
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            i += conexoes
+    
+    limites = httpx.Limits(max_connections=conexoes)
+    async with httpx.AsyncClient(limits=limites, timeout=60) as cliente:
+        await asyncio.gather(*(conexao(cliente, n) for n in range(conexoes)))
+    return latencias
+
+
+def processo_cliente(argumentos: tuple) -> list:
+    return asyncio.run(_carga(*argumentos))
+
+
+def aguardar_pronto(porta: int, processos: int, prazo: float = 60):
+    """Aguarda /saude responder pronto em todos os processos (ou 5s após o primeiro)"""
+    import httpx
+    
+    limite = time.monotonic() + prazo
+    prontos = set()
+    while time.monotonic() < limite:
+        try:
+            resposta = httpx.get(f"http://127.0.0.1:{porta}/saude", timeout=5)
+            if resposta.status_code == 200:
+                if not prontos:
+                    limite = min(limite, time.monotonic() + 5)
+                prontos.add(resposta.json()["processo"])
+                if len(prontos) >= processos:
+                    return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    if not prontos:
+        raise RuntimeError("o servidor não ficou pronto a tempo")
+
+
+def percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def medir(processos: int, opcoes) -> dict:
+    """Sobe o servidor com `processos` trabalhadores e mede vazão, latências e drenagem"""
+    ambiente = dict(os.environ, MCP_MUNICIPIOS_PROCESSOS=str(processos),
+                    MCP_MUNICIPIOS_HTTP_PORTA=str(opcoes.porta))
+    servidor = subprocess.Popen([sys.executable, "-m", "src.servidor_http"], cwd=str(BASE_DIR),
+                                env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        aguardar_pronto(opcoes.porta, processos)
+        url = f"http://127.0.0.1:{opcoes.porta}/mcp"
+        
+        inicio = time.perf_counter()
+        with multiprocessing.Pool(opcoes.clientes) as pool:
+            resultados = pool.map(processo_cliente, [(url, opcoes.conexoes, opcoes.segundos)] * opcoes.clientes)
+        duracao = time.perf_counter() - inicio
+    finally:
+        inicio_drenagem = time.perf_counter()
+        servidor.send_signal(signal.SIGTERM)
+        servidor.wait(timeout=120)
+        drenagem = (time.perf_counter() - inicio_drenagem) * 1000
+    
+    latencias = [latencia for resultado in resultados for latencia in resultado]
+    return {
+        "processos": processos,
+        "chamadas": len(latencias),
+        "vazao": len(latencias) / duracao,
+        "p50": percentil(latencias, 0.50),
+        "p99": percentil(latencias, 0.99),
+        "drenagem": drenagem,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processos", default="1,2,4", help="quantidades de processos trabalhadores")
+    parser.add_argument("--clientes", type=int, default=4, help="processos clientes")
+    parser.add_argument("--conexoes", type=int, default=8, help="conexões simultâneas por cliente")
+    parser.add_argument("--segundos", type=float, default=5, help="duração de cada medição")
+    parser.add_argument("--porta", type=int, default=8765)
+    opcoes = parser.parse_args()
+    
+    print(f"Núcleos: {os.cpu_count()} | clientes: {opcoes.clientes} x {opcoes.conexoes} conexões "
+          f"| {opcoes.segundos:g}s por medição")
+    print(f"{'PROCESSOS':>9} | {'CHAMADAS':>8} | {'CHAMADAS/S':>10} | {'P50 MS':>8} | {'P99 MS':>8} | {'DRENAGEM MS':>11}")
+    base = None
+    for processos in [int(p) for p in opcoes.processos.split(",")]:
+        r = medir(processos, opcoes)
+        base = base or r["vazao"]
+        print(f"{r['processos']:9} | {r['chamadas']:8} | {r['vazao']:10.1f} | {r['p50']:8.2f} | "
+              f"{r['p99']:8.2f} | {r['drenagem']:11.1f}  ({r['vazao'] / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark das ferramentas em lote: N chamadas individuais x 1 chamada em lote
+
+Mede o tempo total para classificar os mesmos N pares município/validador
+com N chamadas de `classificar_validador` e com uma única chamada de
+`classificar_validadores_lote`. Por padrão as chamadas passam pelo
+`call_tool` do servidor no próprio processo; com --stdio, o servidor é
+iniciado como subprocesso e as chamadas fazem a viagem completa pelo
+transporte stdio (como um cliente MCP real).
+
+Uso:
+    python benchmarks/bench_lote.py [N] [--stdio]
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+MUNICIPIOS = ["São Paulo", "Jacareí", "Rio de Janeiro", "Nova Iguaçu", "Niterói",
+              "Campinas", "Belo Horizonte", "Curitiba", "xyzabc", "Santo André"]
+VALIDADORES = ["GINFES", "ISSNET", "TESTE", "BETHA"]
+
+
+def gerar_pares(total: int) -> list:
+    """Pares município/validador para o benchmark (com repetições de municípios)"""
+    return [
+        {"nome_municipio": MUNICIPIOS[i % len(MUNICIPIOS)], "nome_validador": VALIDADORES[i % len(VALIDADORES)]}
+        for i in range(total)
+    ]
+
+
+async def medir(chamar, pares: list) -> tuple:
+    """Retorna (ms com N chamadas individuais, ms com 1 chamada em lote)"""
+    inicio = time.perf_counter()
+    for par in pares:
+        await chamar("classificar_validador", par)
+    individuais = (time.perf_counter() - inicio) * 1000
+    
+    inicio = time.perf_counter()
+    resposta = json.loads(await chamar("classificar_validadores_lote", {"pares": pares}))
+    lote = (time.perf_counter() - inicio) * 1000
+    
+    assert resposta['total'] == len(pares), resposta
+    return individuais, lote
+
+
+async def medir_local(pares: list) -> tuple:
+    from src import mcp_server
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        mcp_server.get_associador()
+    
+    async def chamar(nome, argumentos):
+        return (await mcp_server.call_tool(nome, argumentos))[0].text
+    
+    return await medir(chamar, pares)
+
+
+async def medir_stdio(pares: list) -> tuple:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    
+    parametros = StdioServerParameters(
+        command=sys.executable, args=["-m", "src.mcp_server"], cwd=str(BASE_DIR), env=dict(os.environ)
+    )
+    async with stdio_client(parametros) as (leitura, escrita):
+        async with ClientSession(leitura, escrita) as sessao:
+            await sessao.initialize()
+            
+            async def chamar(nome, argumentos):
+                return (await sessao.call_tool(nome, argumentos)).content[0].text
+            
+            # Aquecimento: garante os dados carregados antes da medição
+            await chamar("buscar_municipio", {"nome_municipio": "Jacareí"})
+            return await medir(chamar, pares)
+
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    total = int(argumentos[0]) if argumentos else 50
+    stdio = "--stdio" in sys.argv
+    pares = gerar_pares(total)
+    
+    individuais, lote = asyncio.run(medir_stdio(pares) if stdio else medir_local(pares))
+    
+    print(f"Transporte:              {'stdio' if stdio else 'local (call_tool)'}")
+    print(f"Pares:                   {total}")
+    print(f"{total} chamadas individuais: {individuais:10.1f} ms ({individuais / total:.2f} ms/par)")
+    print(f"1 chamada em lote:       {lote:10.1f} ms ({lote / total:.2f} ms/par)")
+    print(f"Ganho:                   {individuais / lote:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
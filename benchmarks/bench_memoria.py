@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Comparação de memória (tracemalloc): registros em dicts x registros compactos
+
+Mede a memória ocupada pelos municípios, validadores e resultados associados
+em duas formas:
+    - dicts: um dict por município, um por validador e uma cópia completa
+      por registro associado (formato anterior)
+    - compacto: registros com __slots__, textos internados e `resultados`
+      como visão sobre os registros (formato atual)
+
+Uso:
+    python benchmarks/bench_memoria.py
+"""
+
+import contextlib
+import gc
+import io
+import sys
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from associar_municipios_validadores import AssociadorMunicipiosValidadores
+from registros import VisaoResultados
+from tabelas_tfix import esquema_tabela
+
+ARQUIVO_MUNICIPIOS = BASE_DIR / "PresetFiles" / "TACES06.TXT"
+ARQUIVO_VALIDADORES = BASE_DIR / "PresetFiles" / "TFIX105.txt"
+
+
+def carregar_em_dicts():
+    """Reproduz o formato anterior: dicts por registro e resultados copiados"""
+    formatar_data = AssociadorMunicipiosValidadores.formatar_data
+    municipios = {}
+    with open(ARQUIVO_MUNICIPIOS, 'r', encoding='latin-1') as arquivo:
+        for linha in arquivo:
+            campos = linha.strip().split('\t')
+            if len(campos) >= 8:
+                cod_municipio = int(campos[1]) if campos[1].strip() else 0
+                municipios[(campos[0].strip(), cod_municipio)] = {
+                    'cod_estado': campos[0].strip(),
+                    'cod_municipio': cod_municipio,
+                    'descricao': campos[2].strip(),
+                }
+    
+    validadores = defaultdict(list)
+    with open(ARQUIVO_VALIDADORES, 'r', encoding='latin-1') as arquivo:
+        for linha in arquivo:
+            campos = linha.strip().split('\t')
+            if len(campos) >= 6:
+                cod_municipio = int(campos[1]) if campos[1].strip() else 0
+                valid_final = campos[17].strip() if len(campos) > 17 else 'N'
+                validadores[(campos[0].strip(), cod_municipio)].append({
+                    'cod_validador': campos[2].strip(),
+                    'desc_validador': campos[3].strip(),
+                    'data_inicial': formatar_data(None, campos[4].strip()),
+                    'valid_validador': formatar_data(None, campos[18].strip()) if len(campos) > 18 else '',
+                    'valid_final': valid_final if valid_final in ['S', 'N'] else 'N',
+                })
+    
+    resultados = []
+    for chave, municipio in municipios.items():
+        for validador in validadores.get(chave) or [{
+                'cod_validador': '', 'desc_validador': 'SEM VALIDADOR', 'data_inicial': '',
+                'valid_validador': '', 'valid_final': 'N'}]:
+            resultados.append({**municipio, **validador})
+    return municipios, validadores, resultados
+
+
+def carregar_compacto():
+    """Formato atual (sem os índices de busca)"""
+    associador = AssociadorMunicipiosValidadores(str(ARQUIVO_MUNICIPIOS), str(ARQUIVO_VALIDADORES))
+    with contextlib.redirect_stdout(io.StringIO()):
+        associador.carregar_municipios()
+        associador.carregar_validadores()
+    resultados = VisaoResultados(associador.municipios, associador.validadores)
+    return associador.municipios, associador.validadores, resultados
+
+
+def aquecer_esquemas():
+    """Carrega antes da medição os esquemas (cache por tabela) usados na carga compacta
+    
+    Assim a memória do esquema XML não entra na conta do formato compacto.
+    """
+    for tabela in ('TACES06', 'TFIX105'):
+        esquema_tabela(tabela)
+
+
+def medir(funcao):
+    """Memória retida (KiB) pelos dados retornados e pico durante a carga"""
+    gc.collect()
+    tracemalloc.start()
+    dados = funcao()
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del dados
+    return atual / 1024, pico / 1024
+
+
+def main():
+    aquecer_esquemas()
+    dicts = medir(carregar_em_dicts)
+    compacto = medir(carregar_compacto)
+    
+    print(f"{'FORMATO':10} | {'RETIDA (KiB)':>12} | {'PICO (KiB)':>12}")
+    print("-" * 40)
+    print(f"{'dicts':10} | {dicts[0]:12.1f} | {dicts[1]:12.1f}")
+    print(f"{'compacto':10} | {compacto[0]:12.1f} | {compacto[1]:12.1f}")
+    print(f"\nRedução da memória retida: {(1 - compacto[0] / dicts[0]) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
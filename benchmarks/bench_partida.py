@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark da partida: tempo de importação por módulo e tempo até a primeira resposta
+
+Mede, em processos novos:
+    - a importação do núcleo (associar_municipios_validadores), da CLI
+      (buscar_municipio_validador) e do servidor (src.mcp_server), com o
+      detalhamento do `python -X importtime` agrupado por pacote
+    - o tempo até a resposta do `initialize` do servidor MCP (stdio) e até a
+      resposta da primeira chamada de `buscar_municipio` (inclui a carga dos
+      dados iniciada no aquecimento)
+
+Cada medida tem um orçamento (ORCAMENTO, em ms); também é conferido que
+nenhum módulo importe pacotes que não usa (PROIBIDOS), ex.: o núcleo e a CLI
+não podem importar o SDK do MCP. Sai com código 1 se algo estourar.
+
+Uso:
+    python benchmarks/bench_partida.py [--repeticoes 5] [--fator 1.0] [--detalhes 8]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+MODULOS = {
+    'nucleo': 'associar_municipios_validadores',
+    'cli': 'buscar_municipio_validador',
+    'servidor': 'src.mcp_server',
+}
+
+# Orçamentos em ms (multiplicados por --fator em máquinas mais lentas). A
+# importação do servidor é dominada pelo SDK do MCP (pacote mcp e pydantic)
+ORCAMENTO = {
+    'importacao_nucleo': 60,
+    'importacao_cli': 60,
+    'importacao_servidor': 1500,
+    'primeira_resposta': 2000,
+    'primeira_ferramenta': 3000,
+}
+
+# Pacotes que cada módulo não deve importar (nem indiretamente)
+_SDK = {'mcp', 'pydantic', 'anyio', 'starlette', 'uvicorn', 'httpx'}
+_SOB_DEMANDA = {'dataset_mapeado', 'cProfile', 'pstats', 'tracemalloc'}
+PROIBIDOS = {
+    'nucleo': _SDK | _SOB_DEMANDA,
+    'cli': _SDK | _SOB_DEMANDA,
+    'servidor': _SOB_DEMANDA | {'buscar_municipio_validador'},
+}
+
+
+def importtime(modulo: str) -> dict:
+    """Importa `modulo` em um processo novo com -X importtime
+    
+    Returns:
+        {'total_ms': tempo acumulado do módulo, 'por_pacote': {pacote: ms
+        próprios}, 'modulos': nomes importados}
+    """
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                              cwd=str(BASE_DIR), capture_output=True, text=True, check=True)
+    por_pacote = defaultdict(float)
+    modulos = set()
+    total = None
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        nome = nome.strip()
+        modulos.add(nome)
+        por_pacote[nome.split(".")[0]] += int(proprio) / 1000
+        if nome == modulo:
+            total = int(acumulado) / 1000
+    return {'total_ms': total, 'por_pacote': dict(por_pacote), 'modulos': modulos}
+
+
+def _mensagem(processo, mensagem: dict):
+    processo.stdin.write(json.dumps(mensagem) + "\n")
+    processo.stdin.flush()
+
+
+def _resposta(processo, ident: int) -> dict:
+    """Lê o stdout do servidor até a resposta com o id informado"""
+    while True:
+        linha = processo.stdout.readline()
+        if not linha:
+            raise RuntimeError("o servidor encerrou antes de responder")
+        resposta = json.loads(linha)
+        if resposta.get("id") == ident:
+            return resposta
+
+
+def primeira_resposta() -> tuple:
+    """(ms até a resposta do initialize, ms até a resposta da primeira ferramenta)"""
+    inicio = time.perf_counter()
+    processo = subprocess.Popen([sys.executable, "-m", "src.mcp_server"], cwd=str(BASE_DIR),
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, encoding="utf-8")
+    try:
+        _mensagem(processo, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2025-06-18", "capabilities": {},
+            "clientInfo": {"name": "bench_partida", "version": "1"}}})
+        _resposta(processo, 1)
+        inicializacao = (time.perf_counter() - inicio) * 1000
+        
+        _mensagem(processo, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _mensagem(processo, {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {
+            "name": "buscar_municipio", "arguments": {"nome_municipio": "Jacareí"}}})
+        resposta = _resposta(processo, 2)
+        assert "result" in resposta and not resposta["result"].get("isError"), resposta
+        ferramenta = (time.perf_counter() - inicio) * 1000
+    finally:
+        processo.terminate()
+        processo.wait(timeout=10)
+    return inicializacao, ferramenta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5, help="processos medidos por item (mediana)")
+    parser.add_argument("--fator", type=float, default=1.0, help="multiplicador dos orçamentos")
+    parser.add_argument("--detalhes", type=int, default=8, help="pacotes mais lentos listados por módulo")
+    opcoes = parser.parse_args()
+    
+    medidas = {}
+    violacoes = []
+    for nome, modulo in MODULOS.items():
+        execucoes = [importtime(modulo) for _ in range(opcoes.repeticoes)]
+        medidas[f'importacao_{nome}'] = statistics.median(e['total_ms'] for e in execucoes)
+        
+        print(f"\n{modulo}: {medidas[f'importacao_{nome}']:.1f} ms (mediana de {opcoes.repeticoes})")
+        por_pacote = defaultdict(list)
+        for execucao in execucoes:
+            for pacote, ms in execucao['por_pacote'].items():
+                por_pacote[pacote].append(ms)
+        maiores = sorted(((statistics.median(v), p) for p, v in por_pacote.items()), reverse=True)
+        for ms, pacote in maiores[:opcoes.detalhes]:
+            print(f"    {pacote:32} {ms:9.1f} ms")
+        
+        importados = {m.split('.')[0] for m in execucoes[0]['modulos']} | execucoes[0]['modulos']
+        for proibido in sorted(PROIBIDOS[nome] & importados):
+            violacoes.append(f"{modulo} importa {proibido}")
+    
+    partidas = [primeira_resposta() for _ in range(opcoes.repeticoes)]
+    medidas['primeira_resposta'] = statistics.median(p[0] for p in partidas)
+    medidas['primeira_ferramenta'] = statistics.median(p[1] for p in partidas)
+    
+    print(f"\n{'MEDIDA':22} | {'MEDIANA MS':>10} | {'ORÇAMENTO MS':>12}")
+    print("-" * 52)
+    for nome, ms in medidas.items():
+        limite = ORCAMENTO[nome] * opcoes.fator
+        situacao = "" if ms <= limite else "  ESTOUROU"
+        if situacao:
+            violacoes.append(f"{nome}: {ms:.1f} ms > {limite:.0f} ms")
+        print(f"{nome:22} | {ms:10.1f} | {limite:12.0f}{situacao}")
+    
+    if violacoes:
+        print("\nFora do orçamento:", *violacoes, sep="\n    ")
+        sys.exit(1)
+    print("\nDentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
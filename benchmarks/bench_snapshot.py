@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark da partida a frio: leitura dos arquivos texto x snapshot binário
+
+Cada medição roda em um processo Python novo, como acontece na partida de um
+servidor MCP ou em uma execução da linha de comando.
+
+Uso:
+    python benchmarks/bench_snapshot.py [repeticoes]
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+CODIGO_CARGA = """
+import contextlib, io, sys, time
+sys.path.insert(0, {base!r})
+from associar_municipios_validadores import AssociadorMunicipiosValidadores
+inicio = time.perf_counter()
+associador = AssociadorMunicipiosValidadores({municipios!r}, {validadores!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    associador.carregar_dados({cache!r})
+print((time.perf_counter() - inicio) * 1000)
+"""
+
+
+def medir_carga(diretorio_cache, repeticoes):
+    """Tempos (ms) de carga em processos novos"""
+    codigo = CODIGO_CARGA.format(
+        base=str(BASE_DIR),
+        municipios=str(BASE_DIR / "PresetFiles" / "TACES06.TXT"),
+        validadores=str(BASE_DIR / "PresetFiles" / "TFIX105.txt"),
+        cache=diretorio_cache,
+    )
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+        tempos.append(float(saida.stdout.strip()))
+    return tempos
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    
+    with tempfile.TemporaryDirectory() as diretorio_cache:
+        texto = medir_carga(None, repeticoes)
+        medir_carga(diretorio_cache, 1)  # grava o snapshot
+        snapshot = medir_carga(diretorio_cache, repeticoes)
+    
+    print(f"Arquivos texto: mediana {statistics.median(texto):8.1f} ms (min {min(texto):.1f})")
+    print(f"Snapshot:       mediana {statistics.median(snapshot):8.1f} ms (min {min(snapshot):.1f})")
+    print(f"Ganho:          {statistics.median(texto) / statistics.median(snapshot):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
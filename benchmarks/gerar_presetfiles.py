@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Gerador de PresetFiles sintéticos (TACES06.TXT e TFIX105.txt) para testes de escala
+
+Grava arquivos no mesmo leiaute dos PresetFiles reais: campos separados por
+tabulação, latin-1, fim de linha LF. No TACES06, as UFs que no arquivo real
+usam colunas alinhadas (código à direita em 5 posições, nomes com 50) são
+geradas alinhadas e as demais sem alinhamento; no TFIX105 todas as linhas têm
+os 30 campos, com código do município em 5 posições, código do validador em
+20 e descrição em 65.
+
+Parâmetros:
+    - municipios: quantidade de linhas do TACES06
+    - acentos: fração dos nomes com letras acentuadas (na descrição e no
+      nome IBGE), que exercitam a normalização
+    - distribuicao: pesos da quantidade de validadores distintos por
+      município (posição 0 = sem validador, 1 = um validador, ...)
+    - historico: máximo de períodos de validade por validador; os períodos
+      são consecutivos (cada um termina na véspera do seguinte) e o último
+      fica aberto
+    - invalidas: fração de linhas malformadas (campos faltando ou código de
+      município não numérico) em cada arquivo
+    - semente: o mesmo conjunto de parâmetros e semente gera os mesmos arquivos
+
+Uso:
+    python -m benchmarks.gerar_presetfiles DESTINO [--municipios 55690] [--acentos 0.4]
+                                           [--distribuicao 0.9,0.07,0.02,0.01]
+                                           [--historico 3] [--invalidas 0] [--semente 0]
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+# UF -> (código IBGE, peso aproximado no arquivo real)
+UFS = {
+    'AC': ('12', 22), 'AL': ('27', 102), 'AM': ('13', 62), 'AP': ('16', 16), 'BA': ('29', 417),
+    'CE': ('23', 184), 'DF': ('53', 1), 'ES': ('32', 78), 'GO': ('52', 246), 'MA': ('21', 217),
+    'MG': ('31', 853), 'MS': ('50', 78), 'MT': ('51', 141), 'PA': ('15', 144), 'PB': ('25', 223),
+    'PE': ('26', 185), 'PI': ('22', 224), 'PR': ('41', 399), 'RJ': ('33', 92), 'RN': ('24', 167),
+    'RO': ('11', 52), 'RR': ('14', 15), 'RS': ('43', 497), 'SC': ('42', 295), 'SE': ('28', 75),
+    'SP': ('35', 645), 'TO': ('17', 139),
+}
+# UFs com colunas alinhadas no TACES06 real
+UFS_ALINHADAS = {'AC', 'AL', 'AM', 'AP', 'BA', 'CE', 'DF', 'ES', 'GO'}
+
+PREFIXOS = ['SAO', 'SANTA', 'SANTO', 'NOVA', 'NOVO', 'BOM JESUS DO', 'BARRA DO', 'PORTO', 'CAMPO',
+            'LAGOA DA', 'SERRA DO', 'MONTE', 'ALTO', 'RIO', 'BOA VISTA DO', 'AGUA']
+SUFIXOS = ['DO SUL', 'DO NORTE', 'D OESTE', 'GRANDE', 'ALEGRE', 'DAS FLORES', 'DOS CAMPOS', 'MIRIM',
+           'ACU', 'DE MINAS', 'DO PIAUI', 'DE GOIAS', 'DO TOCANTINS', 'PAULISTA']
+SILABAS = ['A', 'BA', 'BE', 'BO', 'CA', 'CI', 'CO', 'CU', 'DA', 'DI', 'FA', 'GA', 'GO', 'GUA', 'I',
+           'JA', 'JU', 'LA', 'LI', 'MA', 'MO', 'NA', 'NI', 'PA', 'PE', 'PI', 'QUI', 'RA', 'RE', 'RI',
+           'SA', 'SO', 'TA', 'TI', 'TU', 'U', 'VA', 'XA', 'ZE']
+# Acentuações possíveis de cada letra (maiúsculas; o nome IBGE usa as minúsculas)
+ACENTUADAS = {'A': 'ÁÃÂ', 'E': 'ÉÊ', 'I': 'Í', 'O': 'ÓÔÕ', 'U': 'Ú', 'C': 'Ç'}
+
+VALIDADORES_REAIS = ['BETHA', 'DEISS', 'ATENDENET', 'ISS WEB', 'SIGISS', 'ISS.NET', 'ISSIntel',
+                     'GOV DIGITAL', 'SIMPLISS', 'FGMAISS', 'DES XML', 'ISS ONLINE', 'SAATRI NFSE',
+                     'REMESSAXML', 'MEUISS', 'E.ISS', 'SIGIS', 'NFSE GIAP', 'SPE', 'ISS DIGITAL',
+                     'NFSE ABACO', 'GEISWEB', 'SUPERNOVA', 'FINTELISS', 'EISSXML', 'GINFES']
+
+SEM_DATA = '19000101'
+INICIO_DATAS = date(2010, 1, 1)
+
+
+def _palavra(aleatorio: random.Random) -> str:
+    return ''.join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(2, 4)))
+
+
+def _nome(aleatorio: random.Random) -> str:
+    """Nome de município em maiúsculas, sem acentos, no estilo do TACES06"""
+    partes = [_palavra(aleatorio)]
+    if aleatorio.random() < 0.35:
+        partes.insert(0, aleatorio.choice(PREFIXOS))
+    if aleatorio.random() < 0.2:
+        partes.append(aleatorio.choice(SUFIXOS))
+    elif aleatorio.random() < 0.05:
+        partes[-1] += '-' + _palavra(aleatorio)
+    return ' '.join(partes)[:50]
+
+
+def _acentuar(nome: str, aleatorio: random.Random) -> str:
+    """Troca de uma a duas letras acentuáveis do nome pelas versões acentuadas"""
+    posicoes = [i for i, letra in enumerate(nome) if letra in ACENTUADAS]
+    letras = list(nome)
+    for i in aleatorio.sample(posicoes, min(len(posicoes), aleatorio.randint(1, 2))):
+        letras[i] = aleatorio.choice(ACENTUADAS[letras[i]])
+    return ''.join(letras)
+
+
+def _nome_ibge(nome: str) -> str:
+    """Nome IBGE (maiúsculas e minúsculas) a partir da descrição"""
+    minusculas = {'DO', 'DA', 'DOS', 'DAS', 'DE', 'D'}
+    return ' '.join(p.lower() if p in minusculas else p.capitalize() for p in nome.split(' '))
+
+
+def _linha_municipio(uf: str, codigo: int, nome: str, nome_ibge: str, dipj: int) -> str:
+    cod_uf = UFS[uf][0]
+    if uf in UFS_ALINHADAS:
+        return f"{uf}\t{codigo:>5}\t{nome:<50}\t{cod_uf}\t{'':6}\t{'':10}\t{dipj:04d}\t{nome_ibge:<50}"
+    return f"{uf}\t{codigo}\t{nome}\t{cod_uf}\t\t\t{dipj}\t{nome_ibge}"
+
+
+def _linha_validador(uf: str, codigo: int, validador: str, inicio: str, modulo: int,
+                     gera_cc: str, fim: str) -> str:
+    indicadores = '\t'.join('N' * 11)
+    return (f"{uf}\t{codigo:<5}\t{validador:<20}\t{validador:<65}\t{inicio}\t{modulo:03d}\t"
+            f"{indicadores}\t{gera_cc}\t{fim}\t{indicadores}")
+
+
+def _periodos(aleatorio: random.Random, quantidade: int, inicio: date, primeiro: bool) -> tuple:
+    """Períodos consecutivos (início, fim) em YYYYMMDD e o início do seguinte
+    
+    O último período fica aberto. O primeiro período do município pode vir
+    sem data de início (19000101), como no arquivo real.
+    """
+    periodos = []
+    for n in range(quantidade):
+        proximo = inicio + timedelta(days=aleatorio.randint(60, 900))
+        ultimo = n == quantidade - 1
+        texto_inicio = SEM_DATA if primeiro and n == 0 and aleatorio.random() < 0.5 else f"{inicio:%Y%m%d}"
+        periodos.append((texto_inicio, '' if ultimo else f"{proximo - timedelta(days=1):%Y%m%d}"))
+        inicio = proximo
+    return periodos, inicio
+
+
+def _malformar(linha: str, aleatorio: random.Random) -> str:
+    """Linha malformada: campos faltando ou código de município não numérico"""
+    campos = linha.split('\t')
+    if aleatorio.random() < 0.5:
+        return '\t'.join(campos[:3])
+    campos[1] = 'X' + campos[1].strip()
+    return '\t'.join(campos)
+
+
+def gerar_presetfiles(destino, municipios: int = 5569, acentos: float = 0.4,
+                      distribuicao=(0.9, 0.07, 0.02, 0.01), historico: int = 3,
+                      invalidas: float = 0.0, validadores: int = 110, semente: int = 0) -> dict:
+    """Grava TACES06.TXT e TFIX105.txt sintéticos em `destino`
+    
+    Retorna os caminhos dos arquivos e as contagens geradas (linhas válidas e
+    malformadas de cada arquivo).
+    """
+    aleatorio = random.Random(semente)
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    
+    # Catálogo de validadores: os nomes reais mais frequentes e sintéticos
+    # para completar, com popularidade decrescente (Zipf)
+    nomes_validadores = (VALIDADORES_REAIS + [f"VALIDADOR {n:04d}" for n in range(validadores)])[:validadores]
+    pesos_validadores = [1 / (n + 1) for n in range(len(nomes_validadores))]
+    
+    ufs = sorted(UFS)
+    contagem_ufs = dict.fromkeys(ufs, 0)
+    for uf in aleatorio.choices(ufs, weights=[UFS[uf][1] for uf in ufs], k=municipios):
+        contagem_ufs[uf] += 1
+    
+    contagens = {'municipios': 0, 'municipios_invalidos': 0, 'registros_validadores': 0,
+                 'validadores_invalidos': 0}
+    arquivo_municipios = destino / "TACES06.TXT"
+    arquivo_validadores = destino / "TFIX105.txt"
+    with open(arquivo_municipios, 'w', encoding='latin-1', newline='\n') as taces, \
+         open(arquivo_validadores, 'w', encoding='latin-1', newline='\n') as tfix:
+        for uf in ufs:
+            nomes = sorted(_nome(aleatorio) for _ in range(contagem_ufs[uf]))
+            codigo = 0
+            for nome in nomes:
+                codigo += aleatorio.randint(1, 80)
+                if aleatorio.random() < acentos:
+                    nome = _acentuar(nome, aleatorio)
+                linha = _linha_municipio(uf, codigo, nome, _nome_ibge(nome), aleatorio.randint(1, 9999))
+                if aleatorio.random() < invalidas:
+                    linha = _malformar(linha, aleatorio)
+                    contagens['municipios_invalidos'] += 1
+                else:
+                    contagens['municipios'] += 1
+                taces.write(linha + '\n')
+                
+                quantidade = aleatorio.choices(range(len(distribuicao)), weights=distribuicao)[0]
+                modulo = aleatorio.randint(1, 999)
+                inicio = INICIO_DATAS + timedelta(days=aleatorio.randint(0, 1500))
+                escolhidos = aleatorio.choices(nomes_validadores, weights=pesos_validadores, k=quantidade)
+                for n, validador in enumerate(escolhidos):
+                    ultimo_validador = n == quantidade - 1
+                    periodos, inicio = _periodos(aleatorio, aleatorio.randint(1, max(1, historico)),
+                                                  inicio, n == 0)
+                    if not ultimo_validador:
+                        # A troca de validador encerra o último período do anterior
+                        periodos[-1] = (periodos[-1][0], f"{inicio - timedelta(days=1):%Y%m%d}")
+                    for texto_inicio, fim in periodos:
+                        gera_cc = 'S' if aleatorio.random() < 0.9 else 'N'
+                        linha = _linha_validador(uf, codigo, validador, texto_inicio, modulo, gera_cc, fim)
+                        if aleatorio.random() < invalidas:
+                            linha = _malformar(linha, aleatorio)
+                            contagens['validadores_invalidos'] += 1
+                        else:
+                            contagens['registros_validadores'] += 1
+                        tfix.write(linha + '\n')
+    
+    return {'arquivos': (arquivo_municipios, arquivo_validadores), **contagens}
+
+
+def _distribuicao(texto: str) -> tuple:
+    return tuple(float(peso) for peso in texto.split(','))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("destino", help="diretório dos arquivos gerados")
+    parser.add_argument("--municipios", type=int, default=5569, help="linhas do TACES06")
+    parser.add_argument("--acentos", type=float, default=0.4, help="fração de nomes acentuados")
+    parser.add_argument("--distribuicao", type=_distribuicao, default=(0.9, 0.07, 0.02, 0.01),
+                        help="pesos de 0, 1, 2, ... validadores por município")
+    parser.add_argument("--historico", type=int, default=3, help="máximo de períodos de validade por validador")
+    parser.add_argument("--invalidas", type=float, default=0.0, help="fração de linhas malformadas")
+    parser.add_argument("--validadores", type=int, default=110, help="validadores distintos")
+    parser.add_argument("--semente", type=int, default=0)
+    opcoes = vars(parser.parse_args())
+    
+    resultado = gerar_presetfiles(opcoes.pop('destino'), **opcoes)
+    for arquivo in resultado.pop('arquivos'):
+        print(arquivo)
+    for nome, valor in resultado.items():
+        print(f"{nome}: {valor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks: fases da carga e ferramentas de consulta, com saída em JSON
+
+Para cada conjunto de dados mede:
+    - as fases da carga (carregar_municipios, carregar_validadores,
+      associar_dados), cada repetição em um associador novo
+    - as ferramentas: busca exata, parcial, sem resultado e com sugestões;
+      classificação NOVO VALIDADOR, MIGRAÇÃO e ALTERAÇÃO DE REGRAS; listagem
+      geral e filtrada por UF
+
+Cada operação reporta p50/p95/p99, média, vazão (operações/s) e o pico de
+memória alocada (tracemalloc, medido em uma execução à parte para não
+distorcer os tempos). Os casos de cada conjunto são escolhidos a partir dos
+próprios dados e conferidos (ex.: a busca "parcial" não pode ser exata).
+
+Conjuntos: `1` são os PresetFiles reais; `N` (> 1) é uma versão ampliada N
+vezes, gravada em um diretório temporário. Com --sintetico, os conjuntos `N`
+são gerados por benchmarks.gerar_presetfiles (N x 5569 municípios, mesma
+semente a cada execução). Tudo roda localmente, sem rede.
+
+Uso:
+    python -m benchmarks.suite [--escalas 1,10] [--iteracoes 200] [--orcamento 2]
+                               [--repeticoes-carga 3] [--sintetico] [--semente 0]
+                               [--saida resultado.json]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from associar_municipios_validadores import AssociadorMunicipiosValidadores, normalizar_nome
+from consultas_municipios import (
+    ALTERACAO_REGRAS,
+    MIGRACAO,
+    NOVO_VALIDADOR,
+    buscar_municipio,
+    classificar_validador,
+    hoje,
+)
+from benchmarks.gerar_presetfiles import gerar_presetfiles
+from src.mcp_server import buscar_municipio_tool, classificar_validador_tool, listar_validadores_tool
+
+ARQUIVO_MUNICIPIOS = BASE_DIR / "PresetFiles" / "TACES06.TXT"
+ARQUIVO_VALIDADORES = BASE_DIR / "PresetFiles" / "TFIX105.txt"
+
+FASES = ('carregar_municipios', 'carregar_validadores', 'associar_dados')
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil (0-100) por interpolação linear"""
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def resumir(tempos_ms: list, pico_kib: float) -> dict:
+    """Estatísticas de uma operação"""
+    total_s = sum(tempos_ms) / 1000
+    return {
+        'iteracoes': len(tempos_ms),
+        'p50_ms': round(percentil(tempos_ms, 50), 4),
+        'p95_ms': round(percentil(tempos_ms, 95), 4),
+        'p99_ms': round(percentil(tempos_ms, 99), 4),
+        'media_ms': round(statistics.fmean(tempos_ms), 4),
+        'min_ms': round(min(tempos_ms), 4),
+        'max_ms': round(max(tempos_ms), 4),
+        'vazao_ops_s': round(len(tempos_ms) / total_s, 2) if total_s else None,
+        'pico_memoria_kib': round(pico_kib, 1),
+    }
+
+
+def pico_memoria(funcao) -> float:
+    """Pico de memória alocada (KiB) durante uma chamada"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def medir_operacao(funcao, iteracoes: int, orcamento: float) -> dict:
+    """Tempos de `funcao()` em até `iteracoes` chamadas ou `orcamento` segundos"""
+    funcao()  # aquecimento
+    tempos = []
+    limite = time.perf_counter() + orcamento
+    while len(tempos) < iteracoes and (not tempos or time.perf_counter() < limite):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return resumir(tempos, pico_memoria(funcao))
+
+
+def novo_associador(arquivos) -> AssociadorMunicipiosValidadores:
+    return AssociadorMunicipiosValidadores(str(arquivos[0]), str(arquivos[1]))
+
+
+def medir_carga(arquivos, repeticoes: int) -> dict:
+    """Tempos de cada fase da carga em `repeticoes` associadores novos"""
+    tempos = {fase: [] for fase in FASES}
+    picos = {}
+    for repeticao in range(repeticoes + 1):
+        associador = novo_associador(arquivos)
+        # A última repetição só mede a memória (tracemalloc deixa a carga mais lenta)
+        rastrear = repeticao == repeticoes
+        if rastrear:
+            gc.collect()
+            tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for fase in FASES:
+                inicio = time.perf_counter()
+                getattr(associador, fase)()
+                if rastrear:
+                    picos[fase] = tracemalloc.get_traced_memory()[1] / 1024
+                    tracemalloc.reset_peak()
+                else:
+                    tempos[fase].append((time.perf_counter() - inicio) * 1000)
+        if rastrear:
+            tracemalloc.stop()
+    return {fase: resumir(tempos[fase], picos[fase]) for fase in FASES}
+
+
+def escolher_casos(associador) -> dict:
+    """Entradas de cada operação, escolhidas nos dados e conferidas"""
+    dia = hoje()
+    unicos = [
+        (chave, associador.municipios[chave].descricao)
+        for chave in associador.municipios
+        if len(associador.indice_nomes[normalizar_nome(associador.municipios[chave].descricao)]) == 1
+    ]
+    
+    # Município com validador atual: alteração de regras com o próprio validador
+    chave, municipio = next(
+        (chave, nome) for chave, nome in unicos if associador.validador_atual(chave, dia))
+    atual = associador.validador_atual(chave, dia).cod_validador
+    
+    # Migração: um validador do catálogo que não é o atual do município
+    migracao = next(
+        codigo for codigo, _ in associador.catalogo_validadores.validadores
+        if codigo and classificar_validador(associador, municipio, codigo).tipo == MIGRACAO)
+    
+    parcial = next(
+        nome[:max(3, len(nome) // 2)] for _, nome in unicos
+        if not associador.buscar_municipios(nome[:max(3, len(nome) // 2)])[1])
+    
+    def com_erro(nome):
+        meio = len(nome) // 2
+        return nome[:meio] + ('Q' if nome[meio] != 'Q' else 'W') + nome[meio + 1:]
+    
+    sugestao = next(
+        com_erro(nome) for _, nome in unicos
+        if len(nome) >= 6 and buscar_municipio(associador, com_erro(nome)).sugestoes
+        and not associador.buscar_municipios(com_erro(nome))[0])
+    
+    casos = {
+        'busca_exata': municipio,
+        'busca_parcial': parcial,
+        'busca_sem_resultado': 'QWXZQWXZQ',
+        'busca_sugestoes': sugestao,
+        'classificacao_novo': (municipio, 'VALIDADOR INEXISTENTE QWXZ'),
+        'classificacao_migracao': (municipio, migracao),
+        'classificacao_alteracao': (municipio, atual),
+        'listagem_uf': chave[0],
+    }
+    
+    # Confere que cada caso percorre o caminho pretendido
+    assert buscar_municipio(associador, casos['busca_exata']).exata
+    busca = buscar_municipio(associador, casos['busca_parcial'])
+    assert busca.encontrado and not busca.exata
+    busca = buscar_municipio(associador, casos['busca_sem_resultado'])
+    assert not busca.encontrado and not busca.sugestoes
+    for operacao, tipo in (('classificacao_novo', NOVO_VALIDADOR), ('classificacao_migracao', MIGRACAO),
+                           ('classificacao_alteracao', ALTERACAO_REGRAS)):
+        assert classificar_validador(associador, *casos[operacao]).tipo == tipo, operacao
+    return casos
+
+
+def medir_ferramentas(associador, iteracoes: int, orcamento: float) -> tuple:
+    """Casos escolhidos e estatísticas de cada ferramenta"""
+    casos = escolher_casos(associador)
+    operacoes = {
+        'busca_exata': lambda: buscar_municipio_tool(casos['busca_exata'], associador),
+        'busca_parcial': lambda: buscar_municipio_tool(casos['busca_parcial'], associador),
+        'busca_sem_resultado': lambda: buscar_municipio_tool(casos['busca_sem_resultado'], associador),
+        'busca_sugestoes': lambda: buscar_municipio_tool(casos['busca_sugestoes'], associador),
+        'classificacao_novo': lambda: classificar_validador_tool(*casos['classificacao_novo'], associador),
+        'classificacao_migracao': lambda: classificar_validador_tool(*casos['classificacao_migracao'], associador),
+        'classificacao_alteracao': lambda: classificar_validador_tool(*casos['classificacao_alteracao'], associador),
+        'listagem_geral': lambda: listar_validadores_tool(None, associador),
+        'listagem_uf': lambda: listar_validadores_tool(casos['listagem_uf'], associador),
+    }
+    return casos, {nome: medir_operacao(funcao, iteracoes, orcamento) for nome, funcao in operacoes.items()}
+
+
+def ampliar_presetfiles(fator: int, destino: Path) -> tuple:
+    """Grava cópias ampliadas dos PresetFiles (cada município repetido `fator` vezes)
+    
+    A cópia k (k > 0) recebe códigos de município deslocados de k * 100000 e o
+    sufixo " k" no nome, mantendo os campos e o alinhamento das colunas.
+    """
+    arquivos = (destino / "TACES06.TXT", destino / "TFIX105.txt")
+    for origem, saida, coluna_nome in ((ARQUIVO_MUNICIPIOS, arquivos[0], 2), (ARQUIVO_VALIDADORES, arquivos[1], None)):
+        linhas = origem.read_text(encoding='latin-1').splitlines()
+        with open(saida, 'w', encoding='latin-1', newline='\n') as arquivo:
+            for copia in range(fator):
+                for linha in linhas:
+                    campos = linha.split('\t')
+                    if copia and len(campos) > 2 and campos[1].strip().isdigit():
+                        codigo = str(int(campos[1]) + copia * 100000)
+                        campos[1] = codigo.rjust(len(campos[1])) if campos[1][:1] == ' ' else codigo.ljust(len(campos[1]))
+                        if coluna_nome is not None:
+                            campos[coluna_nome] = f"{campos[coluna_nome].rstrip()} {copia}".ljust(len(campos[coluna_nome]))
+                    arquivo.write('\t'.join(campos) + '\n')
+    return arquivos
+
+
+def medir_conjunto(nome: str, arquivos, opcoes) -> dict:
+    carga = medir_carga(arquivos, opcoes.repeticoes_carga)
+    associador = novo_associador(arquivos)
+    with contextlib.redirect_stdout(io.StringIO()):
+        associador.carregar_dados()
+    casos, ferramentas = medir_ferramentas(associador, opcoes.iteracoes, opcoes.orcamento)
+    return {
+        'nome': nome,
+        'municipios': len(associador.municipios),
+        'registros_validadores': sum(len(v) for v in associador.validadores.values()),
+        'registros_associados': len(associador.resultados),
+        'casos': casos,
+        'carga': carga,
+        'ferramentas': ferramentas,
+    }
+
+
+def imprimir_resumo(resultado: dict, saida=sys.stderr):
+    for conjunto in resultado['conjuntos']:
+        print(f"\n{conjunto['nome']}: {conjunto['municipios']} municípios, "
+              f"{conjunto['registros_validadores']} registros de validadores", file=saida)
+        print(f"{'OPERAÇÃO':26} | {'P50 MS':>9} | {'P95 MS':>9} | {'P99 MS':>9} | {'OPS/S':>10} | {'PICO KIB':>9}", file=saida)
+        print("-" * 86, file=saida)
+        for nome, r in list(conjunto['carga'].items()) + list(conjunto['ferramentas'].items()):
+            print(f"{nome:26} | {r['p50_ms']:9.3f} | {r['p95_ms']:9.3f} | {r['p99_ms']:9.3f} | "
+                  f"{r['vazao_ops_s'] or 0:10.1f} | {r['pico_memoria_kib']:9.1f}", file=saida)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--escalas", default="1,10", help="conjuntos: 1 = PresetFiles reais, N = ampliado N vezes")
+    parser.add_argument("--iteracoes", type=int, default=200, help="chamadas por ferramenta")
+    parser.add_argument("--orcamento", type=float, default=2.0, help="segundos máximos por ferramenta")
+    parser.add_argument("--repeticoes-carga", type=int, default=3, help="repetições das fases da carga")
+    parser.add_argument("--sintetico", action="store_true", help="conjuntos N gerados sinteticamente")
+    parser.add_argument("--semente", type=int, default=0, help="semente dos conjuntos sintéticos")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    opcoes = parser.parse_args()
+    
+    resultado = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'parametros': vars(opcoes),
+        'conjuntos': [],
+    }
+    
+    for escala in [int(e) for e in opcoes.escalas.split(",")]:
+        if escala <= 1:
+            resultado['conjuntos'].append(medir_conjunto('presetfiles', (ARQUIVO_MUNICIPIOS, ARQUIVO_VALIDADORES), opcoes))
+            continue
+        diretorio = Path(tempfile.mkdtemp(prefix="bench-suite-"))
+        try:
+            if opcoes.sintetico:
+                arquivos = gerar_presetfiles(diretorio, municipios=5569 * escala, semente=opcoes.semente)['arquivos']
+                nome = f'sintetico_x{escala}'
+            else:
+                arquivos = ampliar_presetfiles(escala, diretorio)
+                nome = f'ampliado_x{escala}'
+            resultado['conjuntos'].append(medir_conjunto(nome, arquivos, opcoes))
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+    
+    resultado['rss_maximo_kib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    imprimir_resumo(resultado)
+    
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if opcoes.saida:
+        Path(opcoes.saida).write_text(texto + "\n", encoding='utf-8')
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
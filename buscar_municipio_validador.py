@@ -1,262 +1,144 @@
 from associar_municipios_validadores import AssociadorMunicipiosValidadores
-from datetime import datetime
-import unicodedata
+import consultas_municipios as consultas
+from consultas_municipios import hoje
+import os
 
-def remover_acentos(texto):
-    """Remove acentos de uma string"""
-    nfkd = unicodedata.normalize('NFKD', texto)
-    return ''.join([c for c in nfkd if not unicodedata.combining(c)])
+# Arquivos de entrada
+ARQUIVO_MUNICIPIOS = "PresetFiles/TACES06.TXT"
+ARQUIVO_VALIDADORES = "PresetFiles/TFIX105.txt"
 
-def buscar_municipio(nome_municipio: str, nome_validador: str = None):
+def carregar_associador(ao_progresso=None):
+    """Cria o associador e carrega os dados (do snapshot em MCP_MUNICIPIOS_CACHE_DIR, se configurado)"""
+    associador = AssociadorMunicipiosValidadores(ARQUIVO_MUNICIPIOS, ARQUIVO_VALIDADORES,
+                                                 ao_progresso=ao_progresso)
+    associador.carregar_dados(os.environ.get("MCP_MUNICIPIOS_CACHE_DIR"))
+    return associador
+
+def buscar_municipio(nome_municipio: str, nome_validador: str = None, carregar=carregar_associador):
     """
     Busca validadores de um município específico e classifica um novo validador
     
     Args:
         nome_municipio: Nome do município a buscar
         nome_validador: Nome do validador a classificar (opcional)
+        carregar: Função que retorna o associador com os dados carregados,
+            imprimindo o progresso (o daemon da CLI reaproveita os dados já
+            carregados)
     """
     
-    # Arquivos de entrada
-    arquivo_municipios = "PresetFiles/TACES06.TXT"
-    arquivo_validadores = "PresetFiles/TFIX105.txt"
-    
-    # Cria instância do associador
     print(f"=== BUSCANDO VALIDADORES DO MUNICÍPIO: {nome_municipio.upper()} ===")
     if nome_validador:
         print(f"=== ANALISANDO VALIDADOR: {nome_validador.upper()} ===")
     print()
     
-    associador = AssociadorMunicipiosValidadores(arquivo_municipios, arquivo_validadores)
-    
-    # Carrega os dados
     print("Carregando dados...")
-    associador.carregar_municipios()
-    associador.carregar_validadores()
-    
-    # Associa os dados
-    print("\nAssociando dados...")
-    associador.associar_dados()
-    
-    # Busca o município - melhora a busca para ser mais flexível
-    municipios_encontrados = []
-    municipios_parciais = []  # Para guardar correspondências parciais
-    nome_busca = remover_acentos(nome_municipio.upper().strip())
+    associador = carregar()
     
-    # Primeira passada: busca exata
-    for registro in associador.resultados:
-        nome_registro = remover_acentos(registro['descricao'].upper().strip())
-        
-        # Busca exata primeiro
-        if nome_busca == nome_registro:
-            municipios_encontrados.append(registro)
-        # Guarda correspondências parciais para usar só se não houver exata
-        elif nome_busca in nome_registro:
-            municipios_parciais.append(registro)
+    # Busca o município no índice de nomes normalizados (exata primeiro, depois parcial)
+    dia = hoje()
+    busca = consultas.buscar_municipio(associador, nome_municipio, dia)
     
     # Se não encontrou correspondência exata, usa as parciais
-    if not municipios_encontrados and municipios_parciais:
+    if busca.encontrado and not busca.exata:
         print(f"\n⚠️  Não foi encontrado município com nome exato '{nome_municipio}'.")
         print("Encontrados municípios com nomes similares. Mostrando resultados parciais:")
-        municipios_encontrados = municipios_parciais
     
-    if not municipios_encontrados:
+    if not busca.encontrado:
         print(f"\nMunicípio '{nome_municipio}' não encontrado!")
         
         # Sugere municípios similares - busca mais ampla
         print("\nMunicípios com nomes similares:")
-        similares = []
-        palavras_busca = nome_busca.split()
-        
-        for registro in associador.resultados:
-            nome_registro = remover_acentos(registro['descricao'].upper())
-            # Verifica se alguma palavra da busca está no nome
-            for palavra in palavras_busca:
-                if len(palavra) >= 3 and palavra in nome_registro:
-                    if registro not in similares:
-                        similares.append(registro)
-                        break
-        
-        # Remove duplicatas e mostra únicos
-        municipios_unicos = {}
-        for s in similares:
-            chave = f"{s['descricao']} ({s['cod_estado']})"
-            municipios_unicos[chave] = s
+        for sugestao in busca.sugestoes:
+            print(f"  - {sugestao.nome} ({sugestao.estado})")
         
-        for nome in sorted(municipios_unicos.keys())[:20]:
-            print(f"  - {nome}")
-            
         return
     
-    # Remove duplicatas mantendo apenas registros únicos
-    municipios_unicos = {}
-    for m in municipios_encontrados:
-        chave = (m['cod_estado'], m['cod_municipio'], m['cod_validador'])
-        municipios_unicos[chave] = m
-    
-    municipios_encontrados = list(municipios_unicos.values())
-    
-    # Separa por município (pode haver mais de um com mesmo nome em estados diferentes)
-    municipios_por_codigo = {}
-    for registro in municipios_encontrados:
-        chave = (registro['cod_estado'], registro['cod_municipio'])
-        if chave not in municipios_por_codigo:
-            municipios_por_codigo[chave] = {
-                'info': {
-                    'estado': registro['cod_estado'],
-                    'codigo': registro['cod_municipio'],
-                    'nome': registro['descricao']
-                },
-                'validadores': []
-            }
-        if registro['cod_validador']:  # Só adiciona se tiver validador
-            municipios_por_codigo[chave]['validadores'].append(registro)
-    
-    # Processa cada município encontrado
-    for chave, dados in municipios_por_codigo.items():
-        info = dados['info']
-        validadores = dados['validadores']
-        
+    # Processa cada município encontrado (pode haver mais de um com mesmo nome em estados diferentes)
+    for municipio in busca.municipios:
         print(f"\n{'='*150}")
-        print(f"MUNICÍPIO: {info['nome']} - {info['estado']} (Código: {info['codigo']})")
+        print(f"MUNICÍPIO: {municipio.nome} - {municipio.estado} (Código: {municipio.codigo})")
         print(f"{'='*150}")
         
-        if not validadores:
+        if not municipio.validadores:
             print("\n❌ Este município NÃO possui validadores cadastrados.")
-            if nome_validador:
-                print(f"\n📋 CLASSIFICAÇÃO DO VALIDADOR '{nome_validador}':")
-                
-                # Verifica se o validador existe na lista geral
-                validador_existe_geral = False
-                
-                # Percorre todos os validadores carregados para verificar se existe
-                for municipio_validadores in associador.validadores.values():
-                    for v in municipio_validadores:
-                        if nome_validador.upper() in v['cod_validador'].upper() or \
-                           nome_validador.upper() in v['desc_validador'].upper():
-                            validador_existe_geral = True
-                            break
-                    if validador_existe_geral:
-                        break
-                
-                if not validador_existe_geral:
-                    print(f"   ✅ NOVO VALIDADOR")
-                    print(f"   → Este validador não existe no sistema")
-                else:
-                    print(f"   ↔️  MIGRAÇÃO DE VALIDADOR")
-                    print(f"   → O validador existe no sistema mas nunca foi usado por {info['nome']}")
         else:
             print(f"\n📋 VALIDADORES ATUAIS DO MUNICÍPIO:")
             print(f"{'─'*120}")
             print(f"{'VALIDADOR':^25} | {'DESCRIÇÃO':^35} | {'DT INICIAL':^10} | {'DT VALID':^10} | {'STATUS':^6}")
             print(f"{'─'*120}")
             
-            # Ordena validadores por data para identificar o mais atual
-            for v in validadores:
-                # Pega a data inicial diretamente do registro
-                data_inicial = v.get('data_inicial', '')
-                
-                # Se não tem data de validade, considera como atual
-                if not v['valid_validador']:
-                    situacao = "ATIVO"
-                else:
-                    # Verifica se a data de validade já passou
-                    try:
-                        dia, mes, ano = v['valid_validador'].split('/')
-                        data_valid = datetime(int(ano), int(mes), int(dia))
-                        if data_valid < datetime.now():
-                            situacao = "EXPIRADO"
-                        else:
-                            situacao = "ATIVO"
-                    except:
-                        situacao = "ATIVO"
-                
+            for v in municipio.validadores:
                 # Formatação mais compacta
-                cod_val = v['cod_validador'][:25]
-                desc_val = v['desc_validador'][:35]
-                status = f"{v['valid_final']}-{situacao}"
+                cod_val = v.codigo[:25]
+                desc_val = v.descricao[:35]
+                status = f"{v.indicador}-{v.situacao}"
                 
-                print(f"{cod_val:25} | {desc_val:35} | {data_inicial:^10} | {v['valid_validador']:^10} | {status}")
+                print(f"{cod_val:25} | {desc_val:35} | {v.data_inicial:^10} | {v.data_validade:^10} | {status}")
             
-            # Identifica o validador mais atual
-            validador_atual = None
-            for v in validadores:
-                if v['valid_final'] == 'S':
-                    if not v['valid_validador']:  # Sem data de validade = atual
-                        validador_atual = v
-                        break
-                    else:
-                        # Verifica se ainda está válido
-                        try:
-                            dia, mes, ano = v['valid_validador'].split('/')
-                            data_valid = datetime(int(ano), int(mes), int(dia))
-                            if data_valid >= datetime.now():
-                                if not validador_atual or (validador_atual['valid_validador'] and 
-                                    datetime.strptime(validador_atual['valid_validador'], '%d/%m/%Y') < data_valid):
-                                    validador_atual = v
-                        except:
-                            pass
-            
-            # Se não encontrou nenhum ativo, pega o último da lista
-            if not validador_atual and validadores:
-                validador_atual = validadores[-1]
+            # Validador mais atual (pré-calculado na carga, mesma regra do servidor MCP)
+            validador_atual = associador.validador_atual((municipio.estado, municipio.codigo), dia)
             
             print(f"\n🔍 VALIDADOR MAIS ATUAL: {validador_atual['desc_validador'] if validador_atual else 'Nenhum ativo'}")
-            
-            # Classifica o validador informado
-            if nome_validador:
-                print(f"\n📋 CLASSIFICAÇÃO DO VALIDADOR '{nome_validador}':")
-                
-                # Primeiro, verifica se o validador existe na lista geral de validadores
-                validador_existe_geral = False
-                
-                # Percorre todos os validadores carregados para verificar se existe
-                for municipio_validadores in associador.validadores.values():
-                    for v in municipio_validadores:
-                        if nome_validador.upper() in v['cod_validador'].upper() or \
-                           nome_validador.upper() in v['desc_validador'].upper():
-                            validador_existe_geral = True
-                            break
-                    if validador_existe_geral:
-                        break
-                
-                # Se não existe na lista geral de validadores
-                if not validador_existe_geral:
-                    print(f"   ✅ NOVO VALIDADOR")
-                    print(f"   → Este validador não existe no sistema")
-                else:
-                    # O validador existe no sistema, agora verifica se existe para este município
-                    validador_existe_municipio = False
-                    validador_igual_atual = False
-                    
-                    for v in validadores:
-                        if nome_validador.upper() in v['cod_validador'].upper() or \
-                           nome_validador.upper() in v['desc_validador'].upper():
-                            validador_existe_municipio = True
-                            # Verifica se é o validador atual
-                            if validador_atual and (
-                                v['cod_validador'] == validador_atual['cod_validador'] or
-                                v['desc_validador'] == validador_atual['desc_validador']):
-                                validador_igual_atual = True
-                            break
-                    
-                    if not validador_existe_municipio:
-                        print(f"   ↔️  MIGRAÇÃO DE VALIDADOR")
-                        print(f"   → O validador existe no sistema mas nunca foi usado por {info['nome']}")
-                    elif not validador_igual_atual:
-                        print(f"   ↔️  MIGRAÇÃO DE VALIDADOR")
-                        print(f"   → {info['nome']} já usou este validador, mas não é o atual")
-                        print(f"   → Mudança de '{validador_atual['desc_validador'] if validador_atual else 'N/A'}' para '{nome_validador}'")
-                    else:
-                        print(f"   🔄 ALTERAÇÃO DE REGRAS")
-                        print(f"   → {info['nome']} já usa este validador atualmente")
+        
+        # Classifica o validador informado com a mesma regra do servidor MCP,
+        # restrita a este município
+        if nome_validador:
+            classificacao = consultas.classificar_validador(
+                associador, nome_municipio, nome_validador, busca._replace(municipios=[municipio]), dia
+            )
+            print(f"\n📋 CLASSIFICAÇÃO DO VALIDADOR '{nome_validador}':")
+            imprimir_classificacao(classificacao)
+
+def imprimir_classificacao(classificacao):
+    """Imprime a classificação de um validador para um município"""
+    if classificacao.tipo == consultas.NOVO_VALIDADOR:
+        print(f"   ✅ NOVO VALIDADOR")
+        print(f"   → Este validador não existe no sistema")
+    elif classificacao.tipo == consultas.ALTERACAO_REGRAS:
+        print(f"   🔄 ALTERAÇÃO DE REGRAS")
+        print(f"   → {classificacao.municipio} já usa este validador atualmente")
+    elif not classificacao.usado_pelo_municipio:
+        print(f"   ↔️  MIGRAÇÃO DE VALIDADOR")
+        print(f"   → O validador existe no sistema mas nunca foi usado por {classificacao.municipio}")
+    else:
+        print(f"   ↔️  MIGRAÇÃO DE VALIDADOR")
+        print(f"   → {classificacao.municipio} já usou este validador, mas não é o atual")
+        if classificacao.validador_atual:
+            print(f"   → Mudança de '{classificacao.validador_atual.descricao}' para '{classificacao.validador}'")
+
+def consultar(nome_municipio: str, nome_validador: str = None, usar_daemon: bool = False):
+    """Executa a consulta no daemon da CLI (se pedido e disponível) ou neste processo"""
+    if usar_daemon:
+        import sys
+        import daemon_cli
+        saida = daemon_cli.consultar(nome_municipio, nome_validador)
+        if saida is not None:
+            sys.stdout.write(saida)
+            return
+    buscar_municipio(nome_municipio, nome_validador)
 
 def main():
     """Função principal"""
     import sys
     
+    # Modo daemon (--daemon ou MCP_MUNICIPIOS_CLI_DAEMON=1): as consultas são
+    # respondidas por um processo em segundo plano com os dados já carregados
+    args = sys.argv[1:]
+    usar_daemon = os.environ.get("MCP_MUNICIPIOS_CLI_DAEMON", "0") != "0"
+    if args and args[0] == "--daemon":
+        usar_daemon = True
+        args = args[1:]
+    elif args and args[0] == "--lote":
+        import lote_cli
+        lote_cli.main(args[1:])
+        return
+    elif args and args[0] == "--parar-daemon":
+        import daemon_cli
+        print("Daemon encerrado" if daemon_cli.parar() else "Nenhum daemon em execução")
+        return
+    
     # Verifica argumentos da linha de comando
-    if len(sys.argv) > 1:
-        args = sys.argv[1:]
+    if args:
         
         # Lista de validadores conhecidos (nomes completos)
         validadores_conhecidos = [
@@ -353,15 +235,16 @@ def main():
         # Se ainda não separou, assume que todos os argumentos são o município
         if nome_municipio is None:
             nome_municipio = ' '.join(args)
-            
+        
         # Remove espaços extras
         nome_municipio = nome_municipio.strip() if nome_municipio else ''
         nome_validador = nome_validador.strip() if nome_validador else None
         
         if nome_municipio:
-            buscar_municipio(nome_municipio, nome_validador)
+            consultar(nome_municipio, nome_validador, usar_daemon)
         else:
-            print("Uso: python buscar_municipio_validador.py <nome_municipio> [nome_validador]")
+            print("Uso: python buscar_municipio_validador.py [--daemon] <nome_municipio> [nome_validador]")
+            print("       python buscar_municipio_validador.py --lote <arquivo.csv|arquivo.jsonl|-> [opções]")
             print("Exemplos:")
             print('  python buscar_municipio_validador.py "nova iguacu" "ISS DIGITAL"')
             print('  python buscar_municipio_validador.py sao paulo iss digital')
@@ -0,0 +1,166 @@
+"""
+Camada de consultas estruturadas sobre o AssociadorMunicipiosValidadores
+
+As ferramentas do servidor MCP montam seus resultados aqui, como objetos
+(namedtuples) independentes da apresentação; a conversão para texto ou JSON
+fica a cargo de quem apresenta. A classificação de um validador reaproveita
+a busca do município já resolvida, sem buscar o mesmo nome duas vezes.
+
+A situação dos validadores e o validador atual são calculados para um dia
+(ordinal de date); por padrão, o dia corrente de hoje(), que é guardado e só
+é recalculado na virada do dia.
+
+Exemplo:
+    busca = buscar_municipio(associador, 'Jacareí')
+    classificacao = classificar_validador(associador, 'Jacareí', 'GINFES', busca)
+    dados = como_dict(classificacao)
+"""
+
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+# Tipos de classificação de um validador para um município
+NOVO_VALIDADOR = 'novo_validador'
+MIGRACAO = 'migracao'
+ALTERACAO_REGRAS = 'alteracao_regras'
+
+ValidadorMunicipio = namedtuple('ValidadorMunicipio', [
+    'codigo', 'descricao', 'data_inicial', 'data_validade', 'indicador', 'situacao'
+])
+ValidadorMunicipio.__doc__ = """Validador cadastrado para um município
+
+data_validade vazia indica validador sem data de término; situacao é
+ATIVO ou EXPIRADO em relação à data da consulta."""
+
+MunicipioEncontrado = namedtuple('MunicipioEncontrado', ['estado', 'codigo', 'nome', 'validadores'])
+MunicipioEncontrado.__doc__ = "Município encontrado na busca, com seus validadores (lista de ValidadorMunicipio)"
+
+Sugestao = namedtuple('Sugestao', ['estado', 'codigo', 'nome'])
+Sugestao.__doc__ = "Município com nome parecido com o buscado"
+
+ResultadoBusca = namedtuple('ResultadoBusca', ['consulta', 'encontrado', 'exata', 'municipios', 'sugestoes'])
+ResultadoBusca.__doc__ = """Resultado da busca de um município pelo nome
+
+municipios é a lista de MunicipioEncontrado; sugestoes só é preenchida
+quando nenhum município foi encontrado."""
+
+Classificacao = namedtuple('Classificacao', [
+    'validador', 'busca', 'tipo', 'municipio', 'usado_pelo_municipio', 'validador_atual'
+])
+Classificacao.__doc__ = """Classificação de um validador para um município
+
+tipo é NOVO_VALIDADOR, MIGRACAO ou ALTERACAO_REGRAS, ou None quando o
+município não foi encontrado; municipio é o nome do primeiro município da
+busca e validador_atual o ValidadorMunicipio em uso (ou None), conforme
+AssociadorMunicipiosValidadores.validador_atual."""
+
+
+# Dia corrente guardado: (ordinal de hoje, instante da próxima virada do dia)
+_hoje = (0, 0.0)
+
+
+def hoje() -> int:
+    """Ordinal do dia corrente, recalculado apenas quando o dia vira"""
+    global _hoje
+    dia, virada = _hoje
+    if time.time() >= virada:
+        atual = date.today()
+        amanha = datetime.combine(atual + timedelta(days=1), datetime.min.time())
+        dia = atual.toordinal()
+        _hoje = (dia, amanha.timestamp())
+    return dia
+
+
+def situacao_validador(registro, dia: int) -> str:
+    """ATIVO se o validador não tem data de término ou ela ainda não chegou"""
+    return "ATIVO" if registro.ativo(dia) else "EXPIRADO"
+
+
+def validador_municipio(registro, dia: int) -> ValidadorMunicipio:
+    """ValidadorMunicipio a partir de um RegistroValidador"""
+    return ValidadorMunicipio(
+        codigo=registro.cod_validador,
+        descricao=registro.desc_validador,
+        data_inicial=registro.data_inicial,
+        data_validade=registro.valid_validador,
+        indicador=registro.valid_final,
+        situacao=situacao_validador(registro, dia),
+    )
+
+
+def buscar_municipio(associador, nome_municipio: str, dia: int = None) -> ResultadoBusca:
+    """Busca um município pelo nome (exata primeiro, depois parcial)
+    
+    Sem nenhum município encontrado, o resultado traz as sugestões de nomes
+    parecidos.
+    """
+    dia = dia or hoje()
+    chaves, exata = associador.buscar_municipios(nome_municipio)
+    
+    if not chaves:
+        sugestoes = []
+        for chave in associador.sugerir_municipios(nome_municipio):
+            municipio = associador.municipios[chave]
+            sugestoes.append(Sugestao(municipio.cod_estado, municipio.cod_municipio, municipio.descricao))
+        return ResultadoBusca(nome_municipio, False, False, [], sugestoes)
+    
+    municipios = []
+    for chave in chaves:
+        municipio = associador.municipios[chave]
+        municipios.append(MunicipioEncontrado(
+            estado=municipio.cod_estado,
+            codigo=municipio.cod_municipio,
+            nome=municipio.descricao,
+            validadores=[validador_municipio(v, dia) for v in associador.validadores_por_municipio[chave]],
+        ))
+    return ResultadoBusca(nome_municipio, True, exata, municipios, [])
+
+
+def classificar_validador(associador, nome_municipio: str, nome_validador: str,
+                          busca: ResultadoBusca = None, dia: int = None) -> Classificacao:
+    """Classifica um validador para um município
+    
+    Usa os municípios de `busca` (a busca de `nome_municipio` já resolvida) ou
+    faz a busca uma única vez. Se o validador não existe no sistema é
+    NOVO_VALIDADOR; se o município nunca o usou, ou já usou mas não é o
+    atual, é MIGRACAO; se é o validador atual, ALTERACAO_REGRAS.
+    """
+    dia = dia or hoje()
+    busca = busca or buscar_municipio(associador, nome_municipio, dia)
+    if not busca.encontrado:
+        return Classificacao(nome_validador, busca, None, None, False, None)
+    
+    chaves = [(municipio.estado, municipio.codigo) for municipio in busca.municipios]
+    nome_encontrado = busca.municipios[0].nome
+    
+    catalogo = associador.catalogo_validadores
+    correspondentes = catalogo.correspondentes(nome_validador)
+    if not correspondentes:
+        return Classificacao(nome_validador, busca, NOVO_VALIDADOR, nome_encontrado, False, None)
+    
+    # Mapa reverso do catálogo: o município usa (ou já usou) este validador?
+    usado = not catalogo.municipios(correspondentes).isdisjoint(chaves)
+    
+    # Validador atual (pré-calculado na carga); com vários municípios, o do último
+    atual = None
+    for chave in chaves:
+        atual = associador.validador_atual(chave, dia) or atual
+    
+    if usado and atual and catalogo.id_validador(atual) in correspondentes:
+        tipo = ALTERACAO_REGRAS
+    else:
+        tipo = MIGRACAO
+    return Classificacao(
+        nome_validador, busca, tipo, nome_encontrado, usado,
+        validador_municipio(atual, dia) if atual else None
+    )
+
+
+def como_dict(resultado):
+    """Converte um resultado (namedtuples aninhadas) em dicts e listas para JSON"""
+    if hasattr(resultado, '_asdict'):
+        return {campo: como_dict(valor) for campo, valor in resultado._asdict().items()}
+    if isinstance(resultado, (list, tuple)):
+        return [como_dict(valor) for valor in resultado]
+    return resultado
@@ -0,0 +1,251 @@
+"""
+Daemon local da CLI buscar_municipio_validador
+
+Mantém os dados carregados em um processo em segundo plano, atendendo às
+consultas da CLI por um socket Unix: a primeira chamada com --daemon (ou
+MCP_MUNICIPIOS_CLI_DAEMON=1) inicia o daemon e as seguintes só enviam a
+consulta e imprimem a resposta, sem criar o associador nem ler os arquivos.
+
+Protocolo: o cliente envia uma linha JSON ({"municipio": ..., "validador": ...}
+ou {"comando": "parar"}) e recebe a saída da CLI, em UTF-8, até o fim da
+conexão; um pedido em outro formato é encerrado sem resposta. A saída é
+idêntica à da execução direta, inclusive as mensagens da carga (repetidas a
+partir da última carga real).
+
+O daemon:
+    - é identificado pelo diretório atual e pelo MCP_MUNICIPIOS_CACHE_DIR
+      (os caminhos dos arquivos da CLI são relativos), ou pelo caminho em
+      MCP_MUNICIPIOS_DAEMON_SOCKET
+    - recarrega os dados quando o tamanho ou o mtime de um arquivo fonte muda
+      (conferido a cada consulta)
+    - encerra após MCP_MUNICIPIOS_DAEMON_OCIOSO segundos sem consultas (600)
+
+Se o daemon não puder ser iniciado ou não responder, a CLI executa a consulta
+no próprio processo. Em plataformas sem socket Unix ou fcntl (ex.: Windows) o
+daemon não está disponível e as consultas rodam sempre no próprio processo.
+
+Uso direto:
+    python daemon_cli.py [--servir | --parar]
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import time
+
+import buscar_municipio_validador as cli
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# O daemon depende de socket Unix e de flock
+DISPONIVEL = fcntl is not None and hasattr(socket, 'AF_UNIX')
+
+OCIOSO = float(os.environ.get("MCP_MUNICIPIOS_DAEMON_OCIOSO", "600"))
+
+# Tempo máximo de espera pela partida do daemon e por uma resposta (s)
+PRAZO_PARTIDA = 30
+PRAZO_RESPOSTA = 120
+
+
+def caminho_socket() -> str:
+    """Socket do daemon deste diretório e cache (ou MCP_MUNICIPIOS_DAEMON_SOCKET)"""
+    explicito = os.environ.get("MCP_MUNICIPIOS_DAEMON_SOCKET")
+    if explicito:
+        return explicito
+    identidade = f"{os.getcwd()}\0{os.environ.get('MCP_MUNICIPIOS_CACHE_DIR', '')}"
+    digest = hashlib.sha256(identidade.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"mcp-municipios-{os.getuid()}-{digest}.sock")
+
+
+def _assinatura(arquivos) -> tuple:
+    """Tamanho e mtime de cada arquivo (None se não existe)"""
+    assinatura = []
+    for arquivo in arquivos:
+        try:
+            info = os.stat(arquivo)
+        except OSError:
+            assinatura.append(None)
+        else:
+            assinatura.append((info.st_size, info.st_mtime_ns))
+    return tuple(assinatura)
+
+
+class DadosCarregados:
+    """Associador carregado pelo daemon e as mensagens impressas na carga"""
+    
+    def __init__(self):
+        self.associador = None
+        self.mensagens = []
+        self.assinatura = None
+        self.cargas = 0
+    
+    def atualizar(self):
+        """Carrega os dados na primeira vez e sempre que os arquivos fonte mudam"""
+        # A assinatura é tirada antes da carga: uma alteração durante a
+        # leitura provoca nova carga na consulta seguinte
+        assinatura = _assinatura((cli.ARQUIVO_MUNICIPIOS, cli.ARQUIVO_VALIDADORES))
+        if self.associador is not None and assinatura == self.assinatura:
+            return
+        mensagens = []
+        self.associador = cli.carregar_associador(ao_progresso=mensagens.append)
+        self.mensagens = mensagens
+        self.assinatura = assinatura
+        self.cargas += 1
+    
+    def carregar(self):
+        """Função de carga usada pela CLI: repete as mensagens e devolve o associador"""
+        self.atualizar()
+        for mensagem in self.mensagens:
+            print(mensagem)
+        return self.associador
+
+
+class _Tratador(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        try:
+            pedido = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if not isinstance(pedido, dict):
+            return
+        if pedido.get("comando") == "parar":
+            self.server.parar = True
+            self.wfile.write(b"ok")
+            return
+        if not isinstance(pedido.get("municipio"), str) or \
+                not isinstance(pedido.get("validador"), (str, type(None))):
+            return
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            try:
+                cli.buscar_municipio(pedido["municipio"], pedido.get("validador"),
+                                     carregar=self.server.dados.carregar)
+            except Exception as e:
+                print(f"Erro no daemon da CLI: {e}")
+        self.wfile.write(saida.getvalue().encode('utf-8'))
+
+
+class _Servidor(socketserver.UnixStreamServer):
+    """Atende uma conexão por vez e encerra após o tempo ocioso"""
+    
+    def handle_timeout(self):
+        self.parar = True
+
+
+def servir(caminho: str = None):
+    """Executa o daemon até o tempo ocioso ou um pedido de parada"""
+    if not DISPONIVEL:
+        raise OSError("daemon da CLI indisponível nesta plataforma (requer socket Unix)")
+    caminho = caminho or caminho_socket()
+    # Só um daemon por socket: quem não obtém a trava desiste. O arquivo da
+    # trava fica no lugar ao encerrar: removê-lo permitiria que um daemon
+    # travasse o arquivo removido e outro, um novo arquivo com o mesmo nome
+    trava = open(f"{caminho}.lock", "w")
+    try:
+        fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        trava.close()
+        return
+    os.umask(0o077)
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(caminho)
+    servidor = _Servidor(caminho, _Tratador)
+    servidor.timeout = OCIOSO
+    servidor.parar = False
+    servidor.dados = DadosCarregados()
+    try:
+        # Carrega antes da primeira consulta; quem conectar nesse meio-tempo aguarda na fila
+        with contextlib.redirect_stdout(io.StringIO()):
+            servidor.dados.atualizar()
+        while not servidor.parar:
+            servidor.handle_request()
+    finally:
+        servidor.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(caminho)
+        trava.close()
+
+
+def _enviar(caminho: str, pedido: dict) -> str:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+        conexao.settimeout(PRAZO_RESPOSTA)
+        conexao.connect(caminho)
+        conexao.sendall(json.dumps(pedido).encode('utf-8') + b"\n")
+        partes = []
+        while True:
+            parte = conexao.recv(65536)
+            if not parte:
+                break
+            partes.append(parte)
+    return b"".join(partes).decode('utf-8')
+
+
+def iniciar() -> bool:
+    """Inicia o daemon em segundo plano e espera o socket aceitar conexões"""
+    caminho = caminho_socket()
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), "--servir"],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    limite = time.monotonic() + PRAZO_PARTIDA
+    while time.monotonic() < limite:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+            try:
+                conexao.connect(caminho)
+                return True
+            except OSError:
+                time.sleep(0.05)
+    return False
+
+
+def consultar(nome_municipio: str, nome_validador: str = None):
+    """Saída da CLI para a consulta, respondida pelo daemon (iniciado se preciso)
+    
+    Returns:
+        Texto da saída, ou None se o daemon não estiver disponível
+    """
+    if not DISPONIVEL:
+        return None
+    pedido = {"municipio": nome_municipio, "validador": nome_validador}
+    try:
+        return _enviar(caminho_socket(), pedido)
+    except (FileNotFoundError, ConnectionRefusedError):
+        pass
+    except OSError:
+        return None
+    try:
+        if iniciar():
+            return _enviar(caminho_socket(), pedido)
+    except OSError:
+        pass
+    return None
+
+
+def parar() -> bool:
+    """Pede ao daemon deste diretório que encerre; False se não havia daemon"""
+    if not DISPONIVEL:
+        return False
+    try:
+        _enviar(caminho_socket(), {"comando": "parar"})
+    except OSError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--servir"]:
+        servir()
+    elif sys.argv[1:] == ["--parar"]:
+        print("Daemon encerrado" if parar() else "Nenhum daemon em execução")
+    else:
+        print("Uso: python daemon_cli.py [--servir | --parar]")
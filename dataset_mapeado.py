@@ -0,0 +1,563 @@
+"""
+Dataset somente leitura em arquivo mapeado em memória, compartilhado entre processos
+
+O snapshot (snapshot_associador) evita reler os arquivos texto, mas cada
+processo ainda desserializa todos os registros e índices em objetos Python
+próprios. Aqui os dados já associados e indexados são publicados em um
+arquivo de layout plano: tabelas de inteiros (uint32/int32) e uma tabela de
+textos UTF-8, cada uma em uma seção de deslocamento fixo. Os processos
+mapeiam o arquivo (mmap) e leem as tabelas direto do mapeamento, sem cópia:
+o sistema operacional compartilha as mesmas páginas entre todos eles.
+Municípios, registros e postagens dos índices só viram objetos Python
+quando acessados.
+
+Formato do arquivo (versionado):
+    MAGIC (8 bytes) | versão (uint32) | tamanho do cabeçalho (uint32) |
+    cabeçalho JSON (fontes + seções) | seções alinhadas em 8 bytes
+
+Os totais pré-calculados (resumo e erros da carga) vão serializados com
+pickle; o cabeçalho guarda o SHA-256 dessas seções, conferido antes de
+desserializá-las.
+
+O mapeamento dura enquanto houver visões sobre ele: uma recarga troca o
+associador, requisições em andamento terminam com o anterior e o arquivo é
+desmapeado quando a última referência é liberada. Não há fechamento
+explícito de um dataset aplicado, que invalidaria as visões em uso.
+
+As tabelas ordenadas (chaves dos municípios, nomes normalizados, trigramas,
+pares código/descrição) são comparadas pelos bytes UTF-8, cuja ordem é a
+mesma dos textos, e consultadas por busca binária. Como no snapshot, o
+arquivo é associado às fontes pelo tamanho, mtime e hash do conteúdo; um
+arquivo desatualizado é ignorado e publicado de novo.
+
+Exemplo:
+    publicar_dataset(associador, '/dev/shm/municipios')     # processo principal
+    anexar_dataset(outro_associador, '/dev/shm/municipios')  # cada trabalhador
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import ItemsView, Mapping, Sequence
+from pathlib import Path
+
+from indices_busca import CatalogoValidadores, IndiceTrigramas
+from registros import Municipio, RegistroValidador, VisaoResultados
+from snapshot_associador import descrever_fonte, fonte_confere
+
+MAGIC = b"AMVDADOS"
+DATASET_VERSAO = 2
+_PREFIXO = struct.Struct("<8sII")
+_ALINHAMENTO = 8
+
+# Tipos das tabelas (códigos de array/memoryview); os tamanhos nativos vão no cabeçalho
+_TIPOS = ('B', 'I', 'i')
+
+# Seções desserializadas com pickle, conferidas pelo SHA-256 gravado no cabeçalho
+_SECOES_VERIFICADAS = ('resumo', 'erros')
+
+
+class DatasetInvalido(Exception):
+    """Dataset ausente, desatualizado ou corrompido"""
+
+
+def caminho_dataset(diretorio_cache, arquivos_fonte) -> Path:
+    """Caminho do dataset mapeado para um conjunto de arquivos fonte"""
+    nomes = '|'.join(str(Path(arquivo).resolve()) for arquivo in arquivos_fonte)
+    digest = hashlib.sha256(nomes.encode('utf-8')).hexdigest()[:16]
+    return Path(diretorio_cache) / f"associador-{digest}.v{DATASET_VERSAO}.dados"
+
+
+def _codificar(chave):
+    """Forma comparável de uma chave: textos em bytes UTF-8 (também dentro de tuplas)"""
+    if isinstance(chave, str):
+        return chave.encode('utf-8')
+    if isinstance(chave, tuple):
+        return tuple(_codificar(parte) for parte in chave)
+    return chave
+
+
+def _ordem(chaves: list) -> list:
+    """Posições das chaves em ordem crescente (empates na ordem original)"""
+    return sorted(range(len(chaves)), key=lambda i: _codificar(chaves[i]))
+
+
+class _Publicacao:
+    """Tabelas de um dataset em montagem"""
+    
+    def __init__(self):
+        self.textos = {}  # texto -> id
+        self.secoes = {}  # nome -> (tipo, conteúdo)
+    
+    def texto(self, texto: str) -> int:
+        """Id de um texto na tabela de textos (cada texto distinto é gravado uma vez)"""
+        id_texto = self.textos.get(texto)
+        if id_texto is None:
+            id_texto = self.textos[texto] = len(self.textos)
+        return id_texto
+    
+    def tabela(self, nome: str, valores, tipo: str = 'I'):
+        self.secoes[nome] = (tipo, array(tipo, valores).tobytes())
+    
+    def grupos(self, nome: str, grupos):
+        """Listas de inteiros em formato compacto: início de cada grupo + valores concatenados"""
+        inicios = [0]
+        valores = []
+        for grupo in grupos:
+            valores.extend(grupo)
+            inicios.append(len(valores))
+        self.tabela(f'{nome}.inicio', inicios)
+        self.tabela(f'{nome}.valores', valores)
+    
+    def finalizar(self):
+        """Grava a tabela de textos (deslocamentos + bytes UTF-8)"""
+        deslocamentos = [0]
+        dados = bytearray()
+        for texto in self.textos:
+            dados += texto.encode('utf-8')
+            deslocamentos.append(len(dados))
+        self.tabela('textos.inicio', deslocamentos)
+        self.secoes['textos.dados'] = ('B', bytes(dados))
+
+
+def _publicar_trigramas(publicacao: _Publicacao, prefixo: str, indice: IndiceTrigramas):
+    textos = list(indice.textos)
+    publicacao.tabela(f'{prefixo}.textos', [publicacao.texto(texto) for texto in textos])
+    publicacao.tabela(f'{prefixo}.ordem', _ordem(textos))
+    gramas = sorted(indice.postagens, key=_codificar)
+    publicacao.tabela(f'{prefixo}.gramas', [publicacao.texto(gram) for gram in gramas])
+    publicacao.grupos(f'{prefixo}.postagens', [sorted(indice.postagens[gram]) for gram in gramas])
+    publicacao.tabela(f'{prefixo}.total', indice.total_trigramas)
+
+
+def publicar_dataset(associador, diretorio_cache) -> Path:
+    """Grava os dados e índices do associador como dataset mapeável (escrita atômica)"""
+    arquivos_fonte = [associador.arquivo_municipios, associador.arquivo_validadores]
+    destino = caminho_dataset(diretorio_cache, arquivos_fonte)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    publicacao = _Publicacao()
+    
+    # Municípios na ordem do TACES06
+    chaves = list(associador.municipios)
+    municipios = list(associador.municipios.values())
+    nomes = [nome for nome, _ in associador.nomes_normalizados]
+    publicacao.tabela('municipios.estado', [publicacao.texto(m.cod_estado) for m in municipios])
+    publicacao.tabela('municipios.codigo', [m.cod_municipio for m in municipios], 'i')
+    publicacao.tabela('municipios.nome', [publicacao.texto(m.descricao) for m in municipios])
+    publicacao.tabela('municipios.normalizado', [publicacao.texto(nome) for nome in nomes])
+    publicacao.tabela('municipios.por_chave', _ordem(chaves))
+    publicacao.tabela('municipios.por_nome', _ordem(nomes))
+    
+    # Registros de validadores agrupados por município (inclusive os ausentes no TACES06)
+    grupos = list(associador.validadores)
+    registros = []
+    posicoes = {}  # id do objeto -> posição do registro
+    inicios = [0]
+    for chave in grupos:
+        for registro in associador.validadores[chave]:
+            posicoes[id(registro)] = len(registros)
+            registros.append(registro)
+        inicios.append(len(registros))
+    for campo in RegistroValidador.CAMPOS:
+        publicacao.tabela(f'registros.{campo}', [publicacao.texto(getattr(r, campo)) for r in registros])
+    publicacao.tabela('grupos.estado', [publicacao.texto(estado) for estado, _ in grupos])
+    publicacao.tabela('grupos.codigo', [codigo for _, codigo in grupos], 'i')
+    publicacao.tabela('grupos.inicio', inicios)
+    publicacao.tabela('grupos.por_chave', _ordem(grupos))
+    
+    publicacao.grupos('por_municipio', (
+        [posicoes[id(r)] for r in associador.validadores_por_municipio[chave]] for chave in chaves))
+    publicacao.grupos('candidatos', (
+        [posicoes[id(r)] for r in associador.candidatos_atual.get(chave, ())] for chave in grupos))
+    publicacao.tabela('vencimentos', associador.vencimentos, 'i')
+    _publicar_trigramas(publicacao, 'nomes', associador.indice_trigramas)
+    
+    # Catálogo: municípios de cada validador como posições em `grupos`
+    catalogo = associador.catalogo_validadores
+    posicao_grupo = {chave: i for i, chave in enumerate(grupos)}
+    publicacao.tabela('catalogo.codigo', [publicacao.texto(codigo) for codigo, _ in catalogo.validadores])
+    publicacao.tabela('catalogo.descricao', [publicacao.texto(descricao) for _, descricao in catalogo.validadores])
+    publicacao.tabela('catalogo.por_par', _ordem(list(catalogo.validadores)))
+    publicacao.grupos('catalogo.municipios', (
+        sorted(posicao_grupo[chave] for chave in chaves_validador)
+        for chaves_validador in catalogo.municipios_por_validador))
+    _publicar_trigramas(publicacao, 'catalogo.textos', catalogo.textos)
+    publicacao.grupos('catalogo.por_texto', (sorted(ids) for ids in catalogo.validadores_por_texto))
+    
+    # Totais pré-calculados (pequenos): desserializados só no primeiro acesso
+    publicacao.secoes['resumo'] = ('B', pickle.dumps(associador.resumo_validadores, pickle.HIGHEST_PROTOCOL))
+    publicacao.secoes['erros'] = ('B', pickle.dumps(
+        (associador.erros_carga, associador.total_erros_carga), pickle.HIGHEST_PROTOCOL))
+    publicacao.finalizar()
+    
+    secoes = {}
+    deslocamento = 0
+    for nome, (tipo, conteudo) in publicacao.secoes.items():
+        secoes[nome] = [deslocamento, len(conteudo), tipo]
+        deslocamento += -(-len(conteudo) // _ALINHAMENTO) * _ALINHAMENTO
+    cabecalho = json.dumps({
+        'fontes': [descrever_fonte(arquivo) for arquivo in arquivos_fonte],
+        'ordem_bytes': sys.byteorder,
+        'tipos': {tipo: array(tipo).itemsize for tipo in _TIPOS},
+        'secoes': secoes,
+        'sha256': {nome: hashlib.sha256(publicacao.secoes[nome][1]).hexdigest()
+                   for nome in _SECOES_VERIFICADAS},
+    }).encode('utf-8')
+    inicio = _PREFIXO.size + len(cabecalho)
+    preenchimento = -inicio % _ALINHAMENTO
+    
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(_PREFIXO.pack(MAGIC, DATASET_VERSAO, len(cabecalho) + preenchimento))
+            arquivo.write(cabecalho + b' ' * preenchimento)
+            for nome, (tipo, conteudo) in publicacao.secoes.items():
+                arquivo.write(conteudo)
+                arquivo.write(b'\0' * (-len(conteudo) % _ALINHAMENTO))
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.unlink(temporario)
+        raise
+    return destino
+
+
+class _Sequencia(Sequence):
+    """Sequência somente leitura cujos itens são decodificados a cada acesso"""
+    
+    def __init__(self, tamanho: int, item):
+        self._tamanho = tamanho
+        self._item = item
+    
+    def __len__(self):
+        return self._tamanho
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._item(i) for i in range(*indice.indices(self._tamanho))]
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("índice fora da tabela")
+        return self._item(indice)
+
+
+class _Itens(ItemsView):
+    """Itens de um _MapaOrdenado na ordem natural da tabela, sem busca por chave"""
+    
+    def __iter__(self):
+        mapa = self._mapping
+        for i in range(mapa.total):
+            yield mapa.chave(i), mapa.valor(i)
+
+
+class _MapaOrdenado(Mapping):
+    """Mapeamento somente leitura sobre uma tabela do dataset, localizado por busca binária
+    
+    Args:
+        total: Quantidade de itens (posições 0..total-1, na ordem natural)
+        ordem: Posições dos itens em ordem crescente de chave
+        comparavel: Forma comparável (_codificar) da chave do item de uma posição
+        chave: Chave do item de uma posição, como vista por quem consulta
+        valor: Valor do item de uma posição (ou das posições, se `multiplo`)
+        multiplo: Chaves repetidas; o valor recebe a lista de posições em ordem natural
+    """
+    
+    def __init__(self, total: int, ordem, comparavel, chave, valor, multiplo: bool = False):
+        self.total = total
+        self._ordem = ordem
+        self._comparavel = comparavel
+        self.chave = chave
+        self.valor = valor
+        self._multiplo = multiplo
+    
+    def _posicoes(self, chave) -> list:
+        alvo = _codificar(chave)
+        ordem = self._ordem
+        inicio, fim = 0, len(ordem)
+        try:
+            while inicio < fim:
+                meio = (inicio + fim) // 2
+                if self._comparavel(ordem[meio]) < alvo:
+                    inicio = meio + 1
+                else:
+                    fim = meio
+            posicoes = []
+            while inicio < len(ordem) and self._comparavel(ordem[inicio]) == alvo:
+                posicoes.append(ordem[inicio])
+                if not self._multiplo:
+                    break
+                inicio += 1
+        except TypeError:  # chave de outro tipo
+            return []
+        return posicoes
+    
+    def __getitem__(self, chave):
+        posicoes = self._posicoes(chave)
+        if not posicoes:
+            raise KeyError(chave)
+        return self.valor(posicoes) if self._multiplo else self.valor(posicoes[0])
+    
+    def __contains__(self, chave):
+        return bool(self._posicoes(chave))
+    
+    def __iter__(self):
+        if not self._multiplo:
+            for i in range(self.total):
+                yield self.chave(i)
+            return
+        anterior = None
+        for posicao in self._ordem:
+            chave = self.chave(posicao)
+            if chave != anterior:
+                yield chave
+                anterior = chave
+    
+    def __len__(self):
+        if not self._multiplo:
+            return self.total
+        return sum(1 for _ in self)
+    
+    def items(self):
+        return _Itens(self) if not self._multiplo else super().items()
+
+
+class _ResumoMapeado:
+    """ResumoValidadores desserializado no primeiro acesso"""
+    
+    def __init__(self, conteudo):
+        self._conteudo = conteudo
+        self._resumo = None
+    
+    def __getattr__(self, nome):
+        if self._resumo is None:
+            self._resumo = pickle.loads(self._conteudo)
+        return getattr(self._resumo, nome)
+
+
+class DatasetMapeado:
+    """Arquivo de dataset mapeado em memória, com acesso às tabelas sem cópia
+    
+    Raises:
+        DatasetInvalido: se o arquivo não existe, é de outra versão ou
+            plataforma, não corresponde às fontes atuais ou está truncado
+    """
+    
+    def __init__(self, caminho, arquivos_fonte):
+        self.caminho = Path(caminho)
+        if not self.caminho.exists():
+            raise DatasetInvalido("dataset inexistente")
+        
+        self._mapa = self._visao = None
+        self._secoes = {}
+        try:
+            self._abrir(arquivos_fonte)
+        except BaseException:
+            self.fechar()
+            raise
+    
+    def _abrir(self, arquivos_fonte):
+        try:
+            with open(self.caminho, 'rb') as arquivo:
+                self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mapa) < _PREFIXO.size:
+                raise DatasetInvalido("arquivo truncado")
+            magic, versao, tamanho_cabecalho = _PREFIXO.unpack_from(self._mapa, 0)
+            if magic != MAGIC or versao != DATASET_VERSAO:
+                raise DatasetInvalido("formato ou versão incompatível")
+            inicio = _PREFIXO.size + tamanho_cabecalho
+            cabecalho = json.loads(self._mapa[_PREFIXO.size:inicio].decode('utf-8'))
+        except DatasetInvalido:
+            raise
+        except (OSError, ValueError, struct.error) as e:
+            raise DatasetInvalido(str(e)) from e
+        
+        if cabecalho['ordem_bytes'] != sys.byteorder or \
+                cabecalho['tipos'] != {tipo: array(tipo).itemsize for tipo in _TIPOS}:
+            raise DatasetInvalido("gravado em outra plataforma")
+        fontes = cabecalho['fontes']
+        if [fonte['caminho'] for fonte in fontes] != [str(Path(a).resolve()) for a in arquivos_fonte]:
+            raise DatasetInvalido("fontes diferentes")
+        if not all(fonte_confere(fonte) for fonte in fontes):
+            raise DatasetInvalido("fontes alteradas desde a publicação")
+        
+        self._visao = memoryview(self._mapa)
+        for nome, (deslocamento, tamanho, tipo) in cabecalho['secoes'].items():
+            if inicio + deslocamento + tamanho > len(self._mapa):
+                raise DatasetInvalido("arquivo truncado")
+            self._secoes[nome] = self._visao[inicio + deslocamento:inicio + deslocamento + tamanho].cast(tipo)
+        
+        self._sha256 = cabecalho.get('sha256', {})
+        self._inicios_textos = self.tabela('textos.inicio')
+        self._dados_textos = self.tabela('textos.dados')
+    
+    def fechar(self):
+        """Libera as seções e desmapeia o arquivo (só antes de `aplicar`)"""
+        for secao in self._secoes.values():
+            secao.release()
+        self._secoes = {}
+        self._inicios_textos = self._dados_textos = None
+        if self._visao is not None:
+            self._visao.release()
+            self._visao = None
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+    
+    def conferir(self):
+        """Confere o SHA-256 das seções serializadas com pickle
+        
+        Raises:
+            DatasetInvalido: se alguma delas não corresponde ao cabeçalho
+        """
+        for nome in _SECOES_VERIFICADAS:
+            if nome not in self._secoes or \
+                    hashlib.sha256(self._secoes[nome]).hexdigest() != self._sha256.get(nome):
+                raise DatasetInvalido(f"seção corrompida: {nome}")
+    
+    def tabela(self, nome: str) -> memoryview:
+        """Tabela de uma seção (memoryview de inteiros sobre o mapeamento)"""
+        return self._secoes[nome]
+    
+    def texto(self, id_texto: int) -> str:
+        return str(self._dados_textos[self._inicios_textos[id_texto]:self._inicios_textos[id_texto + 1]], 'utf-8')
+    
+    def bytes_texto(self, id_texto: int) -> bytes:
+        return bytes(self._dados_textos[self._inicios_textos[id_texto]:self._inicios_textos[id_texto + 1]])
+    
+    def grupo(self, nome: str, posicao: int) -> memoryview:
+        """Valores do grupo `posicao` de uma tabela gravada com _Publicacao.grupos"""
+        inicios = self._secoes[f'{nome}.inicio']
+        return self._secoes[f'{nome}.valores'][inicios[posicao]:inicios[posicao + 1]]
+    
+    def indice_trigramas(self, prefixo: str) -> IndiceTrigramas:
+        """IndiceTrigramas com textos e postagens lidos do dataset"""
+        textos = self.tabela(f'{prefixo}.textos')
+        gramas = self.tabela(f'{prefixo}.gramas')
+        postagens = _MapaOrdenado(
+            len(gramas), range(len(gramas)),
+            comparavel=lambda i: self.bytes_texto(gramas[i]),
+            chave=lambda i: self.texto(gramas[i]),
+            valor=lambda i: set(self.grupo(f'{prefixo}.postagens', i)),
+        )
+        return IndiceTrigramas.de_tabelas(
+            _Sequencia(len(textos), lambda i: self.texto(textos[i])),
+            postagens,
+            self.tabela(f'{prefixo}.total'),
+        )
+    
+    def aplicar(self, associador):
+        """Substitui os dados e índices do associador por visões sobre o dataset
+        
+        Raises:
+            DatasetInvalido: se as seções serializadas estão corrompidas (antes
+                de alterar o associador)
+        """
+        self.conferir()
+        try:
+            erros_carga, total_erros_carga = pickle.loads(self.tabela('erros'))
+        except Exception as e:
+            raise DatasetInvalido(f"seção ilegível: erros ({e})") from e
+        
+        estados = self.tabela('municipios.estado')
+        codigos = self.tabela('municipios.codigo')
+        nomes = self.tabela('municipios.nome')
+        normalizados = self.tabela('municipios.normalizado')
+        por_chave = self.tabela('municipios.por_chave')
+        
+        def chave_municipio(i):
+            return (self.texto(estados[i]), codigos[i])
+        
+        def comparavel_municipio(i):
+            return (self.bytes_texto(estados[i]), codigos[i])
+        
+        def municipio(i):
+            return Municipio(self.texto(estados[i]), codigos[i], self.texto(nomes[i]))
+        
+        campos = [self.tabela(f'registros.{campo}') for campo in RegistroValidador.CAMPOS]
+        
+        def registro(posicao):
+            return RegistroValidador(*(self.texto(tabela[posicao]) for tabela in campos))
+        
+        estados_grupos = self.tabela('grupos.estado')
+        codigos_grupos = self.tabela('grupos.codigo')
+        inicios_grupos = self.tabela('grupos.inicio')
+        por_chave_grupo = self.tabela('grupos.por_chave')
+        
+        def chave_grupo(i):
+            return (self.texto(estados_grupos[i]), codigos_grupos[i])
+        
+        def comparavel_grupo(i):
+            return (self.bytes_texto(estados_grupos[i]), codigos_grupos[i])
+        
+        total = len(codigos)
+        total_grupos = len(codigos_grupos)
+        associador.municipios = _MapaOrdenado(total, por_chave, comparavel_municipio, chave_municipio, municipio)
+        associador.validadores = _MapaOrdenado(
+            total_grupos, por_chave_grupo, comparavel_grupo, chave_grupo,
+            lambda i: [registro(p) for p in range(inicios_grupos[i], inicios_grupos[i + 1])])
+        associador.resultados = VisaoResultados(associador.municipios, associador.validadores)
+        associador.indice_nomes = _MapaOrdenado(
+            total, self.tabela('municipios.por_nome'),
+            comparavel=lambda i: self.bytes_texto(normalizados[i]),
+            chave=lambda i: self.texto(normalizados[i]),
+            valor=lambda posicoes: [chave_municipio(i) for i in posicoes],
+            multiplo=True,
+        )
+        associador.nomes_normalizados = _Sequencia(
+            total, lambda i: (self.texto(normalizados[i]), chave_municipio(i)))
+        associador.indice_trigramas = self.indice_trigramas('nomes')
+        associador.validadores_por_municipio = _MapaOrdenado(
+            total, por_chave, comparavel_municipio, chave_municipio,
+            lambda i: [registro(p) for p in self.grupo('por_municipio', i)])
+        associador.candidatos_atual = _MapaOrdenado(
+            total_grupos, por_chave_grupo, comparavel_grupo, chave_grupo,
+            lambda i: tuple(registro(p) for p in self.grupo('candidatos', i)))
+        associador.vencimentos = self.tabela('vencimentos')
+        
+        codigos_catalogo = self.tabela('catalogo.codigo')
+        descricoes_catalogo = self.tabela('catalogo.descricao')
+        textos_catalogo = self.tabela('catalogo.textos.textos')
+        associador.catalogo_validadores = CatalogoValidadores.de_tabelas(
+            validadores=_Sequencia(len(codigos_catalogo), lambda i: (
+                self.texto(codigos_catalogo[i]), self.texto(descricoes_catalogo[i]))),
+            ids_validadores=_MapaOrdenado(
+                len(codigos_catalogo), self.tabela('catalogo.por_par'),
+                comparavel=lambda i: (self.bytes_texto(codigos_catalogo[i]), self.bytes_texto(descricoes_catalogo[i])),
+                chave=lambda i: (self.texto(codigos_catalogo[i]), self.texto(descricoes_catalogo[i])),
+                valor=lambda i: i),
+            municipios_por_validador=_Sequencia(len(codigos_catalogo), lambda i: {
+                chave_grupo(g) for g in self.grupo('catalogo.municipios', i)}),
+            textos=self.indice_trigramas('catalogo.textos'),
+            ids_textos=_MapaOrdenado(
+                len(textos_catalogo), self.tabela('catalogo.textos.ordem'),
+                comparavel=lambda i: self.bytes_texto(textos_catalogo[i]),
+                chave=lambda i: self.texto(textos_catalogo[i]),
+                valor=lambda i: i),
+            validadores_por_texto=_Sequencia(len(textos_catalogo), lambda i: set(self.grupo('catalogo.por_texto', i))),
+        )
+        
+        associador.resumo_validadores = _ResumoMapeado(self.tabela('resumo'))
+        associador.erros_carga, associador.total_erros_carga = erros_carga, total_erros_carga
+
+
+def anexar_dataset(associador, diretorio_cache) -> Path:
+    """Anexa ao associador o dataset publicado para as suas fontes (sem cópia dos dados)
+    
+    Raises:
+        DatasetInvalido: se não há um dataset válido para as fontes atuais
+    """
+    arquivos_fonte = [associador.arquivo_municipios, associador.arquivo_validadores]
+    dataset = DatasetMapeado(caminho_dataset(diretorio_cache, arquivos_fonte), arquivos_fonte)
+    try:
+        dataset.aplicar(associador)
+    except DatasetInvalido:
+        dataset.fechar()
+        raise
+    return dataset.caminho
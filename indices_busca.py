@@ -0,0 +1,249 @@
+"""
+Índices de busca em memória usados pelo associador de municípios e validadores
+"""
+
+from collections import defaultdict
+
+
+def trigramas(texto: str) -> set:
+    """Retorna o conjunto de trigramas (substrings de 3 caracteres) de um texto"""
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    """Índice invertido de trigramas para busca por substring e por similaridade
+    
+    Cada texto adicionado recebe um id sequencial (a posição de inserção). As
+    listas de postagens guardam, para cada trigrama, os ids dos textos que o
+    contêm; a busca por substring intersecta as postagens dos trigramas do
+    texto buscado e só confirma os candidatos restantes.
+    """
+    
+    def __init__(self):
+        self.textos = []
+        self.postagens = defaultdict(set)  # trigrama -> {ids}
+        self.total_trigramas = []  # id -> quantidade de trigramas distintos
+    
+    @classmethod
+    def de_tabelas(cls, textos, postagens, total_trigramas):
+        """Índice somente leitura sobre tabelas já montadas (ex.: um dataset mapeado)
+        
+        `postagens` deve devolver um set de ids por trigrama.
+        """
+        indice = cls.__new__(cls)
+        indice.textos = textos
+        indice.postagens = postagens
+        indice.total_trigramas = total_trigramas
+        return indice
+    
+    def __len__(self):
+        return len(self.textos)
+    
+    def adicionar(self, texto: str) -> int:
+        """Adiciona um texto (já normalizado) ao índice e retorna seu id"""
+        id_texto = len(self.textos)
+        grams = trigramas(texto)
+        for gram in grams:
+            self.postagens[gram].add(id_texto)
+        self.textos.append(texto)
+        self.total_trigramas.append(len(grams))
+        return id_texto
+    
+    def candidatos(self, texto: str):
+        """Ids que contêm todos os trigramas do texto, ou None se o texto for curto demais"""
+        grams = trigramas(texto)
+        if not grams:
+            return None
+        
+        postagens = sorted((self.postagens.get(gram, set()) for gram in grams), key=len)
+        resultado = set(postagens[0])
+        for postagem in postagens[1:]:
+            if not resultado:
+                break
+            resultado &= postagem
+        return resultado
+    
+    def buscar_substring(self, texto: str) -> list:
+        """Ids (em ordem de inserção) dos textos que contêm `texto`"""
+        candidatos = self.candidatos(texto)
+        if candidatos is None:
+            candidatos = range(len(self.textos))
+        return sorted(i for i in candidatos if texto in self.textos[i])
+    
+    def similares(self, texto: str, limite: int = 20, similaridade_minima: float = 0.3) -> list:
+        """Textos mais parecidos com `texto`, ordenados por sobreposição de trigramas
+        
+        A pontuação é o coeficiente de Dice entre os trigramas. Textos que contêm
+        alguma palavra (3+ letras) do texto buscado sempre entram como candidatos;
+        os demais só se atingirem `similaridade_minima` (tolerância a erros de digitação).
+        
+        Returns:
+            Lista de (id, pontuação), da maior para a menor pontuação
+        """
+        grams = trigramas(texto)
+        
+        contagem = defaultdict(int)
+        for gram in grams:
+            for id_texto in self.postagens.get(gram, ()):
+                contagem[id_texto] += 1
+        
+        com_palavra = set()
+        for palavra in texto.split():
+            if len(palavra) >= 3:
+                com_palavra.update(self.buscar_substring(palavra))
+        
+        pontuados = []
+        for id_texto in com_palavra.union(contagem):
+            pontuacao = 2 * contagem.get(id_texto, 0) / ((len(grams) + self.total_trigramas[id_texto]) or 1)
+            if pontuacao >= similaridade_minima or id_texto in com_palavra:
+                pontuados.append((id_texto, pontuacao))
+        
+        pontuados.sort(key=lambda item: (-item[1], self.textos[item[0]], item[0]))
+        return pontuados[:limite]
+
+
+class CatalogoValidadores:
+    """Catálogo dos validadores distintos, com índice de substring e mapa reverso
+    
+    Um validador é identificado pelo par (cod_validador, desc_validador), já que
+    o mesmo código aparece com descrições diferentes no TFIX105. Códigos e
+    descrições são dobrados para maiúsculas uma única vez e indexados por
+    trigramas; cada texto aponta para os validadores que o usam e cada
+    validador aponta para os municípios (cod_estado, cod_municipio) que o usam.
+    """
+    
+    def __init__(self):
+        self.validadores = []  # id -> (cod_validador, desc_validador)
+        self.ids_validadores = {}  # (cod_validador, desc_validador) -> id
+        self.municipios_por_validador = []  # id -> {(cod_estado, cod_municipio)}
+        self.textos = IndiceTrigramas()  # códigos e descrições distintos, em maiúsculas
+        self.ids_textos = {}  # texto -> id no índice de textos
+        self.validadores_por_texto = []  # id do texto -> {ids de validadores}
+    
+    @classmethod
+    def de_tabelas(cls, validadores, ids_validadores, municipios_por_validador,
+                   textos, ids_textos, validadores_por_texto):
+        """Catálogo somente leitura sobre tabelas já montadas (ex.: um dataset mapeado)"""
+        catalogo = cls.__new__(cls)
+        catalogo.validadores = validadores
+        catalogo.ids_validadores = ids_validadores
+        catalogo.municipios_por_validador = municipios_por_validador
+        catalogo.textos = textos
+        catalogo.ids_textos = ids_textos
+        catalogo.validadores_por_texto = validadores_por_texto
+        return catalogo
+    
+    def __len__(self):
+        return len(self.validadores)
+    
+    def adicionar(self, cod_validador: str, desc_validador: str, chave_municipio) -> int:
+        """Registra o uso de um validador por um município e retorna o id do validador"""
+        par = (cod_validador, desc_validador)
+        id_validador = self.ids_validadores.get(par)
+        if id_validador is None:
+            id_validador = len(self.validadores)
+            self.ids_validadores[par] = id_validador
+            self.validadores.append(par)
+            self.municipios_por_validador.append(set())
+            for texto in {cod_validador.upper(), desc_validador.upper()}:
+                id_texto = self.ids_textos.get(texto)
+                if id_texto is None:
+                    id_texto = self.textos.adicionar(texto)
+                    self.ids_textos[texto] = id_texto
+                    self.validadores_por_texto.append(set())
+                self.validadores_por_texto[id_texto].add(id_validador)
+        self.municipios_por_validador[id_validador].add(chave_municipio)
+        return id_validador
+    
+    def correspondentes(self, nome_validador: str) -> set:
+        """Ids dos validadores cujo código ou descrição contém o nome informado"""
+        ids = set()
+        for id_texto in self.textos.buscar_substring(nome_validador.upper()):
+            ids |= self.validadores_por_texto[id_texto]
+        return ids
+    
+    def id_validador(self, registro) -> int:
+        """Id do validador de um registro com 'cod_validador' e 'desc_validador' (ou None)"""
+        return self.ids_validadores.get((registro['cod_validador'], registro['desc_validador']))
+    
+    def municipios(self, ids_validadores) -> set:
+        """Municípios que usam (ou já usaram) algum dos validadores informados"""
+        chaves = set()
+        for id_validador in ids_validadores:
+            chaves |= self.municipios_por_validador[id_validador]
+        return chaves
+
+
+class ResumoValidadores:
+    """Totais pré-calculados dos validadores, no geral e por UF
+    
+    Montado uma única vez por versão dos dados. Para cada filtro (None = todas
+    as UFs) guarda as linhas da listagem já ordenadas por quantidade de
+    registros, e para cada UF a participação de cada validador entre os
+    municípios do TACES06.
+    """
+    
+    def __init__(self, validadores: dict, municipios: dict):
+        # filtro -> {cod_validador: [descricao, estados, registros]}, na ordem em que
+        # cada validador aparece (o desempate da ordenação)
+        totais = {None: {}}
+        # UF -> {cod_validador: [descricao, {chaves de municípios}]}
+        usos_por_estado = defaultdict(dict)
+        
+        for chave, registros in validadores.items():
+            estado = chave[0]
+            por_estado = totais.setdefault(estado, {})
+            for registro in registros:
+                codigo = registro['cod_validador']
+                for agregado in (totais[None], por_estado):
+                    total = agregado.get(codigo)
+                    if total is None:
+                        total = agregado[codigo] = [registro['desc_validador'], set(), 0]
+                    total[1].add(estado)
+                    total[2] += 1
+                if chave in municipios:
+                    uso = usos_por_estado[estado].get(codigo)
+                    if uso is None:
+                        uso = usos_por_estado[estado][codigo] = [registro['desc_validador'], set()]
+                    uso[1].add(chave)
+        
+        self.linhas = {
+            filtro: sorted(
+                ((codigo, descricao, tuple(sorted(estados)), quantidade)
+                 for codigo, (descricao, estados, quantidade) in agregado.items()),
+                key=lambda linha: linha[3], reverse=True
+            )
+            for filtro, agregado in totais.items()
+        }
+        
+        municipios_por_estado = defaultdict(int)
+        for estado, _ in municipios:
+            municipios_por_estado[estado] += 1
+        
+        self.participacao = {}
+        for estado, total_municipios in sorted(municipios_por_estado.items()):
+            usos = usos_por_estado.get(estado, {})
+            com_validador = len(set().union(*(chaves for _, chaves in usos.values())))
+            self.participacao[estado] = {
+                'estado': estado,
+                'municipios': total_municipios,
+                'municipios_com_validador': com_validador,
+                'validadores': sorted((
+                    {
+                        'codigo': codigo,
+                        'descricao': descricao,
+                        'municipios': len(chaves),
+                        'participacao': round(len(chaves) / total_municipios, 4),
+                        'participacao_com_validador': round(len(chaves) / com_validador, 4),
+                    }
+                    for codigo, (descricao, chaves) in usos.items()
+                ), key=lambda uso: uso['municipios'], reverse=True),
+            }
+    
+    def listagem(self, estado: str = None) -> list:
+        """Linhas (codigo, descricao, estados, registros) ordenadas, de todas as UFs ou de uma"""
+        return self.linhas.get(estado, [])
+    
+    def participacao_estado(self, estado: str):
+        """Participação dos validadores entre os municípios de uma UF (ou None)"""
+        return self.participacao.get(estado)
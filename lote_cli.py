@@ -0,0 +1,307 @@
+"""
+Modo lote da CLI: classifica pares município/validador lidos de CSV ou JSONL
+
+Lê as linhas de um arquivo (ou da entrada padrão), carrega os dados uma única
+vez e grava um resultado por linha de entrada, na mesma ordem, em JSONL ou
+CSV. As linhas passam em blocos por um pipeline com janela limitada: a memória
+não cresce com o tamanho da entrada.
+
+Entrada:
+    - CSV com cabeçalho (colunas nome_municipio/municipio e
+      nome_validador/validador, delimitador , ; tab ou | detectado) ou sem
+      cabeçalho (município na 1ª coluna e validador na 2ª)
+    - JSONL com objetos {"nome_municipio": ..., "nome_validador": ...}
+      (ou as chaves municipio/validador)
+    O validador é opcional: sem ele, a linha traz só a busca do município.
+
+Com --trabalhadores N > 1, os blocos são distribuídos entre N processos. No
+Linux (fork) os processos herdam os dados já carregados; nas demais
+plataformas cada um carrega os dados ao iniciar.
+
+Uso:
+    python buscar_municipio_validador.py --lote ENTRADA [opções]
+    python lote_cli.py ENTRADA [--saida ARQ] [--formato-saida jsonl|csv]
+                       [--trabalhadores N] [--bloco 256]
+    (ENTRADA "-" lê da entrada padrão)
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import buscar_municipio_validador as cli
+import consultas_municipios as consultas
+from associar_municipios_validadores import remover_acentos
+
+FORMATO_CSV = 'csv'
+FORMATO_JSONL = 'jsonl'
+FORMATOS = (FORMATO_CSV, FORMATO_JSONL)
+
+# Campos de cada resultado (colunas da saída CSV)
+CAMPOS = (
+    'linha', 'nome_municipio', 'nome_validador', 'encontrado', 'exata', 'municipio', 'estado',
+    'codigo', 'municipios', 'validadores_ativos', 'tipo', 'usado_pelo_municipio',
+    'validador_atual', 'sugestoes', 'erro',
+)
+
+# Nomes aceitos para as colunas do CSV e chaves do JSONL
+COLUNAS_MUNICIPIO = ('nome_municipio', 'municipio', 'cidade')
+COLUNAS_VALIDADOR = ('nome_validador', 'validador')
+
+TAMANHO_BLOCO = 256
+# Blocos em andamento por trabalhador (limita a memória do pipeline)
+BLOCOS_POR_TRABALHADOR = 4
+
+# Dados usados no processamento dos blocos (herdados pelos processos no fork)
+_associador = None
+_dia = None
+
+
+def _normalizar(nome: str) -> str:
+    return remover_acentos(nome).strip().lower().replace(' ', '_')
+
+
+def _colunas(cabecalho: list):
+    """Índices (município, validador) pelo cabeçalho, ou None se não é um cabeçalho"""
+    nomes = [_normalizar(nome) for nome in cabecalho]
+    municipio = next((nomes.index(c) for c in COLUNAS_MUNICIPIO if c in nomes), None)
+    if municipio is None:
+        return None
+    validador = next((nomes.index(c) for c in COLUNAS_VALIDADOR if c in nomes), None)
+    return municipio, validador
+
+
+def _ler_csv(arquivo, primeira: str):
+    try:
+        dialeto = csv.Sniffer().sniff(primeira, delimiters=',;\t|')
+    except csv.Error:
+        dialeto = csv.excel
+    leitor = csv.reader(itertools.chain([primeira], arquivo), dialeto)
+    cabecalho = next(leitor, None)
+    if cabecalho is None:
+        return
+    colunas = _colunas(cabecalho)
+    linhas = leitor
+    if colunas is None:
+        colunas = (0, 1)
+        linhas = itertools.chain([cabecalho], leitor)
+    
+    indice_municipio, indice_validador = colunas
+    for campos in linhas:
+        if not any(campo.strip() for campo in campos):
+            continue
+        entrada = {
+            'linha': leitor.line_num,
+            'nome_municipio': campos[indice_municipio] if indice_municipio < len(campos) else '',
+            'nome_validador': None,
+        }
+        if indice_validador is not None and indice_validador < len(campos):
+            entrada['nome_validador'] = campos[indice_validador]
+        yield entrada
+
+
+def _valor(objeto: dict, chaves):
+    return next((objeto[chave] for chave in chaves if chave in objeto), None)
+
+
+def _ler_jsonl(arquivo, primeira: str):
+    for numero, linha in enumerate(itertools.chain([primeira], arquivo), 1):
+        if not linha.strip():
+            continue
+        entrada = {'linha': numero, 'nome_municipio': None, 'nome_validador': None}
+        try:
+            objeto = json.loads(linha)
+        except ValueError as e:
+            entrada['erro'] = f"JSON inválido: {e}"
+        else:
+            if isinstance(objeto, dict):
+                entrada['nome_municipio'] = _valor(objeto, COLUNAS_MUNICIPIO)
+                entrada['nome_validador'] = _valor(objeto, COLUNAS_VALIDADOR)
+            else:
+                entrada['erro'] = "Linha inválida: use {nome_municipio, nome_validador}"
+        yield entrada
+
+
+def ler_entradas(arquivo, formato: str = None):
+    """Linhas da entrada como dicts (linha, nome_municipio, nome_validador[, erro])
+    
+    Sem `formato`, uma primeira linha começando com "{" indica JSONL.
+    """
+    primeira = arquivo.readline()
+    while primeira and not primeira.strip():
+        primeira = arquivo.readline()
+    if not primeira:
+        return iter(())
+    if formato is None:
+        formato = FORMATO_JSONL if primeira.lstrip().startswith('{') else FORMATO_CSV
+    if formato == FORMATO_JSONL:
+        return _ler_jsonl(arquivo, primeira)
+    return _ler_csv(arquivo, primeira)
+
+
+def processar(associador, entrada: dict, dia: int, buscas: dict) -> dict:
+    """Resultado de uma linha: busca do município e, se informado, classificação do validador
+    
+    `buscas` guarda as buscas já feitas (por nome) para as linhas seguintes do bloco.
+    """
+    resultado = dict.fromkeys(CAMPOS)
+    resultado.update(linha=entrada['linha'], nome_municipio=entrada['nome_municipio'],
+                     nome_validador=entrada['nome_validador'])
+    try:
+        if entrada.get('erro'):
+            raise ValueError(entrada['erro'])
+        nome_municipio, nome_validador = entrada['nome_municipio'], entrada['nome_validador']
+        if not isinstance(nome_municipio, str) or not nome_municipio.strip():
+            raise ValueError("Nome do município é obrigatório")
+        if nome_validador is not None and not isinstance(nome_validador, str):
+            raise ValueError("Nome do validador deve ser texto")
+        nome_municipio = nome_municipio.strip()
+        nome_validador = nome_validador.strip() if nome_validador else None
+        
+        busca = buscas.get(nome_municipio)
+        if busca is None:
+            busca = buscas[nome_municipio] = consultas.buscar_municipio(associador, nome_municipio, dia)
+        resultado['encontrado'] = busca.encontrado
+        resultado['exata'] = busca.exata
+        if not busca.encontrado:
+            resultado['sugestoes'] = [f"{s.nome} ({s.estado})" for s in busca.sugestoes]
+            return resultado
+        
+        primeiro = busca.municipios[0]
+        resultado.update(municipio=primeiro.nome, estado=primeiro.estado, codigo=primeiro.codigo,
+                         municipios=len(busca.municipios))
+        resultado['validadores_ativos'] = sorted({
+            validador.codigo for municipio in busca.municipios
+            for validador in municipio.validadores if validador.situacao == "ATIVO"
+        })
+        if nome_validador:
+            classificacao = consultas.classificar_validador(associador, nome_municipio, nome_validador,
+                                                            busca, dia)
+            resultado['tipo'] = classificacao.tipo
+            resultado['usado_pelo_municipio'] = classificacao.usado_pelo_municipio
+            if classificacao.validador_atual:
+                resultado['validador_atual'] = classificacao.validador_atual.codigo
+    except Exception as e:
+        resultado['erro'] = str(e)
+    return resultado
+
+
+def _processar_bloco(bloco: list) -> list:
+    buscas = {}
+    return [processar(_associador, entrada, _dia, buscas) for entrada in bloco]
+
+
+def _iniciar_trabalhador(dia: int):
+    """Inicializador dos processos: carrega os dados se não foram herdados"""
+    global _associador, _dia
+    _dia = dia
+    if _associador is None:
+        _associador = cli.carregar_associador(ao_progresso=lambda mensagem: None)
+
+
+def _em_blocos(entradas, tamanho: int):
+    while True:
+        bloco = list(itertools.islice(entradas, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def executar(associador, entradas, trabalhadores: int = 1, tamanho_bloco: int = TAMANHO_BLOCO, dia: int = None):
+    """Resultados das entradas, na ordem da entrada, processados em blocos
+    
+    Com mais de um trabalhador, no máximo BLOCOS_POR_TRABALHADOR blocos por
+    processo ficam em andamento; os resultados saem assim que o bloco mais
+    antigo termina.
+    """
+    global _associador, _dia
+    _associador, _dia = associador, dia or consultas.hoje()
+    blocos = _em_blocos(iter(entradas), tamanho_bloco)
+    if trabalhadores <= 1:
+        for bloco in blocos:
+            yield from _processar_bloco(bloco)
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    contexto = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(trabalhadores, mp_context=contexto, initializer=_iniciar_trabalhador,
+                             initargs=(_dia,)) as pool:
+        pendentes = deque()
+        for bloco in blocos:
+            pendentes.append(pool.submit(_processar_bloco, bloco))
+            if len(pendentes) >= trabalhadores * BLOCOS_POR_TRABALHADOR:
+                yield from pendentes.popleft().result()
+        while pendentes:
+            yield from pendentes.popleft().result()
+
+
+def _celula(valor):
+    if isinstance(valor, list):
+        return "; ".join(str(item) for item in valor)
+    return valor
+
+
+def escritor(saida, formato: str):
+    """Função que grava um resultado na saída (JSONL ou CSV com cabeçalho)"""
+    if formato == FORMATO_CSV:
+        gravador = csv.DictWriter(saida, CAMPOS, lineterminator='\n')
+        gravador.writeheader()
+        return lambda resultado: gravador.writerow({campo: _celula(valor) for campo, valor in resultado.items()})
+    return lambda resultado: saida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        prog="buscar_municipio_validador.py --lote",
+        description="Classifica pares município/validador lidos de CSV ou JSONL (um resultado por linha)")
+    parser.add_argument("entrada", help='arquivo CSV/JSONL ("-" para a entrada padrão)')
+    parser.add_argument("--saida", help="arquivo de resultados (padrão: a saída padrão)")
+    parser.add_argument("--formato-entrada", choices=FORMATOS, help="padrão: detectado pela primeira linha")
+    parser.add_argument("--formato-saida", choices=FORMATOS,
+                        help="padrão: csv se --saida termina em .csv, senão jsonl")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="processos de trabalho (0 = um por CPU; padrão: 1, sem processos)")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco")
+    parser.add_argument("--codificacao", default="utf-8-sig", help="codificação da entrada (padrão: utf-8-sig)")
+    opcoes = parser.parse_args(argumentos)
+    
+    formato_saida = opcoes.formato_saida or (
+        FORMATO_CSV if (opcoes.saida or '').lower().endswith('.csv') else FORMATO_JSONL)
+    trabalhadores = opcoes.trabalhadores or os.cpu_count() or 1
+    
+    # As mensagens da carga vão para stderr: a saída padrão pode ser o resultado
+    associador = cli.carregar_associador(ao_progresso=lambda mensagem: print(mensagem, file=sys.stderr))
+    
+    inicio = time.perf_counter()
+    total = erros = 0
+    if opcoes.entrada == '-':
+        sys.stdin.reconfigure(encoding=opcoes.codificacao, newline='')
+        entrada = sys.stdin
+    else:
+        entrada = open(opcoes.entrada, encoding=opcoes.codificacao, newline='')
+    saida = open(opcoes.saida, 'w', encoding='utf-8', newline='') if opcoes.saida else sys.stdout
+    try:
+        gravar = escritor(saida, formato_saida)
+        for resultado in executar(associador, ler_entradas(entrada, opcoes.formato_entrada),
+                                  trabalhadores, max(opcoes.bloco, 1)):
+            gravar(resultado)
+            total += 1
+            erros += resultado['erro'] is not None
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+    
+    duracao = time.perf_counter() - inicio
+    print(f"Linhas processadas: {total} ({erros} com erro) em {duracao:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
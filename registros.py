@@ -0,0 +1,203 @@
+"""
+Armazenamento compacto dos registros de municípios e validadores
+
+Os registros usam `__slots__` (sem dicionário por instância) e os textos
+repetidos (UF, códigos e descrições de validadores, datas, status) são
+internados, de modo que cada valor distinto existe uma única vez em memória.
+Para manter compatibilidade com o código que trata registros como dicts,
+os campos também podem ser lidos por nome: `registro['descricao']`,
+`registro.get('data_inicial', '')` e `dict(registro)`.
+
+As datas de validade dos validadores (DD/MM/AAAA) também são guardadas como
+ordinais (`date.toordinal()`), calculados uma única vez na carga, para que a
+situação ATIVO/EXPIRADO seja uma comparação de inteiros.
+
+`resultados` deixa de ser uma cópia materializada: VisaoResultados monta os
+registros associados (município + validador) sob demanda, a partir dos
+próprios registros carregados.
+"""
+
+import sys
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import date
+
+
+def internar(texto: str) -> str:
+    """Interna um texto para que valores repetidos compartilhem o mesmo objeto"""
+    return sys.intern(texto)
+
+
+def ordinal_data(data: str) -> int:
+    """Ordinal de uma data DD/MM/AAAA, ou 0 se a data for vazia ou inválida"""
+    try:
+        dia, mes, ano = data.split('/')
+        return date(int(ano), int(mes), int(dia)).toordinal()
+    except ValueError:
+        return 0
+
+
+class RegistroCompacto:
+    """Base dos registros com `__slots__` e leitura de campos por nome"""
+    
+    __slots__ = ()
+    CAMPOS = ()
+    
+    def __getitem__(self, campo):
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+    
+    def get(self, campo, padrao=None):
+        """Valor do campo, ou `padrao` se o campo não existe"""
+        if campo not in self.CAMPOS:
+            return padrao
+        return getattr(self, campo)
+    
+    def keys(self):
+        """Nomes dos campos (permite `dict(registro)` e `{**registro}`)"""
+        return self.CAMPOS
+    
+    def __contains__(self, campo):
+        return campo in self.CAMPOS
+    
+    def __eq__(self, outro):
+        if type(outro) is not type(self):
+            return NotImplemented
+        return all(self[campo] == outro[campo] for campo in self.CAMPOS)
+    
+    def __hash__(self):
+        return hash(tuple(self[campo] for campo in self.CAMPOS))
+    
+    def __repr__(self):
+        campos = ', '.join(f"{campo}={self[campo]!r}" for campo in self.CAMPOS)
+        return f"{type(self).__name__}({campos})"
+
+
+class Municipio(RegistroCompacto):
+    """Município do TACES06"""
+    
+    __slots__ = ('cod_estado', 'cod_municipio', 'descricao')
+    CAMPOS = __slots__
+    
+    def __init__(self, cod_estado: str, cod_municipio: int, descricao: str):
+        self.cod_estado = internar(cod_estado)
+        self.cod_municipio = cod_municipio
+        self.descricao = descricao
+    
+    def __reduce__(self):
+        return (Municipio, (self.cod_estado, self.cod_municipio, self.descricao))
+
+
+class RegistroValidador(RegistroCompacto):
+    """Registro de validador de um município no TFIX105"""
+    
+    CAMPOS = ('cod_validador', 'desc_validador', 'data_inicial', 'valid_validador', 'valid_final')
+    __slots__ = CAMPOS + ('ordinal_inicial', 'ordinal_validade')
+    
+    def __init__(self, cod_validador: str, desc_validador: str, data_inicial: str,
+                 valid_validador: str, valid_final: str):
+        self.cod_validador = internar(cod_validador)
+        self.desc_validador = internar(desc_validador)
+        self.data_inicial = internar(data_inicial)
+        self.valid_validador = internar(valid_validador)
+        self.valid_final = internar(valid_final)
+        # Datas já convertidas (0 = sem data): o validador está expirado a
+        # partir do dia ordinal_validade
+        self.ordinal_inicial = ordinal_data(data_inicial) if data_inicial else 0
+        self.ordinal_validade = ordinal_data(valid_validador) if valid_validador else 0
+    
+    def ativo(self, hoje: int) -> bool:
+        """Se o validador não tem data de término ou ela ainda não chegou (hoje é um ordinal)"""
+        return not self.ordinal_validade or self.ordinal_validade > hoje
+    
+    def __reduce__(self):
+        return (RegistroValidador, (self.cod_validador, self.desc_validador, self.data_inicial,
+                                    self.valid_validador, self.valid_final))
+
+
+# Validador usado na associação de municípios sem nenhum validador cadastrado
+SEM_VALIDADOR = RegistroValidador('', 'SEM VALIDADOR', '', '', 'N')
+
+
+class RegistroAssociado(RegistroCompacto):
+    """Junção de um município com um de seus validadores (sem copiar os campos)"""
+    
+    __slots__ = ('municipio', 'validador')
+    CAMPOS = Municipio.CAMPOS + RegistroValidador.CAMPOS
+    
+    def __init__(self, municipio: Municipio, validador: RegistroValidador):
+        self.municipio = municipio
+        self.validador = validador
+    
+    def __getitem__(self, campo):
+        if campo in Municipio.CAMPOS:
+            return getattr(self.municipio, campo)
+        if campo in RegistroValidador.CAMPOS:
+            return getattr(self.validador, campo)
+        raise KeyError(campo)
+    
+    def get(self, campo, padrao=None):
+        try:
+            return self[campo]
+        except KeyError:
+            return padrao
+    
+    def __reduce__(self):
+        return (RegistroAssociado, (self.municipio, self.validador))
+
+
+class VisaoResultados(Sequence):
+    """Visão dos municípios associados aos seus validadores, na ordem do TACES06
+    
+    Equivale à antiga lista `resultados` (um registro por par município x
+    validador, ou um registro SEM VALIDADOR), mas cada RegistroAssociado é
+    criado apenas quando acessado.
+    """
+    
+    def __init__(self, municipios: dict, validadores: dict):
+        self.municipios = municipios
+        self.validadores = validadores
+        self._chaves = None
+        self._inicios = None  # posição do primeiro registro de cada município
+    
+    def _validadores_de(self, chave):
+        return self.validadores.get(chave) or (SEM_VALIDADOR,)
+    
+    def __iter__(self):
+        for chave, municipio in self.municipios.items():
+            for validador in self._validadores_de(chave):
+                yield RegistroAssociado(municipio, validador)
+    
+    def _posicoes(self):
+        """Posições iniciais por município, calculadas no primeiro acesso por índice"""
+        if self._inicios is None:
+            self._chaves = list(self.municipios)
+            inicios = []
+            total = 0
+            for chave in self._chaves:
+                inicios.append(total)
+                total += len(self._validadores_de(chave))
+            inicios.append(total)
+            self._inicios = inicios
+        return self._inicios
+    
+    def __len__(self):
+        return self._posicoes()[-1]
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        
+        inicios = self._posicoes()
+        if indice < 0:
+            indice += inicios[-1]
+        if not 0 <= indice < inicios[-1]:
+            raise IndexError("índice fora dos resultados")
+        
+        posicao = bisect_right(inicios, indice) - 1
+        chave = self._chaves[posicao]
+        return RegistroAssociado(self.municipios[chave], self._validadores_de(chave)[indice - inicios[posicao]])
+    
+    def __reduce__(self):
+        return (VisaoResultados, (self.municipios, self.validadores))
@@ -0,0 +1,178 @@
+"""
+Snapshot binário dos dados do associador de municípios e validadores
+
+Guarda em um diretório de cache os registros já lidos e associados e os
+índices de busca, para que novos processos não precisem decodificar e
+associar de novo os arquivos TACES06/TFIX105.
+
+Formato do arquivo (versionado):
+    MAGIC (8 bytes) | versão (uint32) | tamanho do cabeçalho (uint32) |
+    cabeçalho JSON (fontes + sha256 do conteúdo) | conteúdo pickle
+
+O snapshot é associado às fontes pelo tamanho, mtime e hash do conteúdo de
+cada arquivo. Se algo não confere ou o arquivo está corrompido, o chamador
+volta para a leitura dos arquivos texto. O conteúdo é um pickle: use apenas
+diretórios de cache confiáveis.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+
+MAGIC = b"AMVSNAP\0"
+SNAPSHOT_VERSAO = 5
+_PREFIXO = struct.Struct("<8sII")
+
+# Atributos do associador gravados no snapshot (dados e índices)
+ATRIBUTOS_SNAPSHOT = (
+    'municipios',
+    'validadores',
+    'resultados',
+    'indice_nomes',
+    'nomes_normalizados',
+    'indice_trigramas',
+    'validadores_por_municipio',
+    'catalogo_validadores',
+    'candidatos_atual',
+    'vencimentos',
+    'resumo_validadores',
+    'erros_carga',
+    'total_erros_carga',
+)
+
+
+class SnapshotInvalido(Exception):
+    """Snapshot ausente, desatualizado ou corrompido"""
+
+
+def hash_arquivo(caminho) -> str:
+    """Retorna o sha256 do conteúdo de um arquivo"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def descrever_fonte(caminho) -> dict:
+    """Tamanho, mtime e hash de um arquivo fonte"""
+    info = os.stat(caminho)
+    return {
+        'caminho': str(Path(caminho).resolve()),
+        'tamanho': info.st_size,
+        'mtime_ns': info.st_mtime_ns,
+        'sha256': hash_arquivo(caminho),
+    }
+
+
+def versao_fontes(arquivos_fonte) -> str:
+    """Versão dos dados: hash curto do conteúdo dos arquivos fonte"""
+    sha = hashlib.sha256()
+    for arquivo in arquivos_fonte:
+        sha.update(hash_arquivo(arquivo).encode('ascii'))
+    return sha.hexdigest()[:12]
+
+
+def fonte_confere(fonte: dict) -> bool:
+    """Verifica se um arquivo fonte ainda corresponde ao registrado no snapshot
+    
+    Tamanho e mtime iguais dispensam o hash; se só o mtime mudou (por exemplo,
+    após um checkout), o hash do conteúdo decide.
+    """
+    try:
+        info = os.stat(fonte['caminho'])
+    except OSError:
+        return False
+    if info.st_size != fonte['tamanho']:
+        return False
+    if info.st_mtime_ns == fonte['mtime_ns']:
+        return True
+    return hash_arquivo(fonte['caminho']) == fonte['sha256']
+
+
+def caminho_snapshot(diretorio_cache, arquivos_fonte) -> Path:
+    """Caminho do snapshot para um conjunto de arquivos fonte"""
+    nomes = '|'.join(str(Path(arquivo).resolve()) for arquivo in arquivos_fonte)
+    digest = hashlib.sha256(nomes.encode('utf-8')).hexdigest()[:16]
+    return Path(diretorio_cache) / f"associador-{digest}.v{SNAPSHOT_VERSAO}.snap"
+
+
+def salvar_snapshot(associador, diretorio_cache) -> Path:
+    """Grava o snapshot dos dados e índices do associador (escrita atômica)"""
+    arquivos_fonte = [associador.arquivo_municipios, associador.arquivo_validadores]
+    destino = caminho_snapshot(diretorio_cache, arquivos_fonte)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    
+    conteudo = pickle.dumps(
+        {nome: getattr(associador, nome) for nome in ATRIBUTOS_SNAPSHOT},
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+    cabecalho = json.dumps({
+        'fontes': [descrever_fonte(arquivo) for arquivo in arquivos_fonte],
+        'sha256': hashlib.sha256(conteudo).hexdigest(),
+    }).encode('utf-8')
+    
+    import tempfile  # só na gravação; a leitura do snapshot não precisa dele
+    descritor, temporario = tempfile.mkstemp(dir=destino.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(_PREFIXO.pack(MAGIC, SNAPSHOT_VERSAO, len(cabecalho)))
+            arquivo.write(cabecalho)
+            arquivo.write(conteudo)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.unlink(temporario)
+        raise
+    return destino
+
+
+def carregar_snapshot(associador, diretorio_cache) -> Path:
+    """Restaura no associador os dados e índices de um snapshot válido
+    
+    O arquivo é mapeado em memória e desserializado direto do mapeamento.
+    
+    Raises:
+        SnapshotInvalido: se o snapshot não existe, é de outra versão, não
+            corresponde às fontes atuais ou está corrompido
+    """
+    arquivos_fonte = [associador.arquivo_municipios, associador.arquivo_validadores]
+    origem = caminho_snapshot(diretorio_cache, arquivos_fonte)
+    
+    if not origem.exists():
+        raise SnapshotInvalido("snapshot inexistente")
+    
+    try:
+        with open(origem, 'rb') as arquivo, \
+                mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            if len(mapa) < _PREFIXO.size:
+                raise SnapshotInvalido("arquivo truncado")
+            magic, versao, tamanho_cabecalho = _PREFIXO.unpack_from(mapa, 0)
+            if magic != MAGIC or versao != SNAPSHOT_VERSAO:
+                raise SnapshotInvalido("formato ou versão incompatível")
+            
+            inicio = _PREFIXO.size + tamanho_cabecalho
+            cabecalho = json.loads(mapa[_PREFIXO.size:inicio].decode('utf-8'))
+            fontes = cabecalho['fontes']
+            if [fonte['caminho'] for fonte in fontes] != [str(Path(a).resolve()) for a in arquivos_fonte]:
+                raise SnapshotInvalido("fontes diferentes")
+            if not all(fonte_confere(fonte) for fonte in fontes):
+                raise SnapshotInvalido("fontes alteradas desde o snapshot")
+            
+            with memoryview(mapa) as visao, visao[inicio:] as conteudo:
+                if hashlib.sha256(conteudo).hexdigest() != cabecalho['sha256']:
+                    raise SnapshotInvalido("conteúdo corrompido")
+                estado = pickle.loads(conteudo)
+    except SnapshotInvalido:
+        raise
+    except (OSError, ValueError, KeyError, struct.error, pickle.UnpicklingError,
+            EOFError, AttributeError, ImportError) as e:
+        raise SnapshotInvalido(str(e)) from e
+    
+    for nome in ATRIBUTOS_SNAPSHOT:
+        setattr(associador, nome, estado[nome])
+    return origem
@@ -0,0 +1,124 @@
+"""
+Coalescência ("single-flight") de chamadas idênticas simultâneas
+
+Enquanto uma execução com uma chave está em andamento, outras chamadas com
+a mesma chave aguardam e recebem o mesmo resultado (ou a mesma exceção), em
+vez de repetirem o trabalho.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class VooUnico:
+    """Coalescência de corrotinas no event loop
+    
+    A execução compartilhada roda em uma tarefa própria: se a chamada que a
+    iniciou for cancelada, as demais continuam aguardando. A tarefa só é
+    cancelada quando todas as chamadas que a aguardam desistem.
+    """
+    
+    def __init__(self):
+        self._voos: Dict[Hashable, list] = {}  # chave -> [tarefa, chamadas aguardando]
+        self.execucoes = 0
+        self.coalescidas = 0
+    
+    def __len__(self):
+        return len(self._voos)
+    
+    async def executar(self, chave: Hashable, fabrica: Callable[[], Awaitable]) -> Any:
+        """Resultado de `await fabrica()`, compartilhado com chamadas simultâneas da mesma chave"""
+        voo = self._voos.get(chave)
+        if voo is None:
+            voo = [asyncio.ensure_future(fabrica()), 0]
+            self._voos[chave] = voo
+            voo[0].add_done_callback(lambda _: self._encerrar(chave, voo))
+            self.execucoes += 1
+        else:
+            self.coalescidas += 1
+        
+        tarefa = voo[0]
+        voo[1] += 1
+        try:
+            return await asyncio.shield(tarefa)
+        finally:
+            voo[1] -= 1
+            if voo[1] == 0 and not tarefa.done():
+                # Ninguém mais aguarda: novas chamadas iniciam outra execução
+                self._encerrar(chave, voo)
+                tarefa.cancel()
+    
+    def _encerrar(self, chave, voo):
+        if self._voos.get(chave) is voo:
+            del self._voos[chave]
+
+
+class _Voo:
+    """Execução em andamento de VooUnicoThreads"""
+    
+    __slots__ = ('concluido', 'valor', 'erro')
+    
+    def __init__(self):
+        self.concluido = threading.Event()
+        self.valor = None
+        self.erro = None
+
+
+class VooUnicoThreads:
+    """Coalescência de funções síncronas chamadas de várias threads
+    
+    Args:
+        aguardar: Função chamada periodicamente enquanto uma thread espera a
+            execução de outra (ex.: para verificar um cancelamento)
+        repetir: Exceções que são da chamada que executava, e não do cálculo
+            (ex.: o seu cancelamento ou tempo limite): em vez de recebê-las, as
+            chamadas que aguardavam repetem a execução, uma delas como a nova
+            executora
+    """
+    
+    def __init__(self, aguardar: Callable[[], None] = None, intervalo: float = 0.05,
+                 repetir: Tuple[type, ...] = ()):
+        self._voos: Dict[Hashable, _Voo] = {}
+        self._lock = threading.Lock()
+        self._aguardar = aguardar
+        self._intervalo = intervalo
+        self._repetir = tuple(repetir)
+        self.execucoes = 0
+        self.coalescidas = 0
+        self.repeticoes = 0
+    
+    def executar(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Resultado de `calcular()`, compartilhado com chamadas simultâneas da mesma chave"""
+        while True:
+            with self._lock:
+                voo = self._voos.get(chave)
+                lider = voo is None
+                if lider:
+                    voo = self._voos[chave] = _Voo()
+                    self.execucoes += 1
+                else:
+                    self.coalescidas += 1
+            if lider:
+                break
+            
+            while not voo.concluido.wait(self._intervalo):
+                if self._aguardar:
+                    self._aguardar()
+            if voo.erro is None:
+                return voo.valor
+            if not isinstance(voo.erro, self._repetir):
+                raise voo.erro
+            # A executora foi cancelada: esta chamada tenta de novo
+            self.repeticoes += 1
+        
+        try:
+            voo.valor = calcular()
+            return voo.valor
+        except BaseException as e:
+            voo.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._voos[chave]
+            voo.concluido.set()
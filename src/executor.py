@@ -0,0 +1,207 @@
+"""
+Execução das ferramentas fora do event loop, com concorrência limitada
+
+O corpo de cada ferramenta (busca, classificação, listagens) é síncrono e
+roda em um pool de threads; o event loop só aguarda o resultado, então uma
+consulta lenta não trava as demais requisições da sessão stdio. Cada
+ferramenta pode ter um tempo limite; quando ele estoura ou o cliente MCP
+cancela a requisição, a execução é sinalizada como cancelada e os laços
+longos (ferramentas em lote) param no próximo item.
+
+Um pool de processos não é usado: os dados e índices vivem no processo do
+servidor e teriam de ser copiados para cada processo.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Sinal de cancelamento da execução corrente (um threading.Event por chamada)
+_cancelamento: contextvars.ContextVar = contextvars.ContextVar('cancelamento', default=None)
+
+
+class ExecucaoCancelada(Exception):
+    """A chamada foi cancelada pelo cliente ou excedeu o tempo limite"""
+
+
+class TempoEsgotado(Exception):
+    """A ferramenta não terminou dentro do tempo limite"""
+
+
+def verificar_cancelamento():
+    """Levanta ExecucaoCancelada se a chamada corrente foi cancelada
+    
+    Deve ser chamada entre as etapas de trabalhos longos (ex.: a cada item
+    de um lote); fora do executor não faz nada.
+    """
+    evento = _cancelamento.get()
+    if evento is not None and evento.is_set():
+        raise ExecucaoCancelada("execução cancelada")
+
+
+def ler_tempos_limite(texto: str) -> Dict[str, float]:
+    """Tempos limite por ferramenta no formato 'nome=segundos,nome=segundos'"""
+    tempos = {}
+    for item in (texto or '').split(','):
+        if '=' not in item:
+            continue
+        nome, segundos = item.split('=', 1)
+        tempos[nome.strip()] = float(segundos)
+    return tempos
+
+
+def _executar_com_sinal(evento: threading.Event, funcao: Callable, args: tuple):
+    """Executa a função na thread do pool com o sinal de cancelamento da chamada"""
+    if evento.is_set():
+        raise ExecucaoCancelada("execução cancelada antes de iniciar")
+    _cancelamento.set(evento)
+    try:
+        return funcao(*args)
+    finally:
+        _cancelamento.set(None)
+
+
+class ExecutorFerramentas:
+    """Pool de threads com limite de concorrência, tempos limite e medidor de execuções
+    
+    Args:
+        trabalhadores: Threads do pool
+        concorrencia: Execuções simultâneas permitidas (as demais aguardam a vez)
+        tempo_limite: Tempo limite padrão em segundos (0 = sem limite)
+        tempos_limite: Tempos limite por nome de ferramenta
+    """
+    
+    def __init__(self, trabalhadores: int = 4, concorrencia: int = None,
+                 tempo_limite: float = 0, tempos_limite: Optional[Dict[str, float]] = None):
+        self.trabalhadores = max(1, trabalhadores)
+        self.concorrencia = max(1, concorrencia or self.trabalhadores)
+        self.tempo_limite = tempo_limite
+        self.tempos_limite = dict(tempos_limite or {})
+        self._pool = None
+        self._semaforo = None
+        self._loop = None
+        self._futuros = set()  # execuções submetidas ao pool e ainda não terminadas
+        
+        # Medidores
+        self.em_andamento = 0  # execuções ocupando uma vaga (inclusive as já abandonadas)
+        self.aguardando = 0  # chamadas esperando uma vaga
+        self.pico_em_andamento = 0
+        self.concluidas = 0
+        self.erros = 0
+        self.tempos_esgotados = 0
+        self.canceladas = 0
+    
+    def tempo_limite_de(self, ferramenta: str) -> float:
+        """Tempo limite de uma ferramenta (0 = sem limite)"""
+        return self.tempos_limite.get(ferramenta, self.tempo_limite)
+    
+    async def executar(self, ferramenta: str, funcao: Callable, *args) -> Any:
+        """Executa `funcao(*args)` no pool, respeitando a concorrência e o tempo limite
+        
+        A vaga só é liberada quando a thread termina de fato: uma execução que
+        estourou o tempo limite continua ocupando sua vaga até parar.
+        
+        Raises:
+            TempoEsgotado: o tempo limite (espera pela vaga + execução) acabou
+            asyncio.CancelledError: a requisição foi cancelada pelo cliente
+        """
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.trabalhadores, thread_name_prefix='ferramenta')
+        if self._loop is not loop:
+            # O semáforo pertence a um event loop (ex.: um novo asyncio.run)
+            self._semaforo = asyncio.Semaphore(self.concorrencia)
+            self._loop = loop
+        
+        limite = self.tempo_limite_de(ferramenta)
+        prazo = time.monotonic() + limite if limite > 0 else None
+        
+        self.aguardando += 1
+        try:
+            await asyncio.wait_for(self._semaforo.acquire(), limite if limite > 0 else None)
+        except asyncio.TimeoutError:
+            self.tempos_esgotados += 1
+            raise TempoEsgotado(f"'{ferramenta}' aguardou mais de {limite:g}s por uma vaga de execução")
+        except asyncio.CancelledError:
+            self.canceladas += 1
+            raise
+        finally:
+            self.aguardando -= 1
+        
+        evento = threading.Event()
+        try:
+            futuro = self._pool.submit(_executar_com_sinal, evento, funcao, args)
+        except BaseException:
+            self._semaforo.release()
+            raise
+        self.em_andamento += 1
+        self.pico_em_andamento = max(self.pico_em_andamento, self.em_andamento)
+        semaforo = self._semaforo
+        self._futuros.add(futuro)
+        futuro.add_done_callback(lambda _: self._ao_terminar(loop, semaforo, futuro))
+        
+        restante = max(0.0, prazo - time.monotonic()) if prazo is not None else None
+        try:
+            resultado = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(futuro)), restante)
+        except asyncio.TimeoutError:
+            evento.set()
+            futuro.cancel()
+            self.tempos_esgotados += 1
+            raise TempoEsgotado(f"'{ferramenta}' excedeu o tempo limite de {limite:g}s")
+        except asyncio.CancelledError:
+            evento.set()
+            futuro.cancel()
+            self.canceladas += 1
+            raise
+        except ExecucaoCancelada:
+            self.canceladas += 1
+            raise
+        except Exception:
+            self.erros += 1
+            raise
+        self.concluidas += 1
+        return resultado
+    
+    def _ao_terminar(self, loop, semaforo: asyncio.Semaphore, futuro):
+        """Chamado na thread do pool quando a execução termina: libera a vaga no event loop"""
+        self._futuros.discard(futuro)
+        try:
+            loop.call_soon_threadsafe(self._liberar, semaforo)
+        except RuntimeError:
+            pass  # event loop já encerrado
+    
+    def _liberar(self, semaforo: asyncio.Semaphore):
+        self.em_andamento -= 1
+        semaforo.release()
+    
+    def estatisticas(self) -> Dict[str, Any]:
+        """Medidores do executor (reportados em status_servidor)"""
+        return {
+            'trabalhadores': self.trabalhadores,
+            'concorrencia': self.concorrencia,
+            'tempo_limite_s': self.tempo_limite,
+            'tempos_limite_s': dict(self.tempos_limite),
+            'em_andamento': self.em_andamento,
+            'aguardando': self.aguardando,
+            'pico_em_andamento': self.pico_em_andamento,
+            'concluidas': self.concluidas,
+            'erros': self.erros,
+            'tempos_esgotados': self.tempos_esgotados,
+            'canceladas': self.canceladas,
+        }
+    
+    def encerrar(self):
+        """Encerra o pool sem aguardar execuções abandonadas
+        
+        As execuções que ainda aguardam uma thread são canceladas (o
+        `cancel_futures` de ThreadPoolExecutor.shutdown só existe a partir do
+        Python 3.9).
+        """
+        if self._pool is not None:
+            for futuro in list(self._futuros):
+                futuro.cancel()
+            self._pool.shutdown(wait=False)
+            self._pool = None
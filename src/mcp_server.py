@@ -5,26 +5,48 @@ Fornece ferramentas para buscar e classificar validadores de municípios brasile
 """
 
 from typing import Dict, List, Optional, Any
+import asyncio
 import json
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
-# Adiciona o diretório raiz ao PATH para importar os módulos
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Os módulos do projeto são importados a partir da raiz: executar este arquivo
+# diretamente (python src/mcp_server.py) não os encontra
+if __name__ == "__main__" and not __package__:
+    sys.exit("Execute a partir da raiz do projeto como módulo: python -m src.mcp_server")
 
 from mcp.server import Server
-from mcp.types import (
-    Tool,
-    TextContent,
-    ImageContent,
-    EmbeddedResource,
-    BlobResourceContents
+from mcp.types import TextContent, Tool
+import consultas_municipios
+import snapshot_associador
+from associar_municipios_validadores import AssociadorMunicipiosValidadores, normalizar_nome
+from consultas_municipios import como_dict
+from src.executor import (
+    ExecucaoCancelada,
+    ExecutorFerramentas,
+    TempoEsgotado,
+    ler_tempos_limite,
+    verificar_cancelamento,
 )
-from associar_municipios_validadores import AssociadorMunicipiosValidadores
-from buscar_municipio_validador import remover_acentos
-from datetime import datetime
-import unicodedata
+from src.coalescencia import VooUnico, VooUnicoThreads
+from src.metricas import Metricas, gravar_periodicamente
+from src.perfilamento import MODOS as MODOS_PERFIL, perfilador_do_ambiente
+from src.recarga import MonitorFontes, monitorar_fontes
+from src.renderizacao import (
+    FORMATO_JSON,
+    FORMATO_TEXTO,
+    FORMATOS,
+    formato_resposta,
+    json_compacto,
+    texto_busca,
+    texto_classificacao,
+    texto_participacao,
+)
+from datetime import date, datetime
 
 # Instância global do servidor
 app = Server("mcp-busca-municipio-validador")
@@ -34,22 +56,376 @@ BASE_DIR = Path(__file__).parent.parent
 ARQUIVO_MUNICIPIOS = BASE_DIR / "PresetFiles" / "TACES06.TXT"
 ARQUIVO_VALIDADORES = BASE_DIR / "PresetFiles" / "TFIX105.txt"
 
+# Diretório opcional do snapshot binário dos dados (acelera a partida a frio)
+DIRETORIO_CACHE = os.environ.get("MCP_MUNICIPIOS_CACHE_DIR")
+
+# Dados em um dataset mapeado em memória no diretório do cache, compartilhado
+# (sem cópia) entre os processos do servidor HTTP (dataset_mapeado)
+DADOS_MAPEADOS = os.environ.get("MCP_MUNICIPIOS_DADOS_MAPEADOS", "0") != "0"
+
+# Aquecimento: carrega os dados em segundo plano assim que o servidor sobe
+# (MCP_MUNICIPIOS_AQUECER=0 volta para a carga na primeira chamada)
+AQUECER_NA_PARTIDA = os.environ.get("MCP_MUNICIPIOS_AQUECER", "1") != "0"
+
+# Intervalo (segundos) da verificação de alterações nos PresetFiles; 0 desativa
+INTERVALO_RECARGA = float(os.environ.get("MCP_MUNICIPIOS_RECARGA_INTERVALO", "0"))
+
+# Quantidade máxima de itens por chamada das ferramentas em lote
+LIMITE_ITENS_LOTE = int(os.environ.get("MCP_MUNICIPIOS_LIMITE_LOTE", "500"))
+
+# Cache de resultados das ferramentas: quantidade máxima de entradas (0
+# desativa) e validade de cada entrada em segundos (0 = sem limite de tempo)
+TAMANHO_CACHE = int(os.environ.get("MCP_MUNICIPIOS_CACHE_TAMANHO", "1024"))
+TTL_CACHE = float(os.environ.get("MCP_MUNICIPIOS_CACHE_TTL", "0"))
+
+# Execução das ferramentas: threads do pool, execuções simultâneas, tempo
+# limite padrão em segundos (0 = sem limite) e tempos por ferramenta
+# ("buscar_municipios_lote=30,listar_validadores=5")
+TRABALHADORES = int(os.environ.get("MCP_MUNICIPIOS_TRABALHADORES", "4"))
+CONCORRENCIA = int(os.environ.get("MCP_MUNICIPIOS_CONCORRENCIA", "0")) or TRABALHADORES
+TEMPO_LIMITE = float(os.environ.get("MCP_MUNICIPIOS_TEMPO_LIMITE", "30"))
+TEMPOS_LIMITE = ler_tempos_limite(os.environ.get("MCP_MUNICIPIOS_TEMPOS_LIMITE", ""))
+
+# Métricas: arquivo JSONL opcional onde um instantâneo é acrescentado a cada
+# intervalo (segundos); sem arquivo, as métricas ficam só na ferramenta metricas
+ARQUIVO_METRICAS = os.environ.get("MCP_MUNICIPIOS_METRICAS_ARQUIVO")
+INTERVALO_METRICAS = float(os.environ.get("MCP_MUNICIPIOS_METRICAS_INTERVALO", "60"))
+
+class CargaFalhou(Exception):
+    """Os arquivos de dados não puderam ser carregados"""
+
 # Cache dos dados carregados
 _associador_cache = None
+_associador_em_carga = None
+_lock_carga = threading.Lock()
+_carga_futuro = None
+
+# Estado da carga, reportado pela ferramenta status_servidor
+_estado_carga = {
+    'fase': 'pendente',
+    'iniciada_em': None,
+    'concluida_em': None,
+    'duracao_ms': None,
+    'erro': None,
+}
+
+# Estado das recargas a quente (o associador em uso nunca é alterado: uma
+# recarga constrói outro completo e troca a referência de _associador_cache)
+_lock_recarga = None
+_estado_recarga = {
+    'geracao': 1,
+    'recargas': 0,
+    'em_andamento': False,
+    'ultima': None,
+}
+
+class CacheResultados:
+    """Cache LRU limitado dos resultados das ferramentas
+    
+    As chaves incluem a versão dos dados, então uma recarga nunca devolve
+    resultados da versão anterior (e o cache é esvaziado após cada recarga).
+    Cada entrada pode ter um dia (ordinal) de vencimento: o próximo dia em que
+    algum validador expira, quando a situação ATIVO/EXPIRADO e o validador
+    atual podem mudar; a partir desse dia a entrada é descartada.
+    """
+    
+    def __init__(self, tamanho: int, ttl: float = 0):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # chave -> (instante de criação, dia de vencimento, valor)
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.expiradas = 0
+        self.vencidas = 0
+        self.invalidacoes = 0
+        # O cancelamento (ou tempo limite) de uma requisição não é repassado
+        # às outras que aguardavam o mesmo cálculo: uma delas o refaz
+        self._voos = VooUnicoThreads(verificar_cancelamento, repetir=(ExecucaoCancelada,))
+    
+    def obter(self, chave, calcular, vence_em: int = None):
+        """Valor da chave no cache, ou `calcular()` (guardado até `vence_em`, se informado)
+        
+        Chamadas simultâneas da mesma chave ausente compartilham um único
+        `calcular()` (contadas em `coalescidas`).
+        """
+        if self.tamanho <= 0:
+            return self._voos.executar(chave, calcular)
+        
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                criada, vencimento, valor = entrada
+                if vencimento is not None and consultas_municipios.hoje() >= vencimento:
+                    del self._entradas[chave]
+                    self.vencidas += 1
+                elif self.ttl > 0 and agora - criada > self.ttl:
+                    del self._entradas[chave]
+                    self.expiradas += 1
+                else:
+                    self._entradas.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+            self.falhas += 1
+        
+        # Calculado fora do lock: chamadas de outras chaves não esperam esta
+        return self._voos.executar(chave, lambda: self._calcular_e_guardar(chave, calcular, agora, vence_em))
+    
+    def _calcular_e_guardar(self, chave, calcular, agora: float, vence_em):
+        valor = calcular()
+        with self._lock:
+            self._entradas[chave] = (agora, vence_em, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho:
+                self._entradas.popitem(last=False)
+                self.descartes += 1
+        return valor
+    
+    def limpar(self):
+        """Descarta todas as entradas (ex.: após uma recarga dos dados)"""
+        with self._lock:
+            if self._entradas:
+                self._entradas.clear()
+                self.invalidacoes += 1
+    
+    def estatisticas(self) -> Dict[str, Any]:
+        """Contadores do cache (reportados em status_servidor)"""
+        consultas = self.acertos + self.falhas
+        return {
+            'entradas': len(self._entradas),
+            'tamanho_maximo': self.tamanho,
+            'ttl_s': self.ttl,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acertos': round(self.acertos / consultas, 4) if consultas else None,
+            'descartes': self.descartes,
+            'expiradas': self.expiradas,
+            'vencidas': self.vencidas,
+            'invalidacoes': self.invalidacoes,
+            'coalescidas': self._voos.coalescidas,
+            'repeticoes': self._voos.repeticoes,
+        }
+
+_cache_resultados = CacheResultados(TAMANHO_CACHE, TTL_CACHE)
+
+# Execução das ferramentas de consulta fora do event loop
+_executor = ExecutorFerramentas(TRABALHADORES, CONCORRENCIA, TEMPO_LIMITE, TEMPOS_LIMITE)
+
+# Coalescência: requisições idênticas em andamento e recargas simultâneas
+# compartilham uma única execução
+_voos_requisicoes = VooUnico()
+_voos_recarga = VooUnico()
+_cargas_coalescidas = 0
+
+# Tempos da carga, latências e tamanhos das respostas (ferramenta metricas)
+_metricas = Metricas()
+
+# Perfilamento opcional (MCP_MUNICIPIOS_PERFIL_*); None quando desligado
+_perfilador = perfilador_do_ambiente()
+
+def _versao(associador):
+    """Identifica a versão dos dados de um associador nas chaves do cache"""
+    return associador.versao_dados or id(associador)
+
+def _buscar_com_cache(associador, nome_municipio: str, dia: int = None):
+    """ResultadoBusca de um município, reaproveitando buscas de nomes equivalentes"""
+    dia = dia or consultas_municipios.hoje()
+    chave = ('buscar_municipio', _versao(associador), normalizar_nome(nome_municipio))
+    busca = _cache_resultados.obter(
+        chave,
+        lambda: consultas_municipios.buscar_municipio(associador, nome_municipio, dia),
+        associador.proximo_vencimento(dia)
+    )
+    return busca._replace(consulta=nome_municipio)
+
+def _classificar_com_cache(associador, nome_municipio: str, nome_validador: str,
+                           busca=None, dia: int = None):
+    """Classificacao de um par município/validador, reaproveitando pares equivalentes
+    
+    O município é normalizado como na busca por nome e o validador como no
+    catálogo (apenas maiúsculas).
+    """
+    dia = dia or consultas_municipios.hoje()
+    chave = ('classificar_validador', _versao(associador),
+             normalizar_nome(nome_municipio), nome_validador.upper())
+    classificacao = _cache_resultados.obter(chave, lambda: consultas_municipios.classificar_validador(
+        associador, nome_municipio, nome_validador,
+        busca or _buscar_com_cache(associador, nome_municipio, dia), dia
+    ), associador.proximo_vencimento(dia))
+    return classificacao._replace(
+        validador=nome_validador, busca=classificacao.busca._replace(consulta=nome_municipio)
+    )
 
 def get_associador():
     """Obtém ou cria uma instância do associador com cache"""
-    global _associador_cache
+    global _associador_cache, _cargas_coalescidas
     if _associador_cache is None:
-        _associador_cache = AssociadorMunicipiosValidadores(
-            str(ARQUIVO_MUNICIPIOS), 
-            str(ARQUIVO_VALIDADORES)
-        )
-        _associador_cache.carregar_municipios()
-        _associador_cache.carregar_validadores()
-        _associador_cache.associar_dados()
+        with _lock_carga:
+            if _associador_cache is None:
+                _associador_cache = _carregar_associador()
+            else:
+                # Outra thread carregou enquanto esta aguardava o lock
+                _cargas_coalescidas += 1
     return _associador_cache
 
+def _relatar_progresso(mensagem: str):
+    """Mensagens de progresso da carga: no transporte stdio, o stdout é o canal do protocolo"""
+    print(mensagem, file=sys.stderr)
+
+def _criar_associador():
+    """Cria um associador (ainda sem dados) para os arquivos configurados"""
+    return AssociadorMunicipiosValidadores(
+        str(ARQUIVO_MUNICIPIOS), 
+        str(ARQUIVO_VALIDADORES),
+        ao_progresso=_relatar_progresso
+    )
+
+def _carregar_dados(associador) -> bool:
+    """Carrega dados e índices de um associador novo"""
+    if _perfilador is not None and _perfilador.carga:
+        return _perfilador.perfilar('carga', {'diretorio_cache': DIRETORIO_CACHE, 'mapeado': DADOS_MAPEADOS},
+                                    associador.carregar_dados, DIRETORIO_CACHE, mapeado=DADOS_MAPEADOS,
+                                    forcar=True)
+    return associador.carregar_dados(DIRETORIO_CACHE, mapeado=DADOS_MAPEADOS)
+
+def _carregar_associador():
+    """Carrega os dados registrando fase e tempos em _estado_carga"""
+    global _associador_em_carga
+    _estado_carga.update(fase='carregando', iniciada_em=datetime.now().isoformat(timespec='seconds'))
+    inicio = time.perf_counter()
+    associador = _associador_em_carga = _criar_associador()
+    carregado = False
+    try:
+        carregado = _carregar_dados(associador)
+    except Exception as e:
+        _estado_carga.update(fase='erro', erro=str(e))
+        raise
+    finally:
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        _estado_carga.update(
+            concluida_em=datetime.now().isoformat(timespec='seconds'),
+            duracao_ms=round(duracao_ms, 3)
+        )
+        _metricas.registrar_carga('carga', duracao_ms, associador.tempos_carga, carregado)
+        _associador_em_carga = None
+    
+    if not carregado:
+        # Um associador sem dados não é guardado: a próxima chamada tenta de novo
+        _estado_carga.update(fase='erro', erro='Falha ao ler os arquivos de dados')
+        raise CargaFalhou('Falha ao ler os arquivos de dados')
+    _estado_carga['fase'] = 'pronto'
+    return associador
+
+def iniciar_carga() -> "asyncio.Future":
+    """Inicia (uma única vez) a carga dos dados em uma thread de segundo plano"""
+    global _carga_futuro
+    if _carga_futuro is None:
+        _carga_futuro = asyncio.get_running_loop().run_in_executor(None, get_associador)
+        _carga_futuro.add_done_callback(_ao_terminar_carga)
+    return _carga_futuro
+
+def _ao_terminar_carga(futuro: "asyncio.Future"):
+    """Descarta a carga que falhou, para que a próxima chamada tente de novo"""
+    global _carga_futuro
+    if futuro.cancelled() or futuro.exception() is not None:
+        if _carga_futuro is futuro:
+            _carga_futuro = None
+
+async def aguardar_associador():
+    """Aguarda os dados ficarem prontos sem bloquear o event loop
+    
+    Chamadas que chegam durante o aquecimento aguardam a mesma carga em vez
+    de dispararem a sua.
+    """
+    global _cargas_coalescidas
+    if _associador_cache is not None:
+        return _associador_cache
+    if _carga_futuro is not None:
+        _cargas_coalescidas += 1
+    return await asyncio.shield(iniciar_carga())
+
+async def recarregar_dados(forcar: bool = False, motivo: str = 'manual') -> Dict[str, Any]:
+    """Recarrega os PresetFiles, ou aguarda a recarga que já estiver em andamento
+    
+    Pedidos de recarga simultâneos (ferramenta, monitor de arquivos) compartilham
+    uma única execução de _recarregar_dados e recebem o mesmo resultado.
+    """
+    return await _voos_recarga.executar('recarga', lambda: _recarregar_dados(forcar, motivo))
+
+async def _recarregar_dados(forcar: bool, motivo: str) -> Dict[str, Any]:
+    """Recarrega os PresetFiles fora do event loop e troca o associador atomicamente
+    
+    O novo associador (registros e índices) é construído por completo em uma
+    thread antes da troca da referência; requisições em andamento terminam com
+    a versão anterior. Sem `forcar`, nada é feito se a versão dos arquivos não
+    mudou. Se a carga falhar, a versão anterior continua em uso.
+    
+    Returns:
+        Dicionário com o resultado da recarga (também guardado em _estado_recarga)
+    """
+    global _associador_cache, _lock_recarga
+    if _lock_recarga is None:
+        _lock_recarga = asyncio.Lock()
+    
+    atual = await aguardar_associador()
+    loop = asyncio.get_running_loop()
+    
+    async with _lock_recarga:
+        # Outra recarga pode ter trocado os dados enquanto esta aguardava
+        atual = _associador_cache or atual
+        arquivos = [atual.arquivo_municipios, atual.arquivo_validadores]
+        try:
+            versao = await loop.run_in_executor(None, snapshot_associador.versao_fontes, arquivos)
+        except OSError as e:
+            versao = None
+            if not forcar:
+                return {'recarregado': False, 'versao_dados': atual.versao_dados, 'erro': str(e)}
+        
+        if not forcar and versao == atual.versao_dados:
+            return {'recarregado': False, 'versao_dados': atual.versao_dados}
+        
+        resultado = {
+            'recarregado': False,
+            'motivo': motivo,
+            'iniciada_em': datetime.now().isoformat(timespec='seconds'),
+            'versao_anterior': atual.versao_dados,
+            'versao_dados': atual.versao_dados,
+            'duracao_ms': None,
+            'erro': None,
+        }
+        _estado_recarga['em_andamento'] = True
+        inicio = time.perf_counter()
+        novo = None
+        try:
+            novo = _criar_associador()
+            carregado = await loop.run_in_executor(None, _carregar_dados, novo)
+            if carregado:
+                _associador_cache = novo
+                _cache_resultados.limpar()
+                _estado_recarga['geracao'] += 1
+                _estado_recarga['recargas'] += 1
+                resultado.update(recarregado=True, versao_dados=novo.versao_dados)
+            else:
+                resultado['erro'] = 'Falha ao ler os arquivos de dados'
+        except Exception as e:
+            resultado['erro'] = str(e)
+        finally:
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            resultado['duracao_ms'] = round(duracao_ms, 3)
+            _estado_recarga.update(em_andamento=False, ultima=resultado)
+            _metricas.registrar_carga('recarga', duracao_ms, novo.tempos_carga if novo else {},
+                                     resultado['recarregado'])
+        return resultado
+
+# Parâmetro opcional das ferramentas de busca e classificação
+PROPRIEDADE_FORMATO = {
+    "type": "string",
+    "enum": list(FORMATOS),
+    "description": "Formato da resposta: texto (padrão, tabelas), json (compacto) ou ambos"
+}
+
 @app.list_tools()
 async def list_tools() -> List[Tool]:
     """Lista as ferramentas disponíveis no servidor MCP"""
@@ -63,7 +439,8 @@ async def list_tools() -> List[Tool]:
                     "nome_municipio": {
                         "type": "string",
                         "description": "Nome do município a buscar (aceita nomes parciais e ignora acentuação)"
-                    }
+                    },
+                    "formato": PROPRIEDADE_FORMATO
                 },
                 "required": ["nome_municipio"]
             }
@@ -81,11 +458,43 @@ async def list_tools() -> List[Tool]:
                     "nome_validador": {
                         "type": "string",
                         "description": "Nome do validador a classificar"
-                    }
+                    },
+                    "formato": PROPRIEDADE_FORMATO
                 },
                 "required": ["nome_municipio", "nome_validador"]
             }
         ),
+        Tool(
+            name="buscar_municipios_lote",
+            description="Busca validadores de vários municípios em uma única chamada (resultado por item)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "municipios": {
+                        "type": "array",
+                        "description": "Nomes dos municípios a buscar (itens inválidos geram erro só no próprio item)"
+                    },
+                    "formato": PROPRIEDADE_FORMATO
+                },
+                "required": ["municipios"]
+            }
+        ),
+        Tool(
+            name="classificar_validadores_lote",
+            description="Classifica vários pares município/validador em uma única chamada (resultado por item)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pares": {
+                        "type": "array",
+                        "description": ("Pares {\"nome_municipio\", \"nome_validador\"} a classificar "
+                                        "(itens inválidos geram erro só no próprio item)")
+                    },
+                    "formato": PROPRIEDADE_FORMATO
+                },
+                "required": ["pares"]
+            }
+        ),
         Tool(
             name="listar_validadores",
             description="Lista todos os validadores únicos cadastrados no sistema",
@@ -98,274 +507,479 @@ async def list_tools() -> List[Tool]:
                     }
                 }
             }
+        ),
+        Tool(
+            name="participacao_validadores",
+            description="Participação de cada validador entre os municípios de um estado (ou de todos)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "estado": {
+                        "type": "string",
+                        "description": "Código do estado (opcional, ex: SP, RJ); sem ele, todos os estados"
+                    },
+                    "formato": PROPRIEDADE_FORMATO
+                }
+            }
+        ),
+        Tool(
+            name="recarregar_dados",
+            description="Recarrega os arquivos de dados se tiverem mudado (sem reiniciar o servidor)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "forcar": {
+                        "type": "boolean",
+                        "description": "Recarrega mesmo que a versão dos arquivos não tenha mudado"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="status_servidor",
+            description="Informa se os dados já estão carregados (fase e tempos da carga)",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
+        ),
+        Tool(
+            name="metricas",
+            description="Métricas do servidor: tempos das fases da carga, latência e tamanho das respostas por ferramenta, acertos do cache",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
+        ),
+        Tool(
+            name="perfilamento",
+            description="Consulta ou ajusta o perfilamento (cProfile/tracemalloc) das requisições e da carga",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "amostragem": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "description": "Perfila uma a cada N requisições (0 desativa a amostragem)"
+                    },
+                    "limiar_ms": {
+                        "type": "number",
+                        "minimum": 0,
+                        "description": "Grava só os perfis de requisições com pelo menos essa duração"
+                    },
+                    "modo": {
+                        "type": "string",
+                        "enum": list(MODOS_PERFIL),
+                        "description": "cprofile (tempo por função), tracemalloc (alocações) ou ambos"
+                    },
+                    "carga": {
+                        "type": "boolean",
+                        "description": "Perfila as próximas cargas e recargas dos dados"
+                    }
+                }
+            }
         )
     ]
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Executa uma ferramenta específica"""
-    
+    """Executa uma ferramenta específica, registrando latência e tamanho da resposta"""
+    inicio = time.perf_counter()
+    try:
+        conteudos = await _chamar_ferramenta(name, arguments)
+    except BaseException:
+        _metricas.registrar_ferramenta(name, (time.perf_counter() - inicio) * 1000, erro=True)
+        raise
+    _metricas.registrar_ferramenta(name, (time.perf_counter() - inicio) * 1000,
+                                   sum(len(conteudo.text) for conteudo in conteudos))
+    return conteudos
+
+async def _chamar_ferramenta(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    if name == "status_servidor":
+        return [TextContent(type="text", text=status_servidor_tool())]
+    
+    if name == "metricas":
+        return [TextContent(type="text", text=metricas_tool())]
+    
+    if name == "perfilamento":
+        return [TextContent(type="text", text=perfilamento_tool(
+            arguments.get("amostragem"), arguments.get("limiar_ms"),
+            arguments.get("modo"), arguments.get("carga")
+        ))]
+    
+    try:
+        formato = formato_resposta(arguments.get("formato"))
+    except ValueError as e:
+        return [TextContent(type="text", text=str(e))]
+    
+    try:
+        if name == "recarregar_dados":
+            resultado = await recarregar_dados(bool(arguments.get("forcar", False)))
+            return [TextContent(type="text", text=json.dumps(resultado, ensure_ascii=False, indent=2))]
+        # Referência fixa para toda a chamada: uma recarga concluída no meio dela
+        # não muda os dados que esta requisição enxerga
+        associador = await aguardar_associador()
+    except CargaFalhou as e:
+        return [TextContent(type="text", text=f"Dados indisponíveis: {e}")]
+    
+    # Requisições idênticas em andamento (mesma ferramenta, argumentos e
+    # versão dos dados) compartilham uma única execução
+    chave = (name, _versao(associador), formato,
+             json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str))
+    return await _voos_requisicoes.executar(
+        chave, lambda: _executar_no_pool(name, arguments, associador, formato)
+    )
+
+async def _executar_no_pool(name: str, arguments: Dict[str, Any], associador, formato: str) -> List[TextContent]:
+    """Executa o corpo da ferramenta no pool do executor, fora do event loop"""
+    funcao = _executar_ferramenta
+    if _perfilador is not None and _perfilador.selecionar():
+        funcao = _perfilador.envolver(name, arguments, _executar_ferramenta)
+    try:
+        return await _executor.executar(name, funcao, name, arguments, associador, formato)
+    except TempoEsgotado as e:
+        return [TextContent(type="text", text=f"Tempo limite excedido: {e}")]
+    except ExecucaoCancelada as e:
+        return [TextContent(type="text", text=f"Chamada cancelada: {e}")]
+
+def _executar_ferramenta(name: str, arguments: Dict[str, Any], associador, formato: str) -> List[TextContent]:
+    """Corpo síncrono das ferramentas de consulta (executado no pool do executor)"""
     if name == "buscar_municipio":
-        resultado = buscar_municipio_tool(arguments.get("nome_municipio"))
-        return [TextContent(type="text", text=resultado)]
+        nome_municipio = arguments.get("nome_municipio")
+        if not nome_municipio:
+            return [TextContent(type="text", text="Nome do município é obrigatório")]
+        busca = _buscar_com_cache(associador, nome_municipio)
+        return _conteudos(busca, texto_busca, formato)
     
     elif name == "classificar_validador":
-        resultado = classificar_validador_tool(
-            arguments.get("nome_municipio"),
-            arguments.get("nome_validador")
-        )
+        nome_municipio = arguments.get("nome_municipio")
+        nome_validador = arguments.get("nome_validador")
+        if not nome_municipio or not nome_validador:
+            return [TextContent(type="text", text="Nome do município e validador são obrigatórios")]
+        classificacao = _classificar_com_cache(associador, nome_municipio, nome_validador)
+        return _conteudos(classificacao, texto_classificacao, formato)
+    
+    elif name == "buscar_municipios_lote":
+        resultado = buscar_municipios_lote_tool(arguments.get("municipios"), associador, formato)
         return [TextContent(type="text", text=resultado)]
     
+    elif name == "classificar_validadores_lote":
+        resultado = classificar_validadores_lote_tool(arguments.get("pares"), associador, formato)
+        return [TextContent(type="text", text=resultado)]
+    
+    elif name == "participacao_validadores":
+        respostas = participacao_validadores_tool(arguments.get("estado"), associador, formato)
+        return [TextContent(type="text", text=resposta) for resposta in respostas]
+    
     elif name == "listar_validadores":
-        resultado = listar_validadores_tool(arguments.get("filtro_estado"))
+        filtro_estado = (arguments.get("filtro_estado") or "").strip().upper() or None
+        resultado = _cache_resultados.obter(
+            ('listar_validadores', _versao(associador), filtro_estado),
+            lambda: listar_validadores_tool(filtro_estado, associador)
+        )
         return [TextContent(type="text", text=resultado)]
     
     else:
         return [TextContent(type="text", text=f"Ferramenta '{name}' não encontrada")]
 
-def buscar_municipio_tool(nome_municipio: str) -> str:
+def _conteudos(resultado, renderizar_texto, formato: str) -> List[TextContent]:
+    """Conteúdo da resposta: texto, JSON compacto ou os dois (texto primeiro)"""
+    conteudos = []
+    if formato != FORMATO_JSON:
+        conteudos.append(TextContent(type="text", text=renderizar_texto(resultado)))
+    if formato != FORMATO_TEXTO:
+        conteudos.append(TextContent(type="text", text=json_compacto(resultado)))
+    return conteudos
+
+def buscar_municipio_tool(nome_municipio: str, associador=None) -> str:
     """Busca validadores de um município"""
     if not nome_municipio:
         return "Nome do município é obrigatório"
     
-    associador = get_associador()
-    
-    # Busca o município
-    municipios_encontrados = []
-    municipios_parciais = []
-    nome_busca = remover_acentos(nome_municipio.upper().strip())
-    
-    # Busca exata primeiro
-    for registro in associador.resultados:
-        nome_registro = remover_acentos(registro['descricao'].upper().strip())
-        
-        if nome_busca == nome_registro:
-            municipios_encontrados.append(registro)
-        elif nome_busca in nome_registro:
-            municipios_parciais.append(registro)
-    
-    # Se não encontrou exata, usa parciais
-    if not municipios_encontrados and municipios_parciais:
-        municipios_encontrados = municipios_parciais
-    
-    if not municipios_encontrados:
-        # Sugere similares
-        similares = []
-        palavras_busca = nome_busca.split()
-        
-        for registro in associador.resultados:
-            nome_registro = remover_acentos(registro['descricao'].upper())
-            for palavra in palavras_busca:
-                if len(palavra) >= 3 and palavra in nome_registro:
-                    if registro not in similares:
-                        similares.append(registro)
-                        break
-        
-        # Remove duplicatas
-        municipios_unicos = {}
-        for s in similares:
-            chave = f"{s['descricao']} ({s['cod_estado']})"
-            municipios_unicos[chave] = s
-        
-        resultado = f"Município '{nome_municipio}' não encontrado!\n\n"
-        resultado += "Municípios similares:\n"
-        for nome in sorted(municipios_unicos.keys())[:20]:
-            resultado += f"  - {nome}\n"
-        
-        return resultado
-    
-    # Remove duplicatas
-    municipios_unicos = {}
-    for m in municipios_encontrados:
-        chave = (m['cod_estado'], m['cod_municipio'], m['cod_validador'])
-        municipios_unicos[chave] = m
-    
-    municipios_encontrados = list(municipios_unicos.values())
-    
-    # Separa por município
-    municipios_por_codigo = {}
-    for registro in municipios_encontrados:
-        chave = (registro['cod_estado'], registro['cod_municipio'])
-        if chave not in municipios_por_codigo:
-            municipios_por_codigo[chave] = {
-                'info': {
-                    'estado': registro['cod_estado'],
-                    'codigo': registro['cod_municipio'],
-                    'nome': registro['descricao']
-                },
-                'validadores': []
-            }
-        if registro['cod_validador']:
-            municipios_por_codigo[chave]['validadores'].append(registro)
-    
-    # Formata resultado
-    resultado = ""
-    for chave, dados in municipios_por_codigo.items():
-        info = dados['info']
-        validadores = dados['validadores']
-        
-        resultado += f"\nMUNICÍPIO: {info['nome']} - {info['estado']} (Código: {info['codigo']})\n"
-        resultado += "=" * 80 + "\n\n"
-        
-        if not validadores:
-            resultado += "❌ Este município NÃO possui validadores cadastrados.\n"
-        else:
-            resultado += "📋 VALIDADORES DO MUNICÍPIO:\n\n"
-            resultado += f"{'VALIDADOR':25} | {'DESCRIÇÃO':35} | {'DT INICIAL':10} | {'DT VALID':10} | {'STATUS':10}\n"
-            resultado += "-" * 100 + "\n"
-            
-            for v in validadores:
-                data_inicial = v.get('data_inicial', '')
-                
-                # Verifica status
-                if not v['valid_validador']:
-                    situacao = "ATIVO"
-                else:
-                    try:
-                        dia, mes, ano = v['valid_validador'].split('/')
-                        data_valid = datetime(int(ano), int(mes), int(dia))
-                        if data_valid < datetime.now():
-                            situacao = "EXPIRADO"
-                        else:
-                            situacao = "ATIVO"
-                    except:
-                        situacao = "ATIVO"
-                
-                status = f"{v['valid_final']}-{situacao}"
-                
-                resultado += f"{v['cod_validador'][:25]:25} | "
-                resultado += f"{v['desc_validador'][:35]:35} | "
-                resultado += f"{data_inicial:^10} | "
-                resultado += f"{v['valid_validador']:^10} | "
-                resultado += f"{status:10}\n"
-    
-    return resultado
+    associador = associador or get_associador()
+    return texto_busca(consultas_municipios.buscar_municipio(associador, nome_municipio))
 
-def classificar_validador_tool(nome_municipio: str, nome_validador: str) -> str:
+def classificar_validador_tool(nome_municipio: str, nome_validador: str, associador=None) -> str:
     """Classifica um validador para um município"""
     if not nome_municipio or not nome_validador:
         return "Nome do município e validador são obrigatórios"
     
-    # Primeiro busca o município
-    resultado_busca = buscar_municipio_tool(nome_municipio)
-    
-    if "não encontrado" in resultado_busca:
-        return resultado_busca
-    
-    associador = get_associador()
-    
-    # Busca o município novamente para classificar
-    municipios_encontrados = []
-    nome_busca = remover_acentos(nome_municipio.upper().strip())
-    
-    for registro in associador.resultados:
-        nome_registro = remover_acentos(registro['descricao'].upper().strip())
-        if nome_busca == nome_registro or nome_busca in nome_registro:
-            municipios_encontrados.append(registro)
-    
-    if not municipios_encontrados:
-        return f"Município '{nome_municipio}' não encontrado"
-    
-    # Verifica se o validador existe no sistema
-    validador_existe_geral = False
-    for municipio_validadores in associador.validadores.values():
-        for v in municipio_validadores:
-            if (nome_validador.upper() in v['cod_validador'].upper() or 
-                nome_validador.upper() in v['desc_validador'].upper()):
-                validador_existe_geral = True
-                break
-        if validador_existe_geral:
-            break
-    
-    resultado = resultado_busca + "\n\n"
-    resultado += f"📋 CLASSIFICAÇÃO DO VALIDADOR '{nome_validador}':\n\n"
-    
-    if not validador_existe_geral:
-        resultado += "✅ NOVO VALIDADOR\n"
-        resultado += "→ Este validador não existe no sistema\n"
-    else:
-        # Verifica se o município usa este validador
-        validador_existe_municipio = False
-        validador_atual = None
-        
-        for registro in municipios_encontrados:
-            if registro['cod_validador']:
-                if (nome_validador.upper() in registro['cod_validador'].upper() or 
-                    nome_validador.upper() in registro['desc_validador'].upper()):
-                    validador_existe_municipio = True
-                    
-                # Identifica o validador atual
-                if registro['valid_final'] == 'S' and not registro['valid_validador']:
-                    validador_atual = registro
-        
-        if not validador_existe_municipio:
-            resultado += "↔️ MIGRAÇÃO DE VALIDADOR\n"
-            resultado += f"→ O validador existe no sistema mas nunca foi usado por {municipios_encontrados[0]['descricao']}\n"
-        elif validador_atual and (nome_validador.upper() in validador_atual['cod_validador'].upper() or 
-                                 nome_validador.upper() in validador_atual['desc_validador'].upper()):
-            resultado += "🔄 ALTERAÇÃO DE REGRAS\n"
-            resultado += f"→ {municipios_encontrados[0]['descricao']} já usa este validador atualmente\n"
-        else:
-            resultado += "↔️ MIGRAÇÃO DE VALIDADOR\n"
-            resultado += f"→ {municipios_encontrados[0]['descricao']} já usou este validador, mas não é o atual\n"
-            if validador_atual:
-                resultado += f"→ Mudança de '{validador_atual['desc_validador']}' para '{nome_validador}'\n"
-    
-    return resultado
+    # A busca e a classificação usam a mesma versão dos dados
+    associador = associador or get_associador()
+    return texto_classificacao(
+        consultas_municipios.classificar_validador(associador, nome_municipio, nome_validador)
+    )
+
+def _itens_lote(itens, nome_parametro: str):
+    """Valida a lista de itens de uma chamada em lote (erro do lote inteiro)"""
+    if not isinstance(itens, list):
+        raise ValueError(f"'{nome_parametro}' deve ser uma lista")
+    if len(itens) > LIMITE_ITENS_LOTE:
+        raise ValueError(f"'{nome_parametro}' aceita no máximo {LIMITE_ITENS_LOTE} itens (recebidos {len(itens)})")
+    return itens
+
+def _resposta_lote(itens: list, formato: str) -> str:
+    """JSON de resposta das ferramentas em lote (compacto no formato json)"""
+    resposta = {
+        'total': len(itens),
+        'erros': sum(1 for item in itens if 'erro' in item),
+        'itens': itens,
+    }
+    if formato == FORMATO_JSON:
+        return json_compacto(resposta)
+    return json.dumps(resposta, ensure_ascii=False, indent=2)
+
+def _preencher_item(item: dict, resultado, texto, formato: str):
+    """Coloca no item do lote o texto (resultado) e/ou os dados estruturados"""
+    if formato != FORMATO_JSON:
+        item['resultado'] = texto() if callable(texto) else texto
+    if formato != FORMATO_TEXTO:
+        item['dados'] = como_dict(resultado)
 
-def listar_validadores_tool(filtro_estado: Optional[str] = None) -> str:
+def buscar_municipios_lote_tool(municipios: List[str], associador=None, formato: str = FORMATO_TEXTO) -> str:
+    """Busca validadores de vários municípios em uma única passada
+    
+    Cada nome distinto é resolvido uma única vez nos índices; um item inválido
+    gera um erro apenas nele, sem interromper o lote.
+    
+    Returns:
+        JSON com total, erros e a lista de itens (indice, nome_municipio,
+        encontrado e resultado/dados, ou erro)
+    """
+    try:
+        municipios = _itens_lote(municipios, 'municipios')
+    except ValueError as e:
+        return json.dumps({'erro': str(e)}, ensure_ascii=False)
+    
+    associador = associador or get_associador()
+    dia = consultas_municipios.hoje()
+    buscas = {}
+    itens = []
+    for indice, nome_municipio in enumerate(municipios):
+        verificar_cancelamento()
+        item = {'indice': indice, 'nome_municipio': nome_municipio}
+        try:
+            if not isinstance(nome_municipio, str) or not nome_municipio.strip():
+                raise ValueError("Nome do município é obrigatório")
+            if nome_municipio not in buscas:
+                busca = _buscar_com_cache(associador, nome_municipio, dia)
+                buscas[nome_municipio] = (busca, texto_busca(busca) if formato != FORMATO_JSON else None)
+            busca, texto = buscas[nome_municipio]
+            item['encontrado'] = busca.encontrado
+            _preencher_item(item, busca, texto, formato)
+        except Exception as e:
+            item['erro'] = str(e)
+        itens.append(item)
+    return _resposta_lote(itens, formato)
+
+def classificar_validadores_lote_tool(pares: List[Dict[str, str]], associador=None,
+                                      formato: str = FORMATO_TEXTO) -> str:
+    """Classifica vários pares município/validador em uma única passada
+    
+    Cada par é um {"nome_municipio", "nome_validador"}. A busca de cada
+    município distinto (e o seu relatório em texto) é feita uma única vez e
+    compartilhada pelos pares.
+    
+    Returns:
+        JSON com total, erros e a lista de itens (indice, nome_municipio,
+        nome_validador e resultado/dados, ou erro)
+    """
+    try:
+        pares = _itens_lote(pares, 'pares')
+    except ValueError as e:
+        return json.dumps({'erro': str(e)}, ensure_ascii=False)
+    
+    associador = associador or get_associador()
+    dia = consultas_municipios.hoje()
+    buscas = {}
+    itens = []
+    for indice, par in enumerate(pares):
+        verificar_cancelamento()
+        item = {'indice': indice}
+        try:
+            if not isinstance(par, dict):
+                raise ValueError("Par inválido: use {nome_municipio, nome_validador}")
+            nome_municipio, nome_validador = par.get('nome_municipio'), par.get('nome_validador')
+            item.update(nome_municipio=nome_municipio, nome_validador=nome_validador)
+            if not isinstance(nome_municipio, str) or not isinstance(nome_validador, str) \
+                    or not nome_municipio.strip() or not nome_validador.strip():
+                raise ValueError("Nome do município e validador são obrigatórios")
+            
+            if nome_municipio not in buscas:
+                busca = _buscar_com_cache(associador, nome_municipio, dia)
+                buscas[nome_municipio] = (busca, texto_busca(busca) if formato != FORMATO_JSON else None)
+            busca, texto = buscas[nome_municipio]
+            classificacao = _classificar_com_cache(associador, nome_municipio, nome_validador, busca, dia)
+            item['encontrado'] = busca.encontrado
+            _preencher_item(item, classificacao, lambda: texto_classificacao(classificacao, texto), formato)
+        except Exception as e:
+            item['erro'] = str(e)
+        itens.append(item)
+    return _resposta_lote(itens, formato)
+
+def listar_validadores_tool(filtro_estado: Optional[str] = None, associador=None) -> str:
     """Lista todos os validadores únicos do sistema"""
-    associador = get_associador()
+    associador = associador or get_associador()
     
-    validadores_unicos = {}
-    
-    for estado_municipio, validadores in associador.validadores.items():
-        estado = estado_municipio[0]
-        
-        # Aplica filtro de estado se fornecido
-        if filtro_estado and estado != filtro_estado.upper():
-            continue
-            
-        for v in validadores:
-            chave = v['cod_validador']
-            if chave not in validadores_unicos:
-                validadores_unicos[chave] = {
-                    'codigo': v['cod_validador'],
-                    'descricao': v['desc_validador'],
-                    'estados': set(),
-                    'municipios': 0
-                }
-            validadores_unicos[chave]['estados'].add(estado)
-            validadores_unicos[chave]['municipios'] += 1
+    # Totais pré-calculados na carga, já ordenados por quantidade
+    filtro_estado = filtro_estado.strip().upper() if filtro_estado else None
+    linhas = associador.resumo_validadores.listagem(filtro_estado or None)
     
     # Formata resultado
     resultado = "VALIDADORES CADASTRADOS NO SISTEMA\n"
     if filtro_estado:
-        resultado += f"Filtrado por estado: {filtro_estado.upper()}\n"
+        resultado += f"Filtrado por estado: {filtro_estado}\n"
     resultado += "=" * 80 + "\n\n"
     
     resultado += f"{'CÓDIGO':25} | {'DESCRIÇÃO':35} | {'ESTADOS':10} | {'MUNICÍPIOS':10}\n"
     resultado += "-" * 85 + "\n"
     
-    for v in sorted(validadores_unicos.values(), key=lambda x: x['municipios'], reverse=True):
-        estados_str = ','.join(sorted(v['estados']))[:10]
-        resultado += f"{v['codigo'][:25]:25} | "
-        resultado += f"{v['descricao'][:35]:35} | "
+    for codigo, descricao, estados, municipios in linhas:
+        estados_str = ','.join(estados)[:10]
+        resultado += f"{codigo[:25]:25} | "
+        resultado += f"{descricao[:35]:35} | "
         resultado += f"{estados_str:10} | "
-        resultado += f"{v['municipios']:10}\n"
+        resultado += f"{municipios:10}\n"
     
-    resultado += f"\nTotal de validadores únicos: {len(validadores_unicos)}\n"
+    resultado += f"\nTotal de validadores únicos: {len(linhas)}\n"
     
     return resultado
 
+def participacao_validadores_tool(estado: Optional[str] = None, associador=None,
+                                  formato: str = FORMATO_TEXTO) -> List[str]:
+    """Participação de cada validador entre os municípios de uma UF (ou de todas)
+    
+    Usa os totais pré-calculados na carga (ResumoValidadores).
+    
+    Returns:
+        Lista com o texto e/ou o JSON da resposta, conforme o formato
+    """
+    associador = associador or get_associador()
+    resumo = associador.resumo_validadores
+    
+    if estado and estado.strip():
+        estado = estado.strip().upper()
+        participacao = resumo.participacao_estado(estado)
+        if participacao is None:
+            return [f"Estado '{estado}' não encontrado"]
+        estados = [participacao]
+    else:
+        estados = list(resumo.participacao.values())
+    
+    respostas = []
+    if formato != FORMATO_JSON:
+        respostas.append(texto_participacao(estados))
+    if formato != FORMATO_TEXTO:
+        respostas.append(json_compacto(estados))
+    return respostas
+
+def status_servidor_tool() -> str:
+    """Retorna em JSON a fase e os tempos da carga dos dados"""
+    status = dict(_estado_carga)
+    associador = _associador_cache or _associador_em_carga
+    if associador is not None:
+        status['fase_carga'] = associador.fase_carga
+        status['tempos_fases_ms'] = dict(associador.tempos_carga)
+    if _associador_cache is not None:
+        status['versao_dados'] = _associador_cache.versao_dados
+        status['municipios'] = len(_associador_cache.municipios)
+        status['registros'] = len(_associador_cache.resultados)
+        status['linhas_invalidas'] = _associador_cache.total_erros_carga
+        status['dataset_mapeado'] = _associador_cache.dataset_mapeado
+        vencimento = _associador_cache.proximo_vencimento(consultas_municipios.hoje())
+        status['proximo_vencimento'] = date.fromordinal(vencimento).isoformat() if vencimento else None
+    status['recarga'] = dict(_estado_recarga, intervalo_verificacao_s=INTERVALO_RECARGA)
+    status['cache'] = _cache_resultados.estatisticas()
+    status['executor'] = _executor.estatisticas()
+    status['coalescencia'] = {
+        'requisicoes_executadas': _voos_requisicoes.execucoes,
+        'requisicoes_coalescidas': _voos_requisicoes.coalescidas,
+        'requisicoes_em_andamento': len(_voos_requisicoes),
+        'calculos_coalescidos': _cache_resultados.estatisticas()['coalescidas'],
+        'recargas_coalescidas': _voos_recarga.coalescidas,
+        'cargas_coalescidas': _cargas_coalescidas,
+    }
+    status['pronto'] = _associador_cache is not None and status['fase'] == 'pronto'
+    return json.dumps(status, ensure_ascii=False, indent=2)
+
+def metricas_tool() -> str:
+    """Retorna em JSON as métricas do processo (ver src/metricas.py)"""
+    return json.dumps(_coletar_metricas(), ensure_ascii=False, indent=2)
+
+def _coletar_metricas() -> Dict[str, Any]:
+    """Instantâneo das métricas com o cache, o executor e o índice dos dados em uso"""
+    associador = _associador_cache
+    return _metricas.instantaneo({
+        'indices_ms': associador.tempos_carga.get('indices') if associador is not None else None,
+        'cache': _cache_resultados.estatisticas(),
+        'executor': _executor.estatisticas(),
+    })
+
+def perfilamento_tool(amostragem: Optional[int] = None, limiar_ms: Optional[float] = None,
+                      modo: Optional[str] = None, carga: Optional[bool] = None) -> str:
+    """Ajusta os parâmetros informados do perfilamento e retorna a configuração em JSON
+    
+    O diretório dos perfis só é definido pelo ambiente (MCP_MUNICIPIOS_PERFIL_DIR):
+    sem ele o perfilamento fica desligado e não pode ser ligado por aqui.
+    """
+    if _perfilador is None:
+        return "Perfilamento desligado: defina MCP_MUNICIPIOS_PERFIL_DIR para habilitá-lo"
+    if modo is not None and modo not in MODOS_PERFIL:
+        return f"Modo de perfilamento inválido: '{modo}'. Use: {', '.join(MODOS_PERFIL)}"
+    # Todos os parâmetros são validados antes de alterar a configuração
+    try:
+        if amostragem is not None:
+            amostragem = max(0, int(amostragem))
+        if limiar_ms is not None:
+            limiar_ms = max(0.0, float(limiar_ms))
+    except (TypeError, ValueError):
+        return "Parâmetros inválidos: 'amostragem' deve ser inteiro e 'limiar_ms' numérico"
+    if carga is not None and not isinstance(carga, bool):
+        return "Parâmetro inválido: 'carga' deve ser true ou false"
+    if amostragem is not None:
+        _perfilador.amostragem = amostragem
+    if limiar_ms is not None:
+        _perfilador.limiar_ms = limiar_ms
+    if modo is not None:
+        _perfilador.modo = modo
+    if carga is not None:
+        _perfilador.carga = carga
+    return json.dumps(_perfilador.estado(), ensure_ascii=False, indent=2)
+
+def iniciar_tarefas() -> List["asyncio.Task"]:
+    """Inicia as tarefas de segundo plano configuradas: verificação dos arquivos e gravação das métricas"""
+    tarefas = []
+    if INTERVALO_RECARGA > 0:
+        tarefas.append(asyncio.create_task(monitorar_fontes(
+            MonitorFontes([ARQUIVO_MUNICIPIOS, ARQUIVO_VALIDADORES]),
+            INTERVALO_RECARGA,
+            lambda: recarregar_dados(motivo='arquivos alterados')
+        )))
+    if ARQUIVO_METRICAS and INTERVALO_METRICAS > 0:
+        tarefas.append(asyncio.create_task(gravar_periodicamente(
+            ARQUIVO_METRICAS, INTERVALO_METRICAS, _coletar_metricas)))
+    return tarefas
+
+async def encerrar_tarefas(tarefas: List["asyncio.Task"]):
+    """Cancela as tarefas de segundo plano e aguarda o término (a das métricas grava um último instantâneo)"""
+    for tarefa in tarefas:
+        tarefa.cancel()
+    await asyncio.gather(*tarefas, return_exceptions=True)
+
 def main():
     """Função principal para executar o servidor MCP"""
-    import asyncio
     from mcp.server.stdio import stdio_server
     
     async def run():
         async with stdio_server() as (read_stream, write_stream):
-            await app.run(read_stream, write_stream)
+            if AQUECER_NA_PARTIDA:
+                iniciar_carga()
+            tarefas = iniciar_tarefas()
+            try:
+                await app.run(read_stream, write_stream, app.create_initialization_options())
+            finally:
+                await encerrar_tarefas(tarefas)
+                _executor.encerrar()
     
     asyncio.run(run())
 
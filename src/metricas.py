@@ -0,0 +1,186 @@
+"""
+Métricas do servidor: tempos das fases da carga, latência e tamanho das respostas por ferramenta
+
+Os valores vão para histogramas de faixas fixas (contadores inteiros), então
+registrar uma chamada custa uma busca binária e alguns incrementos, sem
+guardar as amostras: as métricas podem ficar sempre ligadas. Os percentis
+são estimados pelo limite superior da faixa em que caem.
+
+As taxas de acerto do cache e os contadores do executor não são duplicados
+aqui: são lidos das próprias estruturas no momento do instantâneo.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+# Limites superiores das faixas de latência (ms) e de tamanho das respostas (caracteres)
+FAIXAS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+             1000, 2500, 5000, 10000, 30000, 60000)
+FAIXAS_TAMANHO = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Ferramentas distintas acompanhadas; nomes além desse limite (ex.: chamadas
+# de ferramentas inexistentes) são somados em OUTRAS
+LIMITE_FERRAMENTAS = 64
+OUTRAS = '(outras)'
+
+
+class Histograma:
+    """Contagem de valores por faixa, com soma, mínimo e máximo"""
+    
+    def __init__(self, faixas=FAIXAS_MS):
+        self.faixas = faixas
+        self.contagens = [0] * (len(faixas) + 1)  # a última faixa não tem limite
+        self.total = 0
+        self.soma = 0.0
+        self.minimo = None
+        self.maximo = None
+    
+    def registrar(self, valor: float):
+        self.contagens[bisect_left(self.faixas, valor)] += 1
+        self.total += 1
+        self.soma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+    
+    def percentil(self, p: float):
+        """Limite superior da faixa que contém o percentil `p` (0 a 1), limitado ao máximo"""
+        if not self.total:
+            return None
+        alvo = p * self.total
+        acumulado = 0
+        for faixa, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if contagem and acumulado >= alvo:
+                return min(self.faixas[faixa], self.maximo) if faixa < len(self.faixas) else self.maximo
+        return self.maximo
+    
+    @staticmethod
+    def _arredondado(valor):
+        return round(valor, 3) if valor is not None else None
+    
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            'contagem': self.total,
+            'media': round(self.soma / self.total, 3) if self.total else None,
+            'minimo': self._arredondado(self.minimo),
+            'maximo': self._arredondado(self.maximo),
+            'p50': self._arredondado(self.percentil(0.50)),
+            'p95': self._arredondado(self.percentil(0.95)),
+            'p99': self._arredondado(self.percentil(0.99)),
+            'faixas': {
+                (f"<={self.faixas[i]:g}" if i < len(self.faixas) else f">{self.faixas[-1]:g}"): contagem
+                for i, contagem in enumerate(self.contagens) if contagem
+            },
+        }
+
+
+class MetricasFerramenta:
+    """Latência, tamanho das respostas e erros das chamadas de uma ferramenta"""
+    
+    def __init__(self):
+        self.latencia_ms = Histograma(FAIXAS_MS)
+        self.tamanho_caracteres = Histograma(FAIXAS_TAMANHO)
+        self.erros = 0
+    
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            'chamadas': self.latencia_ms.total,
+            'erros': self.erros,
+            'latencia_ms': self.latencia_ms.resumo(),
+            'tamanho_caracteres': self.tamanho_caracteres.resumo(),
+        }
+
+
+class Metricas:
+    """Registro das métricas de um processo do servidor (seguro entre threads)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.iniciado_em = time.time()
+        self.ferramentas = {}  # nome -> MetricasFerramenta
+        self.fases_carga = {}  # fase -> Histograma (ms), somando cargas e recargas
+        self.cargas = {}  # tipo (carga, recarga) -> Histograma da duração total (ms)
+        self.ultima_carga = None
+    
+    def registrar_ferramenta(self, nome: str, duracao_ms: float, tamanho: int = 0, erro: bool = False):
+        """Registra uma chamada de ferramenta (tamanho da resposta em caracteres)"""
+        with self._lock:
+            ferramenta = self.ferramentas.get(nome)
+            if ferramenta is None:
+                if len(self.ferramentas) >= LIMITE_FERRAMENTAS:
+                    nome = OUTRAS
+                ferramenta = self.ferramentas.setdefault(nome, MetricasFerramenta())
+            ferramenta.latencia_ms.registrar(duracao_ms)
+            if erro:
+                ferramenta.erros += 1
+            else:
+                ferramenta.tamanho_caracteres.registrar(tamanho)
+    
+    def registrar_carga(self, tipo: str, duracao_ms: float, fases_ms: Dict[str, float], sucesso: bool = True):
+        """Registra uma carga (ou recarga) dos dados com a duração de cada fase"""
+        with self._lock:
+            self.cargas.setdefault(tipo, Histograma(FAIXAS_MS)).registrar(duracao_ms)
+            for fase, duracao in fases_ms.items():
+                self.fases_carga.setdefault(fase, Histograma(FAIXAS_MS)).registrar(duracao)
+            self.ultima_carga = {
+                'tipo': tipo,
+                'em': datetime.now().isoformat(timespec='seconds'),
+                'sucesso': sucesso,
+                'duracao_ms': round(duracao_ms, 3),
+                'fases_ms': dict(fases_ms),
+            }
+    
+    def instantaneo(self, extras: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Estado atual das métricas (JSON serializável), com `extras` de outras estruturas"""
+        with self._lock:
+            dados = {
+                'processo': os.getpid(),
+                'gerado_em': datetime.now().isoformat(timespec='seconds'),
+                'ativo_ha_s': round(time.time() - self.iniciado_em, 3),
+                'carga': {
+                    'ultima': self.ultima_carga,
+                    'duracao_ms': {tipo: h.resumo() for tipo, h in self.cargas.items()},
+                    'fases_ms': {fase: h.resumo() for fase, h in self.fases_carga.items()},
+                },
+                'ferramentas': {nome: m.resumo() for nome, m in sorted(self.ferramentas.items())},
+            }
+        dados.update(extras or {})
+        return dados
+
+
+def anexar_jsonl(caminho: str, dados: Dict[str, Any]):
+    """Acrescenta `dados` como uma linha JSON ao arquivo (uma escrita por linha)"""
+    linha = json.dumps(dados, ensure_ascii=False, separators=(',', ':')) + '\n'
+    with open(caminho, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(linha)
+
+
+async def gravar_periodicamente(caminho: str, intervalo: float,
+                                coletar: Callable[[], Dict[str, Any]]) -> None:
+    """Acrescenta `coletar()` ao arquivo JSONL a cada `intervalo` segundos
+    
+    Erros de gravação não interrompem o servidor: a tentativa seguinte grava
+    normalmente. Ao ser cancelada, grava um último instantâneo.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            await asyncio.sleep(intervalo)
+            try:
+                await loop.run_in_executor(None, anexar_jsonl, caminho, coletar())
+            except OSError:
+                pass
+    except asyncio.CancelledError:
+        try:
+            anexar_jsonl(caminho, coletar())
+        except OSError:
+            pass
+        raise
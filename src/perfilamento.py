@@ -0,0 +1,197 @@
+"""
+Perfilamento opcional das requisições e da carga dos dados (cProfile e tracemalloc)
+
+Desligado, o servidor não cria o Perfilador e o custo é apenas o teste de
+`None` antes de cada chamada. Ligado (MCP_MUNICIPIOS_PERFIL_DIR), as
+requisições são escolhidas por amostragem (uma a cada N) e/ou por limiar de
+latência. Um limiar só pode ser conferido depois da execução, então, com
+limiar e sem amostragem, todas as requisições são perfiladas e só as lentas
+são gravadas.
+
+Cada perfil gera, no diretório configurado:
+    - <prefixo>.prof: estatísticas do cProfile (pstats, snakeviz etc.)
+    - <prefixo>.json: ferramenta, argumentos, duração, funções com maior
+      tempo acumulado e maiores alocações (tracemalloc)
+
+O tracemalloc é global no processo e o cProfile ocupa a thread: um perfil
+por vez; requisições escolhidas enquanto outra é perfilada rodam sem perfil
+(contadas em `ignoradas`).
+
+cProfile, pstats e tracemalloc só são importados quando um perfil é feito.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+MODO_CPROFILE = 'cprofile'
+MODO_TRACEMALLOC = 'tracemalloc'
+MODO_AMBOS = 'ambos'
+MODOS = (MODO_CPROFILE, MODO_TRACEMALLOC, MODO_AMBOS)
+
+# Quantidade de funções e alocações listadas no .json de cada perfil
+LIMITE_FUNCOES = 30
+LIMITE_ALOCACOES = 20
+QUADROS_TRACEMALLOC = 10
+
+
+class Perfilador:
+    """Escolhe as requisições a perfilar, executa com cProfile/tracemalloc e grava os perfis"""
+    
+    def __init__(self, diretorio: str, amostragem: int = 0, limiar_ms: float = 0,
+                 modo: str = MODO_CPROFILE, carga: bool = False):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de perfilamento inválido: '{modo}'. Use: {', '.join(MODOS)}")
+        self.diretorio = Path(diretorio)
+        self.amostragem = amostragem
+        self.limiar_ms = limiar_ms
+        self.modo = modo
+        self.carga = carga
+        self.requisicoes = 0
+        self.perfiladas = 0
+        self.gravadas = 0
+        self.ignoradas = 0
+        self.ultimo_perfil = None
+        self._sequencia = 0
+        self._lock = threading.Lock()
+    
+    def selecionar(self) -> bool:
+        """Indica se a próxima requisição deve ser perfilada (chamada no event loop)"""
+        self.requisicoes += 1
+        if self.amostragem > 0:
+            return self.requisicoes % self.amostragem == 0
+        return self.limiar_ms > 0
+    
+    def envolver(self, nome: str, argumentos: Dict[str, Any], funcao: Callable) -> Callable:
+        """`funcao` executada com perfil (gravado se atingir o limiar)"""
+        def executar(*args, **kwargs):
+            return self.perfilar(nome, argumentos, funcao, *args, **kwargs)
+        return executar
+    
+    def perfilar(self, nome: str, argumentos: Dict[str, Any], funcao: Callable, *args,
+                 forcar: bool = False, **kwargs):
+        """Executa `funcao` com cProfile/tracemalloc; grava o perfil se `forcar` ou acima do limiar"""
+        if not self._lock.acquire(blocking=False):
+            self.ignoradas += 1
+            return funcao(*args, **kwargs)
+        import cProfile
+        import tracemalloc
+        try:
+            self.perfiladas += 1
+            perfil = cProfile.Profile() if self.modo != MODO_TRACEMALLOC else None
+            rastrear = self.modo != MODO_CPROFILE and not tracemalloc.is_tracing()
+            if rastrear:
+                tracemalloc.start(QUADROS_TRACEMALLOC)
+            inicio = time.perf_counter()
+            if perfil is not None:
+                perfil.enable()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                if perfil is not None:
+                    perfil.disable()
+                duracao_ms = (time.perf_counter() - inicio) * 1000
+                memoria = None
+                if rastrear:
+                    memoria = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+                if forcar or duracao_ms >= self.limiar_ms:
+                    self._gravar(nome, argumentos, duracao_ms, perfil, memoria)
+        finally:
+            self._lock.release()
+    
+    def _gravar(self, nome: str, argumentos, duracao_ms: float, perfil, memoria):
+        """Grava o .prof e o .json do perfil; falhas de gravação não afetam a requisição"""
+        self._sequencia += 1
+        prefixo = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{self._sequencia:05d}-" \
+                  f"{re.sub(r'[^A-Za-z0-9_]+', '_', nome)}"
+        dados = {
+            'ferramenta': nome,
+            'argumentos': argumentos,
+            'duracao_ms': round(duracao_ms, 3),
+            'gerado_em': datetime.now().isoformat(timespec='seconds'),
+            'processo': os.getpid(),
+            'modo': self.modo,
+        }
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            if perfil is not None:
+                perfil.dump_stats(str(self.diretorio / f"{prefixo}.prof"))
+                dados['arquivo_prof'] = f"{prefixo}.prof"
+                dados['funcoes'] = _funcoes_mais_lentas(perfil)
+            if memoria is not None:
+                snapshot, pico = memoria
+                dados['pico_memoria_kib'] = round(pico / 1024, 1)
+                dados['alocacoes'] = _maiores_alocacoes(snapshot)
+            caminho = self.diretorio / f"{prefixo}.json"
+            caminho.write_text(json.dumps(dados, ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+        except OSError:
+            return
+        self.gravadas += 1
+        self.ultimo_perfil = str(caminho)
+    
+    def estado(self) -> Dict[str, Any]:
+        """Configuração e contadores (reportados pela ferramenta perfilamento)"""
+        return {
+            'diretorio': str(self.diretorio),
+            'amostragem': self.amostragem,
+            'limiar_ms': self.limiar_ms,
+            'modo': self.modo,
+            'carga': self.carga,
+            'requisicoes': self.requisicoes,
+            'perfiladas': self.perfiladas,
+            'gravadas': self.gravadas,
+            'ignoradas': self.ignoradas,
+            'ultimo_perfil': self.ultimo_perfil,
+        }
+
+
+def _funcoes_mais_lentas(perfil) -> list:
+    """Funções com maior tempo acumulado (cProfile): chamadas, tempo próprio e acumulado (ms)"""
+    import io
+    import pstats
+    estatisticas = pstats.Stats(perfil, stream=io.StringIO()).stats
+    maiores = sorted(estatisticas.items(), key=lambda item: item[1][3], reverse=True)[:LIMITE_FUNCOES]
+    return [
+        {
+            'funcao': f"{arquivo}:{linha}({funcao})",
+            'chamadas': chamadas,
+            'tempo_proprio_ms': round(proprio * 1000, 3),
+            'tempo_acumulado_ms': round(acumulado * 1000, 3),
+        }
+        for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in maiores
+    ]
+
+
+def _maiores_alocacoes(snapshot) -> list:
+    """Linhas com mais memória alocada e ainda viva ao fim da execução (snapshot do tracemalloc)"""
+    import tracemalloc
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, __file__)])
+    return [
+        {
+            'origem': str(estatistica.traceback[0]),
+            'tamanho_kib': round(estatistica.size / 1024, 1),
+            'blocos': estatistica.count,
+        }
+        for estatistica in snapshot.statistics('lineno')[:LIMITE_ALOCACOES]
+    ]
+
+
+def perfilador_do_ambiente(ambiente=os.environ) -> Optional[Perfilador]:
+    """Perfilador configurado pelas variáveis MCP_MUNICIPIOS_PERFIL_*, ou None (desligado)"""
+    diretorio = ambiente.get("MCP_MUNICIPIOS_PERFIL_DIR")
+    if not diretorio:
+        return None
+    return Perfilador(
+        diretorio,
+        amostragem=int(ambiente.get("MCP_MUNICIPIOS_PERFIL_AMOSTRAGEM", "0")),
+        limiar_ms=float(ambiente.get("MCP_MUNICIPIOS_PERFIL_LIMIAR_MS", "0")),
+        modo=ambiente.get("MCP_MUNICIPIOS_PERFIL_MODO", MODO_CPROFILE),
+        carga=ambiente.get("MCP_MUNICIPIOS_PERFIL_CARGA", "0") != "0",
+    )
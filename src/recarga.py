@@ -0,0 +1,53 @@
+"""
+Detecção de alterações nos arquivos de dados (PresetFiles) para recarga a quente
+"""
+
+import asyncio
+import os
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
+
+
+class MonitorFontes:
+    """Detecta alterações nos arquivos fonte comparando tamanho e mtime
+    
+    Uma alteração só é confirmada quando a nova assinatura se repete em duas
+    verificações seguidas, para não recarregar um arquivo ainda em cópia.
+    """
+    
+    def __init__(self, arquivos: Iterable):
+        self.arquivos = [str(arquivo) for arquivo in arquivos]
+        self.assinatura = self.assinatura_atual()
+        self._pendente = None
+    
+    def assinatura_atual(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """(tamanho, mtime_ns) de cada arquivo, ou None se o arquivo não existe"""
+        assinatura = []
+        for arquivo in self.arquivos:
+            try:
+                info = os.stat(arquivo)
+                assinatura.append((info.st_size, info.st_mtime_ns))
+            except OSError:
+                assinatura.append(None)
+        return tuple(assinatura)
+    
+    def verificar(self) -> bool:
+        """Retorna True quando uma alteração estável foi detectada"""
+        atual = self.assinatura_atual()
+        if atual == self.assinatura:
+            self._pendente = None
+            return False
+        if None in atual or atual != self._pendente:
+            self._pendente = atual
+            return False
+        self.assinatura = atual
+        self._pendente = None
+        return True
+
+
+async def monitorar_fontes(monitor: MonitorFontes, intervalo: float,
+                           ao_alterar: Callable[[], Awaitable]) -> None:
+    """Verifica os arquivos a cada `intervalo` segundos e chama `ao_alterar` nas mudanças"""
+    while True:
+        await asyncio.sleep(intervalo)
+        if monitor.verificar():
+            await ao_alterar()
@@ -0,0 +1,110 @@
+"""
+Apresentação dos resultados das consultas (consultas_municipios) nas ferramentas MCP
+
+Cada ferramenta pode responder em texto (tabelas para leitura humana), em
+JSON compacto (para agentes) ou nos dois formatos.
+"""
+
+import json
+
+from consultas_municipios import ALTERACAO_REGRAS, NOVO_VALIDADOR, como_dict
+
+FORMATO_TEXTO = 'texto'
+FORMATO_JSON = 'json'
+FORMATO_AMBOS = 'ambos'
+FORMATOS = (FORMATO_TEXTO, FORMATO_JSON, FORMATO_AMBOS)
+
+
+def formato_resposta(valor) -> str:
+    """Formato pedido pelo argumento `formato` (texto quando ausente)"""
+    if valor is None or valor == '':
+        return FORMATO_TEXTO
+    formato = valor.lower() if isinstance(valor, str) else None
+    if formato not in FORMATOS:
+        raise ValueError(f"formato inválido: {valor!r} (use {', '.join(FORMATOS)})")
+    return formato
+
+
+def json_compacto(resultado) -> str:
+    """JSON sem espaços de um resultado (namedtuples, dicts ou listas)"""
+    return json.dumps(como_dict(resultado), ensure_ascii=False, separators=(',', ':'))
+
+
+def texto_busca(busca) -> str:
+    """Relatório em texto de um ResultadoBusca"""
+    if not busca.encontrado:
+        resultado = f"Município '{busca.consulta}' não encontrado!\n\n"
+        resultado += "Municípios similares:\n"
+        for sugestao in busca.sugestoes:
+            resultado += f"  - {sugestao.nome} ({sugestao.estado})\n"
+        return resultado
+    
+    resultado = ""
+    for municipio in busca.municipios:
+        resultado += f"\nMUNICÍPIO: {municipio.nome} - {municipio.estado} (Código: {municipio.codigo})\n"
+        resultado += "=" * 80 + "\n\n"
+        
+        if not municipio.validadores:
+            resultado += "❌ Este município NÃO possui validadores cadastrados.\n"
+            continue
+        
+        resultado += "📋 VALIDADORES DO MUNICÍPIO:\n\n"
+        resultado += f"{'VALIDADOR':25} | {'DESCRIÇÃO':35} | {'DT INICIAL':10} | {'DT VALID':10} | {'STATUS':10}\n"
+        resultado += "-" * 100 + "\n"
+        
+        for v in municipio.validadores:
+            status = f"{v.indicador}-{v.situacao}"
+            resultado += f"{v.codigo[:25]:25} | "
+            resultado += f"{v.descricao[:35]:35} | "
+            resultado += f"{v.data_inicial:^10} | "
+            resultado += f"{v.data_validade:^10} | "
+            resultado += f"{status:10}\n"
+    
+    return resultado
+
+
+def texto_classificacao(classificacao, texto_da_busca: str = None) -> str:
+    """Relatório em texto de uma Classificacao (precedido do relatório da busca)"""
+    resultado = texto_da_busca if texto_da_busca is not None else texto_busca(classificacao.busca)
+    if classificacao.tipo is None:
+        return resultado
+    
+    municipio = classificacao.municipio
+    resultado += "\n\n"
+    resultado += f"📋 CLASSIFICAÇÃO DO VALIDADOR '{classificacao.validador}':\n\n"
+    
+    if classificacao.tipo == NOVO_VALIDADOR:
+        resultado += "✅ NOVO VALIDADOR\n"
+        resultado += "→ Este validador não existe no sistema\n"
+    elif classificacao.tipo == ALTERACAO_REGRAS:
+        resultado += "🔄 ALTERAÇÃO DE REGRAS\n"
+        resultado += f"→ {municipio} já usa este validador atualmente\n"
+    elif not classificacao.usado_pelo_municipio:
+        resultado += "↔️ MIGRAÇÃO DE VALIDADOR\n"
+        resultado += f"→ O validador existe no sistema mas nunca foi usado por {municipio}\n"
+    else:
+        resultado += "↔️ MIGRAÇÃO DE VALIDADOR\n"
+        resultado += f"→ {municipio} já usou este validador, mas não é o atual\n"
+        if classificacao.validador_atual:
+            resultado += f"→ Mudança de '{classificacao.validador_atual.descricao}' para '{classificacao.validador}'\n"
+    
+    return resultado
+
+
+def texto_participacao(estados: list) -> str:
+    """Tabela em texto da participação dos validadores por UF (ResumoValidadores.participacao)"""
+    resultado = "PARTICIPAÇÃO DOS VALIDADORES POR ESTADO\n"
+    resultado += "=" * 80 + "\n"
+    
+    for participacao in estados:
+        resultado += f"\nESTADO: {participacao['estado']} - {participacao['municipios']} municípios, "
+        resultado += f"{participacao['municipios_com_validador']} com validador\n"
+        resultado += f"{'CÓDIGO':25} | {'DESCRIÇÃO':35} | {'MUNICÍPIOS':10} | {'PARTICIPAÇÃO':12}\n"
+        resultado += "-" * 90 + "\n"
+        for uso in participacao['validadores']:
+            resultado += f"{uso['codigo'][:25]:25} | "
+            resultado += f"{uso['descricao'][:35]:35} | "
+            resultado += f"{uso['municipios']:10} | "
+            resultado += f"{uso['participacao']:12.2%}\n"
+    
+    return resultado
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Transporte de rede do servidor MCP: HTTP (streamable HTTP e SSE) com vários processos
+
+Serve as mesmas ferramentas de src.mcp_server para vários agentes ao mesmo
+tempo, em um único serviço por máquina. As requisições são distribuídas entre
+N processos trabalhadores do uvicorn, que escutam o mesmo socket.
+
+Os processos não leem os PresetFiles: antes de iniciá-los, o processo
+principal publica os dados já indexados em um dataset mapeado em memória
+(dataset_mapeado) no diretório de cache, e cada trabalhador apenas anexa
+esse arquivo somente leitura, sem copiar os dados: as páginas são
+compartilhadas entre os processos pelo sistema operacional.
+
+No streamable HTTP o servidor é "stateless": cada requisição é independente
+e pode ser atendida por qualquer processo. O transporte SSE antigo mantém a
+sessão na memória de um processo e só é oferecido com um único processo.
+
+No encerramento (SIGINT/SIGTERM) o servidor para de aceitar conexões,
+aguarda as requisições em andamento (até MCP_MUNICIPIOS_TEMPO_DRENAGEM
+segundos) e as execuções das ferramentas ainda no pool de threads.
+
+Uso:
+    MCP_MUNICIPIOS_PROCESSOS=4 python -m src.servidor_http
+
+Endpoints:
+    /mcp        streamable HTTP (POST de mensagens JSON-RPC)
+    /sse        transporte SSE (apenas com 1 processo), mensagens em /messages/
+    /saude      status do processo que atendeu (JSON de status_servidor)
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Os módulos do projeto são importados a partir da raiz: executar este arquivo
+# diretamente (python src/servidor_http.py) não os encontra
+if __name__ == "__main__" and not __package__:
+    sys.exit("Execute a partir da raiz do projeto como módulo: python -m src.servidor_http")
+
+from src import mcp_server
+
+# Configuração do serviço
+HOST = os.environ.get("MCP_MUNICIPIOS_HTTP_HOST", "127.0.0.1")
+PORTA = int(os.environ.get("MCP_MUNICIPIOS_HTTP_PORTA", "8000"))
+PROCESSOS = max(1, int(os.environ.get("MCP_MUNICIPIOS_PROCESSOS", "1")))
+
+# Segundos para as requisições em andamento terminarem no encerramento
+TEMPO_DRENAGEM = float(os.environ.get("MCP_MUNICIPIOS_TEMPO_DRENAGEM", "30"))
+
+# Respostas do streamable HTTP em JSON puro ("0" = stream SSE por requisição)
+RESPOSTA_JSON = os.environ.get("MCP_MUNICIPIOS_HTTP_RESPOSTA_JSON", "1") != "0"
+
+
+class _AppStreamableHTTP:
+    """Aplicação ASGI que entrega as requisições de /mcp ao gerenciador de sessões"""
+    
+    def __init__(self, gerenciador):
+        self.gerenciador = gerenciador
+    
+    async def __call__(self, scope, receive, send):
+        await self.gerenciador.handle_request(scope, receive, send)
+
+
+async def _aguardar_execucoes(prazo: float):
+    """Aguarda as execuções das ferramentas ainda ocupando o pool (até `prazo` segundos)"""
+    limite = time.monotonic() + prazo
+    while mcp_server._executor.em_andamento and time.monotonic() < limite:
+        await asyncio.sleep(0.05)
+
+
+def criar_app():
+    """Aplicação ASGI de um processo trabalhador (fábrica chamada pelo uvicorn)"""
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Mount, Route
+    
+    gerenciador = StreamableHTTPSessionManager(
+        app=mcp_server.app, json_response=RESPOSTA_JSON, stateless=True
+    )
+    
+    async def saude(request):
+        status = json.loads(mcp_server.status_servidor_tool())
+        status['processo'] = os.getpid()
+        return JSONResponse(status, status_code=200 if status['pronto'] else 503)
+    
+    rotas = [
+        Route("/mcp", endpoint=_AppStreamableHTTP(gerenciador), methods=["GET", "POST", "DELETE"]),
+        Route("/saude", endpoint=saude, methods=["GET"]),
+    ]
+    
+    if PROCESSOS == 1:
+        from mcp.server.sse import SseServerTransport
+        
+        sse = SseServerTransport("/messages/")
+        
+        async def conectar_sse(request):
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (leitura, escrita):
+                await mcp_server.app.run(leitura, escrita, mcp_server.app.create_initialization_options())
+            return Response()
+        
+        rotas.append(Route("/sse", endpoint=conectar_sse, methods=["GET"]))
+        rotas.append(Mount("/messages/", app=sse.handle_post_message))
+    
+    @contextlib.asynccontextmanager
+    async def ciclo_de_vida(_app):
+        async with gerenciador.run():
+            if mcp_server.AQUECER_NA_PARTIDA:
+                mcp_server.iniciar_carga()
+            tarefas = mcp_server.iniciar_tarefas()
+            try:
+                yield
+            finally:
+                # O uvicorn já drenou as conexões; restam execuções abandonadas no pool
+                await _aguardar_execucoes(TEMPO_DRENAGEM)
+                await mcp_server.encerrar_tarefas(tarefas)
+                mcp_server._executor.encerrar()
+    
+    return Starlette(routes=rotas, lifespan=ciclo_de_vida)
+
+
+def preparar_dados(diretorio: str) -> bool:
+    """Publica (ou valida) no diretório os dados que os processos trabalhadores vão anexar"""
+    associador = mcp_server._criar_associador()
+    return associador.carregar_dados(diretorio, mapeado=mcp_server.DADOS_MAPEADOS)
+
+
+def main():
+    """Inicia o serviço HTTP com PROCESSOS processos trabalhadores"""
+    import uvicorn
+    
+    diretorio_temporario = None
+    if PROCESSOS > 1:
+        # Os trabalhadores herdam pelo ambiente o diretório e o uso do dataset
+        # mapeado (padrão com vários processos; MCP_MUNICIPIOS_DADOS_MAPEADOS=0
+        # volta para um snapshot restaurado em cada processo)
+        diretorio = mcp_server.DIRETORIO_CACHE
+        if not diretorio:
+            # Em /dev/shm (quando existe) o dataset fica em memória compartilhada
+            memoria = "/dev/shm" if os.path.isdir("/dev/shm") else None
+            diretorio = diretorio_temporario = tempfile.mkdtemp(prefix="mcp-municipios-", dir=memoria)
+            os.environ["MCP_MUNICIPIOS_CACHE_DIR"] = diretorio
+        os.environ.setdefault("MCP_MUNICIPIOS_DADOS_MAPEADOS", "1")
+        mcp_server.DADOS_MAPEADOS = os.environ["MCP_MUNICIPIOS_DADOS_MAPEADOS"] != "0"
+        if not preparar_dados(diretorio):
+            print("Falha ao ler os arquivos de dados", file=sys.stderr)
+            sys.exit(1)
+    
+    try:
+        uvicorn.run(
+            "src.servidor_http:criar_app",
+            factory=True,
+            host=HOST,
+            port=PORTA,
+            workers=PROCESSOS,
+            timeout_graceful_shutdown=TEMPO_DRENAGEM,
+            log_level=os.environ.get("MCP_MUNICIPIOS_HTTP_LOG", "warning"),
+        )
+    finally:
+        if diretorio_temporario:
+            shutil.rmtree(diretorio_temporario, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Leitura genérica das tabelas TFIX/TACES a partir do esquema em tfixes.xml
+
+O arquivo tfixes.xml descreve cada tabela (nome, colunas, tipos e colunas
+chave). Só as tabelas usadas são compiladas, uma vez por processo: a leitura
+do XML para na tabela pedida e o seu decodificador de linhas resolve a
+posição de cada coluna no arquivo texto e a conversão do tipo (NUMBER ->
+int/float, DATE -> date, CHAR e VARCHAR2 -> str) antes da leitura, e não a
+cada linha.
+
+Exemplo:
+    catalogo = CatalogoTabelas()
+    tfix105 = catalogo.tabela('TFIX105')   # lido no primeiro acesso
+    for registro in tfix105:
+        print(registro.cod_validador, registro.valid_validador)
+    
+    # busca pelas colunas chave do esquema (cod_municipio, cod_estado)
+    municipio = catalogo.tabela('TACES06').buscar(24402, 'SP')   # Jacareí
+"""
+
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+DIRETORIO_PADRAO = Path(__file__).parent / "PresetFiles"
+ARQUIVO_ESQUEMA = DIRETORIO_PADRAO / "tfixes.xml"
+
+# Data usada nos arquivos para "sem data"
+DATA_VAZIA = '19000101'
+
+ErroLinha = namedtuple('ErroLinha', ['arquivo', 'numero_linha', 'motivo', 'conteudo'])
+ErroLinha.__doc__ = "Linha inválida encontrada na leitura de um arquivo de dados"
+
+Coluna = namedtuple('Coluna', ['nome', 'tipo', 'chave', 'posicao', 'trim'])
+Coluna.__doc__ = """Coluna de uma tabela do esquema
+
+posicao é o índice do campo no arquivo texto, ou None quando a coluna só
+existe no banco."""
+
+
+def converter_texto(texto: str) -> str:
+    """VARCHAR2: texto sem espaços nas pontas"""
+    return texto.strip()
+
+
+def converter_char(texto: str) -> str:
+    """CHAR: texto sem espaços nas pontas, internado (indicadores se repetem muito)"""
+    return sys.intern(texto.strip())
+
+
+def converter_numero(texto: str):
+    """NUMBER: int, ou float quando há casas decimais; vazio vira None"""
+    texto = texto.strip()
+    if not texto:
+        return None
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto.replace(',', '.'))
+
+
+def converter_data(texto: str):
+    """DATE: YYYYMMDD para date; vazio ou 19000101 vira None"""
+    texto = texto.strip()
+    if not texto or texto == DATA_VAZIA:
+        return None
+    if len(texto) != 8 or not texto.isdigit():
+        raise ValueError(f"data inválida: {texto!r}")
+    return date(int(texto[:4]), int(texto[4:6]), int(texto[6:8]))
+
+
+CONVERSORES = {
+    'VARCHAR2': converter_texto,
+    'CHAR': converter_char,
+    'NUMBER': converter_numero,
+    'DATE': converter_data,
+}
+
+
+class EsquemaTabela:
+    """Esquema de uma tabela do tfixes.xml e seu decodificador de linhas"""
+    
+    def __init__(self, nome: str, nome_banco: str, colunas: list, recuperadas: dict = None):
+        self.nome = nome
+        self.nome_banco = nome_banco
+        self.colunas = colunas
+        self.nomes = tuple(coluna.nome for coluna in colunas)
+        self._registro = None
+        
+        # Colunas chave; uma chave recuperada do banco a partir de outra coluna
+        # (ex.: ident_estado a partir de cod_estado) usa a coluna de origem
+        recuperadas = recuperadas or {}
+        self.nomes_chave = tuple(
+            recuperadas.get(coluna.nome, coluna.nome) if coluna.posicao is None else coluna.nome
+            for coluna in colunas if coluna.chave
+        )
+        self._indices_chave = tuple(self.nomes.index(nome_chave) for nome_chave in self.nomes_chave)
+        self._decodificador = None
+    
+    @property
+    def Registro(self):
+        """Classe (namedtuple) dos registros da tabela, criada no primeiro uso"""
+        if self._registro is None:
+            self._registro = namedtuple(f"Registro{self.nome}", self.nomes, rename=True)
+        return self._registro
+    
+    def __repr__(self):
+        return f"EsquemaTabela({self.nome!r}, colunas={len(self.colunas)}, chave={self.nomes_chave})"
+    
+    def coluna(self, nome: str) -> Coluna:
+        """Coluna pelo nome"""
+        return self.colunas[self.nomes.index(nome)]
+    
+    def posicao(self, nome: str) -> int:
+        """Índice do campo da coluna no arquivo texto"""
+        posicao = self.coluna(nome).posicao
+        if posicao is None:
+            raise KeyError(f"a coluna {nome} de {self.nome} não existe no arquivo texto")
+        return posicao
+    
+    def decodificador(self):
+        """Função que converte a lista de campos de uma linha em um Registro
+        
+        Campos ausentes no fim da linha (e colunas que só existem no banco)
+        viram None. Erros de conversão levantam ValueError com o nome da coluna.
+        """
+        if self._decodificador is None:
+            plano = []
+            for coluna in self.colunas:
+                conversor = CONVERSORES.get(coluna.tipo, converter_texto)
+                if conversor is converter_texto and not coluna.trim:
+                    conversor = str
+                plano.append((coluna.posicao, conversor, coluna.nome))
+            plano = tuple(plano)
+            fabricar = self.Registro._make
+            
+            def decodificar(campos):
+                total = len(campos)
+                valores = []
+                for posicao, conversor, nome in plano:
+                    if posicao is None or posicao >= total:
+                        valores.append(None)
+                        continue
+                    try:
+                        valores.append(conversor(campos[posicao]))
+                    except ValueError as e:
+                        raise ValueError(f"coluna {nome}: {e}") from None
+                return fabricar(valores)
+            
+            self._decodificador = decodificar
+        return self._decodificador
+    
+    def chave(self, registro) -> tuple:
+        """Tupla com os valores das colunas chave de um registro"""
+        return tuple(registro[i] for i in self._indices_chave)
+
+
+def _ler_esquema_tabela(elemento) -> EsquemaTabela:
+    """Monta o EsquemaTabela de um elemento <tabela> do tfixes.xml"""
+    nos = elemento.find('colunas').findall('coluna')
+    
+    # <recuperar coluna="N" ... coluna_ref="M">: a coluna N é preenchida no
+    # banco a partir da coluna M do arquivo
+    recuperadas = {}
+    validacoes = elemento.find('validacoes')
+    if validacoes is not None:
+        for no in validacoes.findall('recuperar'):
+            try:
+                destino, origem = int(no.get('coluna')), int(no.get('coluna_ref'))
+                recuperadas[nos[destino].get('nome')] = nos[origem].get('nome')
+            except (TypeError, ValueError, IndexError):
+                continue
+    
+    # Colunas que só existem no banco ou que são recuperadas no banco não vêm
+    # no arquivo texto; as demais ocupam os campos na ordem do esquema
+    colunas = []
+    posicao = 0
+    for no in nos:
+        nome = no.get('nome')
+        no_txt = no.get('existe_so_no_banco', 'FALSE').upper() != 'TRUE' and nome not in recuperadas
+        colunas.append(Coluna(
+            nome=nome,
+            tipo=(no.get('tipo') or 'VARCHAR2').upper(),
+            chave=no.get('ind_chave', 'FALSE').upper() == 'TRUE',
+            posicao=posicao if no_txt else None,
+            trim=no.get('ind_trim', 'TRUE').upper() != 'FALSE',
+        ))
+        if no_txt:
+            posicao += 1
+    
+    return EsquemaTabela(
+        nome=_nome_tabela(elemento),
+        nome_banco=(elemento.findtext('nome_tabela_banco') or '').strip(),
+        colunas=colunas,
+        recuperadas=recuperadas,
+    )
+
+
+def _nome_tabela(elemento) -> str:
+    return (elemento.findtext('nome_tabela') or '').strip().upper()
+
+
+def _elementos_tabela(caminho_esquema):
+    """Elementos <tabela> do tfixes.xml em streaming (cada um é descartado após o uso)"""
+    with open(caminho_esquema, 'rb') as arquivo:
+        for _, elemento in ET.iterparse(arquivo):
+            if elemento.tag == 'tabela':
+                yield elemento
+                elemento.clear()
+
+
+@lru_cache(maxsize=None)
+def _esquema_tabela(nome: str, caminho_esquema) -> EsquemaTabela:
+    for elemento in _elementos_tabela(caminho_esquema):
+        if _nome_tabela(elemento) == nome:
+            return _ler_esquema_tabela(elemento)
+    raise KeyError(nome)
+
+
+def esquema_tabela(nome: str, caminho_esquema=ARQUIVO_ESQUEMA) -> EsquemaTabela:
+    """Esquema de uma tabela pelo nome (ex.: 'TFIX105'), lido uma vez por processo
+    
+    Só a tabela pedida é compilada; a leitura do XML para ao encontrá-la.
+    """
+    return _esquema_tabela(nome.upper(), caminho_esquema)
+
+
+@lru_cache(maxsize=None)
+def nomes_tabelas(caminho_esquema=ARQUIVO_ESQUEMA) -> frozenset:
+    """Nomes de todas as tabelas do tfixes.xml (sem compilar os esquemas)"""
+    return frozenset(_nome_tabela(elemento) for elemento in _elementos_tabela(caminho_esquema))
+
+
+def carregar_esquemas(caminho_esquema=ARQUIVO_ESQUEMA) -> dict:
+    """{nome da tabela: EsquemaTabela} de todas as tabelas do tfixes.xml"""
+    return {nome: esquema_tabela(nome, caminho_esquema) for nome in nomes_tabelas(caminho_esquema)}
+
+
+def ler_registros(esquema: EsquemaTabela, caminho, ao_erro=None):
+    """Lê um arquivo de tabela em streaming, gerando Registros decodificados
+    
+    Linhas em branco são ignoradas; linhas com valores inválidos são enviadas
+    para `ao_erro` (ErroLinha) e não interrompem a leitura.
+    """
+    decodificar = esquema.decodificador()
+    with open(caminho, 'r', encoding='latin-1', buffering=1 << 20) as arquivo:
+        for numero_linha, linha in enumerate(arquivo, start=1):
+            linha = linha.rstrip('\r\n')
+            if not linha.strip():
+                continue
+            try:
+                yield decodificar(linha.split('\t'))
+            except ValueError as e:
+                if ao_erro:
+                    ao_erro(ErroLinha(str(caminho), numero_linha, str(e), linha))
+
+
+class Tabela:
+    """Conteúdo de uma tabela TFIX/TACES já carregado"""
+    
+    def __init__(self, esquema: EsquemaTabela, arquivo, registros: list, erros: list):
+        self.esquema = esquema
+        self.arquivo = arquivo
+        self.registros = registros
+        self.erros = erros
+        self._por_chave = None
+    
+    def __len__(self):
+        return len(self.registros)
+    
+    def __iter__(self):
+        return iter(self.registros)
+    
+    def __repr__(self):
+        return f"Tabela({self.esquema.nome!r}, registros={len(self.registros)}, erros={len(self.erros)})"
+    
+    @property
+    def por_chave(self) -> dict:
+        """{chave: [registros]} pelas colunas chave do esquema (montado no primeiro uso)"""
+        if self._por_chave is None:
+            indice = {}
+            for registro in self.registros:
+                indice.setdefault(self.esquema.chave(registro), []).append(registro)
+            self._por_chave = indice
+        return self._por_chave
+    
+    def buscar(self, *chave) -> list:
+        """Registros com a chave informada (todos os valores da chave, na ordem do esquema)"""
+        return self.por_chave.get(tuple(chave), [])
+
+
+class CatalogoTabelas:
+    """Acesso único às tabelas TFIX/TACES de um diretório, com carga preguiçosa
+    
+    Cada tabela é lida no primeiro acesso e mantida em cache. O arquivo de uma
+    tabela é o arquivo do diretório com o nome da tabela (sem diferenciar
+    maiúsculas) e extensão .txt.
+    """
+    
+    def __init__(self, diretorio=DIRETORIO_PADRAO, caminho_esquema=ARQUIVO_ESQUEMA):
+        self.diretorio = Path(diretorio)
+        self.caminho_esquema = caminho_esquema
+        self._tabelas = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def esquemas(self) -> dict:
+        return carregar_esquemas(self.caminho_esquema)
+    
+    def arquivo_tabela(self, nome: str):
+        """Caminho do arquivo texto de uma tabela, ou None se não existir"""
+        alvo = f"{nome.upper()}.TXT"
+        for arquivo in self.diretorio.iterdir():
+            if arquivo.name.upper() == alvo:
+                return arquivo
+        return None
+    
+    def tabelas_disponiveis(self) -> list:
+        """Nomes das tabelas do esquema que têm arquivo no diretório"""
+        return sorted(
+            arquivo.stem.upper() for arquivo in self.diretorio.iterdir()
+            if arquivo.suffix.upper() == '.TXT' and arquivo.stem.upper() in nomes_tabelas(self.caminho_esquema)
+        )
+    
+    def tabela(self, nome: str) -> Tabela:
+        """Tabela carregada (lida do arquivo apenas no primeiro acesso)"""
+        nome = nome.upper()
+        tabela = self._tabelas.get(nome)
+        if tabela is None:
+            with self._lock:
+                tabela = self._tabelas.get(nome)
+                if tabela is None:
+                    tabela = self._carregar(nome)
+                    self._tabelas[nome] = tabela
+        return tabela
+    
+    __getitem__ = tabela
+    
+    def _carregar(self, nome: str) -> Tabela:
+        if nome not in nomes_tabelas(self.caminho_esquema):
+            raise KeyError(f"tabela {nome} não existe em {self.caminho_esquema}")
+        esquema = esquema_tabela(nome, self.caminho_esquema)
+        arquivo = self.arquivo_tabela(nome)
+        if arquivo is None:
+            raise FileNotFoundError(f"arquivo da tabela {nome} não encontrado em {self.diretorio}")
+        
+        erros = []
+        registros = list(ler_registros(esquema, arquivo, erros.append))
+        return Tabela(esquema, arquivo, registros, erros)
@@ -82,6 +82,13 @@ def test_mcp_server():
         
         print("✅ Servidor MCP executável")
         
+        # Executado como arquivo, o servidor explica como iniciá-lo
+        direto = subprocess.run([sys.executable, "src/mcp_server.py"], capture_output=True, text=True, timeout=30)
+        if direto.returncode != 0 and "python -m src.mcp_server" in direto.stderr and "Traceback" not in direto.stderr:
+            print("✅ Execução direta do arquivo orienta o uso de 'python -m src.mcp_server'")
+        else:
+            print(f"❌ Execução direta do arquivo: {direto.stderr.strip()[-200:]}")
+        
     except Exception as e:
         print(f"❌ Erro ao executar servidor: {e}")
     
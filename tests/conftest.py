@@ -0,0 +1,66 @@
+"""
+Fixtures compartilhadas: os PresetFiles reais e um conjunto sintético pequeno
+(benchmarks.gerar_presetfiles) para os testes que alteram os arquivos fonte
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from associar_municipios_validadores import AssociadorMunicipiosValidadores
+from benchmarks.gerar_presetfiles import gerar_presetfiles
+
+BASE_DIR = Path(__file__).parent.parent
+ARQUIVO_MUNICIPIOS = BASE_DIR / "PresetFiles" / "TACES06.TXT"
+ARQUIVO_VALIDADORES = BASE_DIR / "PresetFiles" / "TFIX105.txt"
+
+
+def novo_associador(arquivo_municipios, arquivo_validadores):
+    """Associador sem dados, sem imprimir o progresso da carga"""
+    return AssociadorMunicipiosValidadores(str(arquivo_municipios), str(arquivo_validadores),
+                                           ao_progresso=lambda mensagem: None)
+
+
+@pytest.fixture(scope="session")
+def associador():
+    """Associador com os PresetFiles reais carregados (compartilhado, somente leitura)"""
+    associador = novo_associador(ARQUIVO_MUNICIPIOS, ARQUIVO_VALIDADORES)
+    assert associador.carregar_dados()
+    return associador
+
+
+@pytest.fixture(scope="session")
+def _presetfiles_sinteticos(tmp_path_factory):
+    destino = tmp_path_factory.mktemp("sinteticos")
+    gerado = gerar_presetfiles(destino, municipios=300, distribuicao=(0.4, 0.4, 0.15, 0.05), semente=7)
+    return gerado['arquivos']
+
+
+@pytest.fixture
+def presetfiles(tmp_path, _presetfiles_sinteticos):
+    """Cópia própria do teste dos PresetFiles sintéticos: (TACES06, TFIX105)"""
+    copias = []
+    for arquivo in _presetfiles_sinteticos:
+        copia = tmp_path / Path(arquivo).name
+        shutil.copyfile(arquivo, copia)
+        copias.append(copia)
+    return tuple(copias)
+
+
+@pytest.fixture
+def servidor_sintetico(presetfiles, monkeypatch):
+    """Servidor apontando para os PresetFiles sintéticos, sem dados carregados"""
+    from src import mcp_server
+    monkeypatch.setattr(mcp_server, 'ARQUIVO_MUNICIPIOS', presetfiles[0])
+    monkeypatch.setattr(mcp_server, 'ARQUIVO_VALIDADORES', presetfiles[1])
+    monkeypatch.setattr(mcp_server, 'DIRETORIO_CACHE', None)
+    monkeypatch.setattr(mcp_server, 'DADOS_MAPEADOS', False)
+    monkeypatch.setattr(mcp_server, '_relatar_progresso', lambda mensagem: None)
+    monkeypatch.setattr(mcp_server, '_associador_cache', None)
+    monkeypatch.setattr(mcp_server, '_carga_futuro', None)
+    monkeypatch.setattr(mcp_server, '_lock_recarga', None)
+    monkeypatch.setattr(mcp_server, '_estado_carga', dict(mcp_server._estado_carga))
+    monkeypatch.setattr(mcp_server, '_estado_recarga', dict(mcp_server._estado_recarga))
+    monkeypatch.setattr(mcp_server, '_cache_resultados', mcp_server.CacheResultados(100))
+    return presetfiles
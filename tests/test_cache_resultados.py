@@ -0,0 +1,106 @@
+"""Cache de resultados: LRU, validade por versão dos dados, por dia (ordinal) e por TTL"""
+
+import pytest
+
+import consultas_municipios
+from src import mcp_server
+from src.mcp_server import CacheResultados
+
+
+class _Contador:
+    def __init__(self):
+        self.chamadas = 0
+    
+    def __call__(self, valor='valor'):
+        def calcular():
+            self.chamadas += 1
+            return valor
+        return calcular
+
+
+@pytest.fixture
+def dia(monkeypatch):
+    """Dia corrente controlado pelo teste: dia['hoje'] = ordinal"""
+    atual = {'hoje': 738000}
+    monkeypatch.setattr(consultas_municipios, 'hoje', lambda: atual['hoje'])
+    return atual
+
+
+def test_acerto_falha_e_descarte_lru():
+    cache = CacheResultados(tamanho=2)
+    calcular = _Contador()
+    cache.obter('a', calcular('A'))
+    cache.obter('b', calcular('B'))
+    assert cache.obter('a', calcular('outro')) == 'A'  # 'a' passa a ser o mais recente
+    cache.obter('c', calcular('C'))  # descarta 'b'
+    assert cache.obter('b', calcular('B2')) == 'B2'
+    estatisticas = cache.estatisticas()
+    assert (estatisticas['acertos'], estatisticas['falhas'], estatisticas['descartes']) == (1, 4, 2)
+    assert calcular.chamadas == 4
+
+
+def test_entrada_vence_no_dia_informado(dia):
+    cache = CacheResultados(tamanho=10)
+    calcular = _Contador()
+    cache.obter('chave', calcular('antes'), vence_em=738002)
+    dia['hoje'] = 738001
+    assert cache.obter('chave', calcular('depois')) == 'antes'
+    dia['hoje'] = 738002
+    assert cache.obter('chave', calcular('depois')) == 'depois'
+    assert cache.estatisticas()['vencidas'] == 1
+
+
+def test_entrada_sem_vencimento_nao_vence(dia):
+    cache = CacheResultados(tamanho=10)
+    cache.obter('chave', lambda: 'valor')
+    dia['hoje'] += 10000
+    assert cache.obter('chave', lambda: 'outro') == 'valor'
+
+
+def test_ttl(monkeypatch):
+    instante = {'agora': 1000.0}
+    monkeypatch.setattr(mcp_server.time, 'monotonic', lambda: instante['agora'])
+    cache = CacheResultados(tamanho=10, ttl=5)
+    cache.obter('chave', lambda: 'antigo')
+    instante['agora'] += 4
+    assert cache.obter('chave', lambda: 'novo') == 'antigo'
+    instante['agora'] += 2
+    assert cache.obter('chave', lambda: 'novo') == 'novo'
+    assert cache.estatisticas()['expiradas'] == 1
+
+
+def test_limpar_invalida_todas_as_entradas():
+    cache = CacheResultados(tamanho=10)
+    cache.obter('chave', lambda: 'antigo')
+    cache.limpar()
+    assert cache.obter('chave', lambda: 'novo') == 'novo'
+    assert cache.estatisticas()['invalidacoes'] == 1
+
+
+def test_tamanho_zero_desativa_o_cache():
+    cache = CacheResultados(tamanho=0)
+    calcular = _Contador()
+    cache.obter('chave', calcular())
+    cache.obter('chave', calcular())
+    assert calcular.chamadas == 2
+
+
+def test_versao_dos_dados_separa_as_entradas(associador, monkeypatch):
+    monkeypatch.setattr(mcp_server, '_cache_resultados', CacheResultados(tamanho=10))
+    buscas = _Contador()
+    original = consultas_municipios.buscar_municipio
+    
+    def buscar(*args):
+        buscas()()
+        return original(*args)
+    
+    monkeypatch.setattr(consultas_municipios, 'buscar_municipio', buscar)
+    monkeypatch.setattr(associador, 'versao_dados', 'versao-1')
+    mcp_server._buscar_com_cache(associador, "Jacareí")
+    # Nomes equivalentes reaproveitam a entrada; a consulta original é preservada
+    assert mcp_server._buscar_com_cache(associador, "JACAREI").consulta == "JACAREI"
+    assert buscas.chamadas == 1
+    
+    monkeypatch.setattr(associador, 'versao_dados', 'versao-2')
+    mcp_server._buscar_com_cache(associador, "Jacareí")
+    assert buscas.chamadas == 2
@@ -0,0 +1,26 @@
+"""Catálogo de validadores: busca por código ou descrição e mapa reverso para os municípios"""
+
+from indices_busca import CatalogoValidadores
+
+
+def test_catalogo_correspondentes_e_mapa_reverso():
+    catalogo = CatalogoValidadores()
+    ginfes = catalogo.adicionar("GINFES", "Ginfes Nota Fiscal", ("SP", 1))
+    catalogo.adicionar("GINFES", "Ginfes Nota Fiscal", ("RJ", 2))
+    betha = catalogo.adicionar("BETHA", "Betha Sistemas", ("SC", 3))
+    
+    assert catalogo.correspondentes("ginfes") == {ginfes}
+    assert catalogo.correspondentes("nota fiscal") == {ginfes}
+    assert catalogo.correspondentes("SISTEMAS") == {betha}
+    assert catalogo.correspondentes("inexistente") == set()
+    assert catalogo.municipios({ginfes}) == {("SP", 1), ("RJ", 2)}
+    assert catalogo.id_validador({'cod_validador': "BETHA", 'desc_validador': "Betha Sistemas"}) == betha
+
+
+def test_catalogo_real_encontra_municipios_que_usam_o_validador(associador):
+    catalogo = associador.catalogo_validadores
+    correspondentes = catalogo.correspondentes("NOTA CARIOCA")
+    assert correspondentes
+    municipios = catalogo.municipios(correspondentes)
+    assert any(associador.municipios[chave].descricao == "RIO DE JANEIRO"
+               for chave in municipios if chave in associador.municipios)
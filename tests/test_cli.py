@@ -0,0 +1,37 @@
+"""Saída da CLI buscar_municipio_validador"""
+
+import buscar_municipio_validador as cli
+import consultas_municipios as consultas
+from tests.conftest import BASE_DIR
+
+
+def test_migracao_sem_validador_atual_nao_cita_mudanca(monkeypatch, capsys):
+    monkeypatch.chdir(BASE_DIR)
+    cli.buscar_municipio("Rio de Janeiro", "NOTA CARIOCA")
+    saida = capsys.readouterr().out
+    assert "VALIDADOR MAIS ATUAL: Nenhum ativo" in saida
+    assert "MIGRAÇÃO DE VALIDADOR" in saida
+    assert "Mudança de" not in saida and "N/A" not in saida
+
+
+CABECALHOS = {
+    consultas.NOVO_VALIDADOR: "NOVO VALIDADOR",
+    consultas.MIGRACAO: "MIGRAÇÃO DE VALIDADOR",
+    consultas.ALTERACAO_REGRAS: "ALTERAÇÃO DE REGRAS",
+}
+
+
+def test_classificacao_da_cli_igual_a_do_servidor(associador, monkeypatch, capsys):
+    dia = consultas.hoje()
+    codigos = sorted({codigo for codigo, _ in associador.catalogo_validadores.validadores})[:10]
+    for nome in ("Rio de Janeiro", "Jacareí", "Bom Jesus", "Santos"):
+        busca = consultas.buscar_municipio(associador, nome, dia)
+        for validador in codigos + ["Nota Fiscal", "INEXISTENTE"]:
+            cli.buscar_municipio(nome, validador, carregar=lambda: associador)
+            saida = capsys.readouterr().out
+            esperados = [CABECALHOS[consultas.classificar_validador(
+                associador, nome, validador, busca._replace(municipios=[municipio]), dia).tipo]
+                for municipio in busca.municipios]
+            obtidos = [linha.split(maxsplit=1)[1] for linha in saida.splitlines()
+                       if any(cabecalho in linha for cabecalho in CABECALHOS.values())]
+            assert obtidos == esperados, (nome, validador)
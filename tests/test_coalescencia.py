@@ -0,0 +1,220 @@
+"""Coalescência de chamadas idênticas simultâneas (event loop e threads)"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src import mcp_server
+from src.coalescencia import VooUnico, VooUnicoThreads
+from src.executor import ExecucaoCancelada
+
+
+def test_chamadas_da_mesma_chave_compartilham_uma_execucao():
+    voo = VooUnico()
+    chamadas = []
+    
+    async def calcular(valor):
+        chamadas.append(valor)
+        await asyncio.sleep(0.01)
+        return valor * 2
+    
+    async def cenario():
+        resultados = await asyncio.gather(
+            *(voo.executar('a', lambda: calcular(1)) for _ in range(5)),
+            voo.executar('b', lambda: calcular(10)),
+        )
+        assert resultados == [2] * 5 + [20]
+        assert len(voo) == 0
+        # Terminada a execução, a mesma chave roda de novo
+        assert await voo.executar('a', lambda: calcular(3)) == 6
+    
+    asyncio.run(cenario())
+    assert chamadas == [1, 10, 3]
+    assert (voo.execucoes, voo.coalescidas) == (3, 4)
+
+
+def test_excecao_e_entregue_a_todas_as_chamadas():
+    voo = VooUnico()
+    
+    async def falhar():
+        await asyncio.sleep(0.01)
+        raise ValueError("falhou")
+    
+    async def cenario():
+        resultados = await asyncio.gather(*(voo.executar('a', falhar) for _ in range(3)),
+                                          return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in resultados)
+    
+    asyncio.run(cenario())
+    assert voo.execucoes == 1
+
+
+def test_cancelar_quem_iniciou_nao_cancela_as_demais():
+    voo = VooUnico()
+    liberar = None
+    
+    async def calcular():
+        await liberar.wait()
+        return 'ok'
+    
+    async def cenario():
+        nonlocal liberar
+        liberar = asyncio.Event()
+        primeira = asyncio.ensure_future(voo.executar('a', calcular))
+        await asyncio.sleep(0)
+        segunda = asyncio.ensure_future(voo.executar('a', calcular))
+        await asyncio.sleep(0)
+        primeira.cancel()
+        await asyncio.sleep(0)
+        liberar.set()
+        assert await segunda == 'ok'
+        with pytest.raises(asyncio.CancelledError):
+            await primeira
+    
+    asyncio.run(cenario())
+    assert (voo.execucoes, voo.coalescidas) == (1, 1)
+
+
+def test_execucao_e_cancelada_quando_todas_desistem():
+    voo = VooUnico()
+    cancelada = []
+    
+    async def calcular():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelada.append(True)
+            raise
+    
+    async def cenario():
+        tarefas = [asyncio.ensure_future(voo.executar('a', calcular)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert len(voo) == 0
+    
+    asyncio.run(cenario())
+    assert cancelada == [True]
+
+
+def test_threads_compartilham_o_resultado():
+    voo = VooUnicoThreads(intervalo=0.005)
+    iniciou, liberar = threading.Event(), threading.Event()
+    chamadas = []
+    resultados = []
+    
+    def calcular():
+        chamadas.append(1)
+        iniciou.set()
+        liberar.wait(2)
+        return 'valor'
+    
+    lider = threading.Thread(target=lambda: resultados.append(voo.executar('a', calcular)))
+    lider.start()
+    iniciou.wait(2)
+    seguidoras = [threading.Thread(target=lambda: resultados.append(voo.executar('a', calcular)))
+                  for _ in range(3)]
+    for thread in seguidoras:
+        thread.start()
+    while voo.coalescidas < 3:
+        threading.Event().wait(0.001)
+    liberar.set()
+    for thread in [lider] + seguidoras:
+        thread.join(2)
+    
+    assert resultados == ['valor'] * 4
+    assert chamadas == [1]
+    assert (voo.execucoes, voo.coalescidas) == (1, 3)
+
+
+def test_threads_recebem_a_mesma_excecao_e_podem_desistir():
+    desistir = threading.Event()
+    
+    def aguardar():
+        if desistir.is_set():
+            raise TimeoutError("desistiu")
+    
+    voo = VooUnicoThreads(aguardar=aguardar, intervalo=0.005)
+    iniciou, liberar = threading.Event(), threading.Event()
+    erros = []
+    
+    def calcular():
+        iniciou.set()
+        liberar.wait(2)
+        raise ValueError("falhou")
+    
+    def chamar():
+        try:
+            voo.executar('a', calcular)
+        except Exception as e:
+            erros.append(type(e))
+    
+    lider = threading.Thread(target=chamar)
+    lider.start()
+    iniciou.wait(2)
+    seguidora = threading.Thread(target=chamar)
+    seguidora.start()
+    seguidora.join(0.05)
+    desistir.set()
+    seguidora.join(2)
+    assert erros == [TimeoutError]
+    
+    liberar.set()
+    lider.join(2)
+    assert erros == [TimeoutError, ValueError]
+    assert voo.executar('a', lambda: 'de novo') == 'de novo'
+
+
+def test_cancelamento_de_quem_executa_faz_uma_seguidora_repetir():
+    voo = VooUnicoThreads(intervalo=0.005, repetir=(ExecucaoCancelada,))
+    iniciou, liberar = threading.Event(), threading.Event()
+    chamadas = []
+    resultados = []
+    
+    def cancelada():
+        chamadas.append('cancelada')
+        iniciou.set()
+        liberar.wait(2)
+        raise ExecucaoCancelada("tempo limite")
+    
+    def calcular():
+        chamadas.append('calcular')
+        return 'valor'
+    
+    def chamar(calculo):
+        try:
+            resultados.append(voo.executar('a', calculo))
+        except ExecucaoCancelada:
+            resultados.append('cancelada')
+    
+    lider = threading.Thread(target=chamar, args=(cancelada,))
+    lider.start()
+    iniciou.wait(2)
+    seguidora = threading.Thread(target=chamar, args=(calcular,))
+    seguidora.start()
+    while voo.coalescidas < 1:
+        threading.Event().wait(0.001)
+    liberar.set()
+    for thread in (lider, seguidora):
+        thread.join(2)
+    
+    # Só quem executava recebe o cancelamento; a seguidora refaz o cálculo
+    assert sorted(resultados) == ['cancelada', 'valor']
+    assert chamadas == ['cancelada', 'calcular']
+    assert (voo.execucoes, voo.coalescidas, voo.repeticoes) == (2, 1, 1)
+
+def test_recargas_simultaneas_compartilham_uma_execucao(servidor_sintetico, monkeypatch):
+    cargas = []
+    carregar = mcp_server._carregar_dados
+    monkeypatch.setattr(mcp_server, '_carregar_dados', lambda associador: cargas.append(1) or carregar(associador))
+    
+    async def cenario():
+        await mcp_server.aguardar_associador()
+        return await asyncio.gather(*(mcp_server.recarregar_dados(forcar=True) for _ in range(3)))
+    
+    resultados = asyncio.run(cenario())
+    assert len(cargas) == 2  # carga inicial + uma única recarga
+    assert all(resultado is resultados[0] for resultado in resultados)
@@ -0,0 +1,89 @@
+"""Daemon local da CLI: consulta pelo socket, parada e fallback sem socket Unix"""
+
+import socket
+import subprocess
+import sys
+import time
+import types
+
+import pytest
+
+import buscar_municipio_validador as cli
+import daemon_cli
+from tests.conftest import BASE_DIR
+
+
+@pytest.mark.skipif(not daemon_cli.DISPONIVEL, reason="requer socket Unix")
+def test_daemon_responde_e_remove_socket_ao_parar(tmp_path, monkeypatch, capsys):
+    caminho = tmp_path / "daemon.sock"
+    monkeypatch.setenv("MCP_MUNICIPIOS_DAEMON_SOCKET", str(caminho))
+    processo = subprocess.Popen([sys.executable, str(BASE_DIR / "daemon_cli.py"), "--servir"], cwd=BASE_DIR,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        limite = time.monotonic() + 30
+        while not caminho.exists() and time.monotonic() < limite:
+            time.sleep(0.05)
+        monkeypatch.chdir(BASE_DIR)
+        cli.buscar_municipio("Jacareí")
+        direta = capsys.readouterr().out
+        assert daemon_cli.consultar("Jacareí") == direta
+        assert daemon_cli.parar()
+        assert processo.wait(10) == 0
+    finally:
+        processo.kill()
+    assert not caminho.exists()
+    # A trava continua no lugar, pronta para o próximo daemon
+    assert (tmp_path / "daemon.sock.lock").exists()
+
+
+class _Dados:
+    def __init__(self, associador):
+        self.associador = associador
+        self.cargas = 0
+    
+    def carregar(self):
+        self.cargas += 1
+        return self.associador
+
+
+def _atender(linha: bytes, dados):
+    """Resposta do tratador do daemon a uma linha do cliente, e se ele pediu a parada"""
+    cliente, conexao = socket.socketpair()
+    with cliente, conexao:
+        cliente.sendall(linha + b"\n")
+        servidor = types.SimpleNamespace(parar=False, dados=dados)
+        daemon_cli._Tratador(conexao, None, servidor)
+        conexao.shutdown(socket.SHUT_WR)
+        with cliente.makefile('rb') as resposta:
+            return resposta.read(), servidor.parar
+
+
+@pytest.mark.skipif(not daemon_cli.DISPONIVEL, reason="requer socket Unix")
+@pytest.mark.parametrize('linha', [
+    b'nao e json', b'[1, 2]', b'"Jacarei"', b'null', b'{}', b'{"validador": "X"}',
+    b'{"municipio": 1}', b'{"municipio": "Jacarei", "validador": ["X"]}', b'{"comando": "outro"}',
+])
+def test_pedido_em_outro_formato_e_encerrado_sem_resposta(associador, linha):
+    dados = _Dados(associador)
+    assert _atender(linha, dados) == (b"", False)
+    assert dados.cargas == 0
+
+
+@pytest.mark.skipif(not daemon_cli.DISPONIVEL, reason="requer socket Unix")
+def test_tratador_responde_consulta_e_parada(associador):
+    dados = _Dados(associador)
+    resposta, parar = _atender(b'{"municipio": "Jacarei", "validador": null}', dados)
+    assert "JACAREI" in resposta.decode('utf-8') and not parar
+    assert _atender(b'{"comando": "parar"}', dados) == (b"ok", True)
+
+
+def test_sem_socket_unix_a_consulta_roda_no_processo(monkeypatch, capsys):
+    monkeypatch.setattr(daemon_cli, 'DISPONIVEL', False)
+    monkeypatch.chdir(BASE_DIR)
+    assert daemon_cli.consultar("Jacareí") is None
+    assert daemon_cli.parar() is False
+    with pytest.raises(OSError):
+        daemon_cli.servir()
+    
+    cli.consultar("Jacareí", usar_daemon=True)
+    assert "JACAREI" in capsys.readouterr().out
@@ -0,0 +1,149 @@
+"""Dataset mapeado: os dados anexados respondem como os carregados dos arquivos texto"""
+
+import gc
+import json
+import weakref
+
+import pytest
+
+import consultas_municipios as consultas
+import dataset_mapeado
+from dataset_mapeado import DatasetInvalido, anexar_dataset, publicar_dataset
+from tests.conftest import novo_associador
+
+
+@pytest.fixture
+def lido_e_mapeado(presetfiles, tmp_path):
+    lido = novo_associador(*presetfiles)
+    assert lido.carregar_dados()
+    publicar_dataset(lido, tmp_path / "cache")
+    mapeado = novo_associador(*presetfiles)
+    anexar_dataset(mapeado, tmp_path / "cache")
+    return lido, mapeado
+
+
+def test_registros_e_resultados_iguais(lido_e_mapeado):
+    lido, mapeado = lido_e_mapeado
+    assert dict(mapeado.municipios) == dict(lido.municipios)
+    assert list(mapeado.resultados) == list(lido.resultados)
+    for chave in lido.municipios:
+        assert list(mapeado.validadores_por_municipio[chave]) == list(lido.validadores_por_municipio[chave])
+
+
+def test_buscas_e_sugestoes_iguais(lido_e_mapeado):
+    lido, mapeado = lido_e_mapeado
+    dia = consultas.hoje()
+    nomes = [nome for nome, _ in lido.nomes_normalizados]
+    consultas_teste = nomes + [nome[:4] for nome in nomes[:50]] + [nome[1:] + "X" for nome in nomes[:50]]
+    for nome in consultas_teste:
+        assert mapeado.buscar_municipios(nome) == lido.buscar_municipios(nome)
+        assert mapeado.sugerir_municipios(nome) == lido.sugerir_municipios(nome)
+        assert consultas.como_dict(consultas.buscar_municipio(mapeado, nome, dia)) == \
+            consultas.como_dict(consultas.buscar_municipio(lido, nome, dia))
+
+
+def test_classificacoes_validador_atual_e_totais_iguais(lido_e_mapeado):
+    lido, mapeado = lido_e_mapeado
+    dia = consultas.hoje()
+    codigos = sorted({codigo for codigo, _ in lido.catalogo_validadores.validadores})[:15] + ["INEXISTENTE"]
+    for nome, chave in lido.nomes_normalizados[:60]:
+        assert mapeado.validador_atual(chave, dia) == lido.validador_atual(chave, dia)
+        for codigo in codigos:
+            assert consultas.como_dict(consultas.classificar_validador(mapeado, nome, codigo, dia=dia)) == \
+                consultas.como_dict(consultas.classificar_validador(lido, nome, codigo, dia=dia))
+    assert mapeado.proximo_vencimento(dia) == lido.proximo_vencimento(dia)
+    assert mapeado.resumo_validadores.listagem() == lido.resumo_validadores.listagem()
+    assert mapeado.resumo_validadores.participacao == lido.resumo_validadores.participacao
+
+
+def test_dataset_desatualizado_e_recusado(presetfiles, tmp_path):
+    lido = novo_associador(*presetfiles)
+    assert lido.carregar_dados()
+    publicar_dataset(lido, tmp_path / "cache")
+    with open(presetfiles[1], 'ab') as arquivo:
+        arquivo.write(b"\n")
+    with pytest.raises(DatasetInvalido):
+        anexar_dataset(novo_associador(*presetfiles), tmp_path / "cache")
+
+
+def test_carga_mapeada_publica_e_depois_anexa(presetfiles, tmp_path):
+    cache = str(tmp_path / "cache")
+    primeiro = novo_associador(*presetfiles)
+    assert primeiro.carregar_dados(cache, mapeado=True)
+    assert primeiro.dataset_mapeado is None and 'publicacao_dataset' in primeiro.tempos_carga
+    
+    segundo = novo_associador(*presetfiles)
+    assert segundo.carregar_dados(cache, mapeado=True)
+    assert segundo.dataset_mapeado == str(dataset_mapeado.caminho_dataset(cache, [str(a) for a in presetfiles]))
+    assert list(segundo.resultados) == list(primeiro.resultados)
+
+
+def _secao(caminho, nome):
+    """Posição absoluta e tamanho de uma seção no arquivo do dataset"""
+    dados = caminho.read_bytes()
+    _, _, tamanho_cabecalho = dataset_mapeado._PREFIXO.unpack_from(dados, 0)
+    inicio = dataset_mapeado._PREFIXO.size + tamanho_cabecalho
+    cabecalho = json.loads(dados[dataset_mapeado._PREFIXO.size:inicio])
+    deslocamento, tamanho, _ = cabecalho['secoes'][nome]
+    return inicio + deslocamento, tamanho
+
+
+@pytest.mark.parametrize('nome', ['resumo', 'erros'])
+def test_secao_serializada_corrompida_e_recusada(presetfiles, tmp_path, nome):
+    lido = novo_associador(*presetfiles)
+    assert lido.carregar_dados()
+    caminho = publicar_dataset(lido, tmp_path / "cache")
+    posicao, tamanho = _secao(caminho, nome)
+    with open(caminho, 'r+b') as arquivo:
+        arquivo.seek(posicao + tamanho // 2)
+        byte = arquivo.read(1)
+        arquivo.seek(-1, 1)
+        arquivo.write(bytes([byte[0] ^ 0xFF]))
+    
+    mapeado = novo_associador(*presetfiles)
+    with pytest.raises(DatasetInvalido, match=nome):
+        anexar_dataset(mapeado, tmp_path / "cache")
+    assert not mapeado.municipios  # recusado antes de alterar o associador
+    # A carga recorre aos arquivos texto e republica o dataset
+    assert mapeado.carregar_dados(str(tmp_path / "cache"), mapeado=True)
+    assert list(mapeado.resultados) == list(lido.resultados)
+
+
+def test_dataset_truncado_e_recusado_e_desmapeado(presetfiles, tmp_path, monkeypatch):
+    lido = novo_associador(*presetfiles)
+    assert lido.carregar_dados()
+    caminho = publicar_dataset(lido, tmp_path / "cache")
+    with open(caminho, 'r+b') as arquivo:
+        arquivo.truncate(caminho.stat().st_size // 2)
+    
+    mapas = []
+    mmap_original = dataset_mapeado.mmap.mmap
+    monkeypatch.setattr(dataset_mapeado.mmap, 'mmap', lambda *args, **kwargs: mapas.append(
+        mmap_original(*args, **kwargs)) or mapas[-1])
+    with pytest.raises(DatasetInvalido, match="truncado"):
+        anexar_dataset(novo_associador(*presetfiles), tmp_path / "cache")
+    assert len(mapas) == 1 and mapas[0].closed
+
+
+def test_mapeamento_e_liberado_com_o_associador(presetfiles, tmp_path, monkeypatch):
+    lido = novo_associador(*presetfiles)
+    assert lido.carregar_dados()
+    publicar_dataset(lido, tmp_path / "cache")
+    
+    mapas = []
+    mmap_original = dataset_mapeado.mmap.mmap
+    
+    def mapear(*args, **kwargs):
+        mapa = mmap_original(*args, **kwargs)
+        mapas.append(weakref.ref(mapa))
+        return mapa
+    
+    monkeypatch.setattr(dataset_mapeado.mmap, 'mmap', mapear)
+    mapeado = novo_associador(*presetfiles)
+    anexar_dataset(mapeado, tmp_path / "cache")
+    assert mapeado.resumo_validadores.listagem() == lido.resumo_validadores.listagem()
+    assert mapas[0]() is not None
+    
+    del mapeado  # como na troca do associador por uma recarga
+    gc.collect()
+    assert mapas[0]() is None
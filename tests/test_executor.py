@@ -0,0 +1,143 @@
+"""Executor das ferramentas: tempo limite, cancelamento e ocupação das vagas"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.executor import ExecucaoCancelada, ExecutorFerramentas, TempoEsgotado, ler_tempos_limite, \
+    verificar_cancelamento
+
+
+def _trabalho_longo(iniciado: threading.Event, parou: threading.Event, liberar: threading.Event = None):
+    """Laço que respeita o cancelamento; registra em `parou` quando sai"""
+    iniciado.set()
+    try:
+        while not (liberar and liberar.is_set()):
+            verificar_cancelamento()
+            threading.Event().wait(0.005)
+        return 'fim'
+    finally:
+        parou.set()
+
+
+def test_ler_tempos_limite():
+    assert ler_tempos_limite("buscar_municipio=2, listar_validadores=0.5,lixo") == \
+        {'buscar_municipio': 2.0, 'listar_validadores': 0.5}
+    assert ler_tempos_limite("") == {}
+
+
+def test_executa_e_conta_concluidas_e_erros():
+    executor = ExecutorFerramentas(trabalhadores=2)
+    
+    async def cenario():
+        assert await executor.executar('soma', lambda a, b: a + b, 2, 3) == 5
+        with pytest.raises(ZeroDivisionError):
+            await executor.executar('divisao', lambda: 1 / 0)
+    
+    asyncio.run(cenario())
+    estatisticas = executor.estatisticas()
+    assert (estatisticas['concluidas'], estatisticas['erros']) == (1, 1)
+    executor.encerrar()
+
+
+def test_tempo_esgotado_sinaliza_a_execucao_que_para():
+    executor = ExecutorFerramentas(trabalhadores=1, tempos_limite={'lenta': 0.05})
+    iniciado, parou = threading.Event(), threading.Event()
+    
+    async def cenario():
+        with pytest.raises(TempoEsgotado, match="'lenta' excedeu o tempo limite"):
+            await executor.executar('lenta', _trabalho_longo, iniciado, parou)
+    
+    asyncio.run(cenario())
+    assert iniciado.is_set()
+    assert parou.wait(2)
+    assert executor.tempos_esgotados == 1
+    assert executor.tempo_limite_de('outra') == 0
+    executor.encerrar()
+
+
+def test_cancelamento_pelo_cliente_interrompe_a_thread():
+    executor = ExecutorFerramentas(trabalhadores=1)
+    iniciado, parou = threading.Event(), threading.Event()
+    
+    async def cenario():
+        tarefa = asyncio.ensure_future(executor.executar('lenta', _trabalho_longo, iniciado, parou))
+        while not iniciado.is_set():
+            await asyncio.sleep(0.005)
+        tarefa.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarefa
+    
+    asyncio.run(cenario())
+    assert parou.wait(2)
+    assert executor.canceladas == 1
+    executor.encerrar()
+
+
+def test_vaga_fica_ocupada_ate_a_thread_terminar():
+    executor = ExecutorFerramentas(trabalhadores=2, concorrencia=1, tempo_limite=0.05)
+    iniciado, parou, liberar = threading.Event(), threading.Event(), threading.Event()
+    
+    def ignora_cancelamento():
+        iniciado.set()
+        liberar.wait(2)
+        parou.set()
+    
+    async def cenario():
+        with pytest.raises(TempoEsgotado):
+            await executor.executar('teimosa', ignora_cancelamento)
+        assert executor.em_andamento == 1
+        # A única vaga continua ocupada: a próxima chamada esgota o tempo aguardando
+        with pytest.raises(TempoEsgotado, match="aguardou"):
+            await executor.executar('rapida', lambda: 'ok')
+        liberar.set()
+        while executor.em_andamento:
+            await asyncio.sleep(0.005)
+        assert await executor.executar('rapida', lambda: 'ok') == 'ok'
+    
+    asyncio.run(cenario())
+    assert parou.is_set()
+    assert executor.tempos_esgotados == 2
+    executor.encerrar()
+
+
+def test_verificar_cancelamento_fora_do_executor_nao_faz_nada():
+    verificar_cancelamento()
+
+
+def test_execucao_cancelada_dentro_da_funcao_conta_como_cancelada():
+    executor = ExecutorFerramentas()
+    
+    def cancelar():
+        raise ExecucaoCancelada("cancelada")
+    
+    async def cenario():
+        with pytest.raises(ExecucaoCancelada):
+            await executor.executar('lote', cancelar)
+    
+    asyncio.run(cenario())
+    assert executor.canceladas == 1
+    executor.encerrar()
+
+
+def test_encerrar_cancela_as_execucoes_que_aguardam_uma_thread():
+    executor = ExecutorFerramentas(trabalhadores=1, concorrencia=2)
+    iniciado, parou, liberar = threading.Event(), threading.Event(), threading.Event()
+    executadas = []
+    
+    async def cenario():
+        primeira = asyncio.ensure_future(executor.executar('lenta', _trabalho_longo, iniciado, parou, liberar))
+        segunda = asyncio.ensure_future(executor.executar('outra', executadas.append, 'outra'))
+        while not iniciado.is_set():
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.01)
+        executor.encerrar()
+        with pytest.raises(asyncio.CancelledError):
+            await segunda
+        liberar.set()
+        assert await primeira == 'fim'
+    
+    asyncio.run(cenario())
+    assert executadas == []
+    assert executor._futuros == set()
@@ -0,0 +1,10 @@
+"""Fases da carga dos dados registradas em tempos_carga"""
+
+from tests.conftest import novo_associador
+
+
+def test_fases_da_carga_nao_se_sobrepoem(presetfiles):
+    associador = novo_associador(*presetfiles)
+    assert associador.carregar_dados()
+    assert list(associador.tempos_carga) == ['municipios', 'validadores', 'associacao', 'indices']
+    assert associador.indice_nomes and associador.fase_carga == 'pronto'
@@ -0,0 +1,28 @@
+"""Índice de nomes normalizados: busca exata sem acentos, caixa ou espaços"""
+
+
+def _nomes(associador, chaves):
+    return [associador.municipios[chave].descricao for chave in chaves]
+
+
+def test_busca_exata_ignora_acentos_caixa_e_espacos(associador):
+    for nome in ("Jacareí", "JACAREI", "  jacarei "):
+        chaves, exata = associador.buscar_municipios(nome)
+        assert exata
+        assert _nomes(associador, chaves) == ["JACAREI"]
+
+
+def test_busca_exata_retorna_todos_os_homonimos(associador):
+    chaves, exata = associador.buscar_municipios("bom jesus")
+    assert exata
+    assert len(chaves) > 1
+    assert set(_nomes(associador, chaves)) == {"BOM JESUS"}
+
+
+def test_indice_agrupa_os_validadores_sem_duplicatas(associador):
+    for chave, validadores in associador.validadores_por_municipio.items():
+        codigos = [validador.cod_validador for validador in validadores]
+        assert len(codigos) == len(set(codigos))
+        assert all(codigos)
+    for nome, chaves in associador.indice_nomes.items():
+        assert all(chave in associador.municipios for chave in chaves)
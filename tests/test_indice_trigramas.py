@@ -0,0 +1,63 @@
+"""Índice de trigramas: busca parcial por substring e sugestões de municípios parecidos"""
+
+from indices_busca import IndiceTrigramas, trigramas
+
+
+def _indice(*textos):
+    indice = IndiceTrigramas()
+    for texto in textos:
+        indice.adicionar(texto)
+    return indice
+
+
+def _nomes(associador, chaves):
+    return [associador.municipios[chave].descricao for chave in chaves]
+
+
+def test_trigramas():
+    assert trigramas("JACAREI") == {"JAC", "ACA", "CAR", "ARE", "REI"}
+    assert trigramas("AB") == set()
+
+
+def test_buscar_substring_confirma_candidatos_na_ordem_de_insercao():
+    indice = _indice("SAO PAULO", "SAO PAULO DE OLIVENCA", "PAULO AFONSO", "LAPA")
+    assert indice.buscar_substring("PAULO") == [0, 1, 2]
+    # Os trigramas "SAO" e "PAU" aparecem em PAULO AFONSO, mas não a substring
+    assert indice.buscar_substring("SAO PAULO D") == [1]
+    assert indice.buscar_substring("XYZ") == []
+
+
+def test_buscar_substring_curta_verifica_todos_os_textos():
+    indice = _indice("LAPA", "PAULO AFONSO", "SAO PAULO")
+    assert indice.candidatos("PA") is None
+    assert indice.buscar_substring("PA") == [0, 1, 2]
+
+
+def test_similares_ordena_por_sobreposicao_e_desempata_pelo_texto():
+    indice = _indice("JACAREZINHO", "JACAREI", "ITACARE", "CAREIRO", "SANTOS")
+    similares = indice.similares("JACAREY")
+    textos = [indice.textos[i] for i, _ in similares]
+    assert textos[0] == "JACAREI"
+    assert "SANTOS" not in textos
+    pontuacoes = [pontuacao for _, pontuacao in similares]
+    assert pontuacoes == sorted(pontuacoes, reverse=True)
+
+
+def test_similares_inclui_textos_com_palavra_buscada_mesmo_abaixo_do_minimo():
+    indice = _indice("BOM JESUS DO ITABAPOANA", "BOM SUCESSO")
+    ids = [i for i, _ in indice.similares("JESUS", similaridade_minima=0.99)]
+    assert ids == [0]
+
+
+def test_busca_parcial_por_substring(associador):
+    chaves, exata = associador.buscar_municipios("sao jose dos campo")
+    assert not exata
+    assert _nomes(associador, chaves) == ["SAO JOSE DOS CAMPOS"]
+
+
+def test_sugestoes_toleram_erros_de_digitacao(associador):
+    assert associador.buscar_municipios("nova iguassu") == ([], False)
+    sugestoes = _nomes(associador, associador.sugerir_municipios("nova iguassu", 5))
+    assert sugestoes[0] == "NOVA IGUACU"
+    assert _nomes(associador, associador.sugerir_municipios("jacarey", 5))[0] == "JACAREI"
+    assert associador.sugerir_municipios("xyzabc") == []
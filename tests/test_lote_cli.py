@@ -0,0 +1,80 @@
+"""Modo lote da CLI: leitura de CSV/JSONL, linhas malformadas e ordem dos resultados"""
+
+import io
+import json
+
+import lote_cli
+
+
+def _entradas(texto, formato=None):
+    return list(lote_cli.ler_entradas(io.StringIO(texto), formato))
+
+
+def _resultados(associador, texto, **opcoes):
+    return list(lote_cli.executar(associador, _entradas(texto), **opcoes))
+
+
+def test_jsonl_com_linhas_malformadas(associador):
+    texto = "\n".join([
+        '{"nome_municipio": "Jacareí", "nome_validador": "GINFES"}',
+        '{"municipio": "Jacareí"',
+        '["Jacareí", "GINFES"]',
+        '',
+        '{"nome_validador": "GINFES"}',
+        '{"nome_municipio": 42}',
+        '{"nome_municipio": "Jacareí", "nome_validador": 7}',
+        '{"cidade": "Municipio Que Nao Existe"}',
+    ]) + "\n"
+    resultados = _resultados(associador, texto)
+    
+    assert [r['linha'] for r in resultados] == [1, 2, 3, 5, 6, 7, 8]
+    assert resultados[0]['erro'] is None and resultados[0]['municipio'] == "JACAREI"
+    assert resultados[1]['erro'].startswith("JSON inválido")
+    assert resultados[2]['erro'].startswith("Linha inválida")
+    assert resultados[3]['erro'] == "Nome do município é obrigatório"
+    assert resultados[4]['erro'] == "Nome do município é obrigatório"
+    assert resultados[5]['erro'] == "Nome do validador deve ser texto"
+    assert resultados[6]['erro'] is None and resultados[6]['encontrado'] is False
+
+
+def test_csv_com_cabecalho_delimitador_e_linhas_vazias_ou_curtas():
+    texto = "Município;Validador\nJacareí;GINFES\n\n;\nSantos\n"
+    entradas = _entradas(texto)
+    assert [(e['linha'], e['nome_municipio'], e['nome_validador']) for e in entradas] == [
+        (2, "Jacareí", "GINFES"),
+        (5, "Santos", None),
+    ]
+
+
+def test_csv_sem_cabecalho_usa_as_duas_primeiras_colunas():
+    entradas = _entradas("Jacareí,GINFES\nSantos,BETHA\n")
+    assert [(e['nome_municipio'], e['nome_validador']) for e in entradas] == [
+        ("Jacareí", "GINFES"), ("Santos", "BETHA")]
+
+
+def test_formato_detectado_e_entrada_vazia():
+    assert _entradas("\n\n") == []
+    assert _entradas('{"municipio": "Santos"}\n')[0]['nome_municipio'] == "Santos"
+    # Forçando CSV, a linha JSON vira um município sem cabeçalho
+    assert _entradas('{"municipio": "Santos"}\n', lote_cli.FORMATO_CSV)[0]['nome_municipio'] == '{"municipio": "Santos"}'
+
+
+def test_ordem_preservada_em_blocos(associador):
+    nomes = ["Jacareí", "Santos", "Campinas", "Nada Parecido Aqui", "Sorocaba"] * 7
+    texto = "".join(json.dumps({'municipio': nome}) + "\n" for nome in nomes)
+    sequencial = _resultados(associador, texto)
+    em_blocos = _resultados(associador, texto, tamanho_bloco=3)
+    assert em_blocos == sequencial
+    assert [r['linha'] for r in em_blocos] == list(range(1, len(nomes) + 1))
+    assert _resultados(associador, texto, trabalhadores=2, tamanho_bloco=4) == sequencial
+
+
+def test_saida_csv_com_cabecalho_e_listas_em_texto(associador):
+    saida = io.StringIO()
+    gravar = lote_cli.escritor(saida, lote_cli.FORMATO_CSV)
+    for resultado in _resultados(associador, "Jacareí\nNova Iguassu\n"):
+        gravar(resultado)
+    linhas = saida.getvalue().splitlines()
+    assert linhas[0] == ",".join(lote_cli.CAMPOS)
+    assert len(linhas) == 3
+    assert "NOVA IGUACU (RJ)" in linhas[2]
@@ -0,0 +1,94 @@
+"""Ferramentas do servidor MCP chamadas por uma sessão cliente em memória"""
+
+import asyncio
+import json
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src import mcp_server
+from src.perfilamento import Perfilador
+
+
+@pytest.fixture
+def servidor(associador, monkeypatch):
+    """Servidor com os dados reais já carregados"""
+    monkeypatch.setattr(mcp_server, '_associador_cache', associador)
+    monkeypatch.setattr(mcp_server, '_cache_resultados', mcp_server.CacheResultados(100))
+    return mcp_server.app
+
+
+def _chamar(servidor, ferramenta: str, argumentos: dict) -> str:
+    async def cenario():
+        async with create_connected_server_and_client_session(servidor) as sessao:
+            resultado = await sessao.call_tool(ferramenta, argumentos)
+            assert not resultado.isError, resultado.content[0].text
+            return resultado.content[0].text
+    
+    return asyncio.run(cenario())
+
+
+def test_lote_de_municipios_com_item_invalido(servidor):
+    resposta = json.loads(_chamar(servidor, 'buscar_municipios_lote',
+                                  {'municipios': ["Jacareí", 3, "", "Santos"], 'formato': 'json'}))
+    assert (resposta['total'], resposta['erros']) == (4, 2)
+    assert ['erro' in item for item in resposta['itens']] == [False, True, True, False]
+    assert resposta['itens'][1]['erro'] == "Nome do município é obrigatório"
+    assert resposta['itens'][0]['encontrado'] and resposta['itens'][3]['encontrado']
+
+
+def test_lote_de_pares_com_item_invalido(servidor):
+    pares = [
+        {'nome_municipio': "Jacareí", 'nome_validador': "GINFES"},
+        {'nome_municipio': "Santos"},
+        "Jacareí/GINFES",
+        {'nome_municipio': "Santos", 'nome_validador': 5},
+    ]
+    resposta = json.loads(_chamar(servidor, 'classificar_validadores_lote', {'pares': pares, 'formato': 'json'}))
+    assert (resposta['total'], resposta['erros']) == (4, 3)
+    assert 'erro' not in resposta['itens'][0] and resposta['itens'][0]['dados']
+    assert resposta['itens'][1]['erro'] == "Nome do município e validador são obrigatórios"
+    assert resposta['itens'][2]['erro'].startswith("Par inválido")
+    assert resposta['itens'][3]['erro'] == "Nome do município e validador são obrigatórios"
+
+
+@pytest.fixture
+def perfilador(servidor, tmp_path, monkeypatch):
+    perfilador = Perfilador(str(tmp_path))
+    monkeypatch.setattr(mcp_server, '_perfilador', perfilador)
+    return perfilador
+
+
+def test_perfilamento_ignora_argumentos_desconhecidos(servidor, perfilador):
+    estado = json.loads(_chamar(servidor, 'perfilamento', {'amostragem': 5, 'outro': 1}))
+    assert estado['amostragem'] == 5
+
+
+@pytest.mark.parametrize("argumentos", [
+    {'amostragem': "muitas"},
+    {'limiar_ms': [1]},
+    {'amostragem': 3, 'carga': "sim"},
+])
+def test_perfilamento_com_parametro_invalido_nao_altera_a_configuracao(perfilador, argumentos):
+    resposta = mcp_server.perfilamento_tool(**argumentos)
+    assert resposta.startswith("Parâmetro")
+    assert (perfilador.amostragem, perfilador.limiar_ms, perfilador.carga) == (0, 0, False)
+
+
+def test_carga_que_falhou_nao_fica_guardada_e_e_repetida(associador, monkeypatch):
+    monkeypatch.setattr(mcp_server, '_associador_cache', None)
+    monkeypatch.setattr(mcp_server, '_carga_futuro', None)
+    monkeypatch.setattr(mcp_server, '_estado_carga', dict(mcp_server._estado_carga))
+    monkeypatch.setattr(mcp_server, '_cache_resultados', mcp_server.CacheResultados(100))
+    monkeypatch.setattr(mcp_server, '_criar_associador', lambda: associador)
+    resultados_carga = [False, True]
+    monkeypatch.setattr(mcp_server, '_carregar_dados', lambda _: resultados_carga.pop(0))
+    
+    resposta = _chamar(mcp_server.app, 'buscar_municipio', {'nome_municipio': "Jacareí"})
+    assert resposta == "Dados indisponíveis: Falha ao ler os arquivos de dados"
+    assert mcp_server._associador_cache is None and mcp_server._carga_futuro is None
+    assert mcp_server._estado_carga['fase'] == 'erro'
+    
+    assert "JACAREI" in _chamar(mcp_server.app, 'buscar_municipio', {'nome_municipio': "Jacareí"})
+    assert mcp_server._associador_cache is associador
+    assert mcp_server._estado_carga['fase'] == 'pronto'
@@ -0,0 +1,117 @@
+"""Métricas do servidor: histogramas de faixas fixas, registro por ferramenta e gravação JSONL"""
+
+import asyncio
+import json
+
+from src import metricas
+from src.metricas import FAIXAS_TAMANHO, Histograma, Metricas, gravar_periodicamente
+
+
+def test_histograma_conta_por_faixa_e_estima_percentis():
+    histograma = Histograma(faixas=(1, 10, 100))
+    for valor in (0.5, 2, 3, 50, 500):
+        histograma.registrar(valor)
+    resumo = histograma.resumo()
+    assert resumo['contagem'] == 5
+    assert (resumo['minimo'], resumo['maximo'], resumo['media']) == (0.5, 500, 111.1)
+    assert resumo['faixas'] == {'<=1': 1, '<=10': 2, '<=100': 1, '>100': 1}
+    # Limite superior da faixa do percentil; na última faixa, o máximo
+    assert (resumo['p50'], resumo['p95']) == (10, 500)
+    
+    vazio = Histograma().resumo()
+    assert vazio['contagem'] == 0 and vazio['p50'] is None and vazio['faixas'] == {}
+
+
+def test_percentil_nao_passa_do_maximo():
+    histograma = Histograma(faixas=(1, 10, 100))
+    histograma.registrar(12)
+    assert histograma.percentil(0.99) == 12
+
+
+def test_ferramentas_registram_latencia_tamanho_e_erros():
+    registro = Metricas()
+    registro.registrar_ferramenta('buscar_municipio', 2.0, tamanho=300)
+    registro.registrar_ferramenta('buscar_municipio', 4.0, tamanho=5000)
+    registro.registrar_ferramenta('buscar_municipio', 8.0, erro=True)
+    ferramenta = registro.instantaneo()['ferramentas']['buscar_municipio']
+    assert (ferramenta['chamadas'], ferramenta['erros']) == (3, 1)
+    assert ferramenta['latencia_ms']['maximo'] == 8.0
+    # Chamadas com erro não contam no tamanho das respostas
+    assert ferramenta['tamanho_caracteres']['contagem'] == 2
+    assert ferramenta['tamanho_caracteres']['faixas'] == {f'<={FAIXAS_TAMANHO[1]}': 1, f'<={FAIXAS_TAMANHO[3]}': 1}
+
+
+def test_nomes_alem_do_limite_vao_para_outras(monkeypatch):
+    monkeypatch.setattr(metricas, 'LIMITE_FERRAMENTAS', 2)
+    registro = Metricas()
+    for nome in ('a', 'b', 'c', 'd', 'a'):
+        registro.registrar_ferramenta(nome, 1.0)
+    ferramentas = registro.instantaneo()['ferramentas']
+    assert {nome: dados['chamadas'] for nome, dados in ferramentas.items()} == \
+        {'a': 2, 'b': 1, metricas.OUTRAS: 2}
+
+
+def test_cargas_somam_as_fases_e_guardam_a_ultima():
+    registro = Metricas()
+    registro.registrar_carga('carga', 100.0, {'municipios': 40.0, 'validadores': 60.0})
+    registro.registrar_carga('recarga', 50.0, {'municipios': 20.0}, sucesso=False)
+    carga = registro.instantaneo({'cache': {'acertos': 3}})
+    assert carga['cache'] == {'acertos': 3}
+    carga = carga['carga']
+    assert {tipo: dados['contagem'] for tipo, dados in carga['duracao_ms'].items()} == {'carga': 1, 'recarga': 1}
+    assert carga['fases_ms']['municipios']['contagem'] == 2
+    assert carga['fases_ms']['validadores']['contagem'] == 1
+    assert carga['ultima']['tipo'] == 'recarga' and carga['ultima']['sucesso'] is False
+    assert carga['ultima']['fases_ms'] == {'municipios': 20.0}
+
+
+def test_instantaneo_e_serializavel():
+    registro = Metricas()
+    registro.registrar_ferramenta('status_dados', 0.3, tamanho=10)
+    registro.registrar_carga('carga', 10.0, {'indices': 1.0})
+    assert json.loads(json.dumps(registro.instantaneo()))['ferramentas']['status_dados']['chamadas'] == 1
+
+
+def test_gravacao_periodica_acrescenta_linhas_e_grava_ao_cancelar(tmp_path):
+    caminho = tmp_path / "metricas.jsonl"
+    coletas = []
+    
+    def coletar():
+        coletas.append(1)
+        return {'coleta': len(coletas)}
+    
+    async def cenario():
+        tarefa = asyncio.ensure_future(gravar_periodicamente(str(caminho), 0.01, coletar))
+        while len(coletas) < 2:
+            await asyncio.sleep(0.005)
+        tarefa.cancel()
+        try:
+            await tarefa
+        except asyncio.CancelledError:
+            pass
+    
+    asyncio.run(cenario())
+    linhas = [json.loads(linha) for linha in caminho.read_text(encoding='utf-8').splitlines()]
+    # O último instantâneo é gravado ao cancelar (uma gravação ainda na fila do
+    # executor é descartada com o cancelamento)
+    assert linhas[0] == {'coleta': 1} and {'coleta': len(coletas)} in linhas
+    assert len(linhas) >= 2
+
+
+def test_erro_de_gravacao_nao_interrompe(tmp_path):
+    caminho = tmp_path / "inexistente" / "metricas.jsonl"
+    coletas = []
+    
+    async def cenario():
+        tarefa = asyncio.ensure_future(gravar_periodicamente(
+            str(caminho), 0.005, lambda: coletas.append(1) or {}))
+        while len(coletas) < 3:
+            await asyncio.sleep(0.005)
+        tarefa.cancel()
+        try:
+            await tarefa
+        except asyncio.CancelledError:
+            pass
+    
+    asyncio.run(cenario())
+    assert not caminho.exists()
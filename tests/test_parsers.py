@@ -0,0 +1,79 @@
+"""Leitura em streaming do TACES06/TFIX105: linhas inválidas vão para o destino de erros"""
+
+import associar_municipios_validadores as amv
+from associar_municipios_validadores import ler_campos, parsear_municipios, parsear_validadores
+from tests.conftest import novo_associador
+
+MUNICIPIO = "SP\t{}\tJACAREI\t35\t\t\t0001\tJacareí\n"
+VALIDADOR = "SP\t{}\tGINFES\tGinfes\t20200101\t510\t" + "N\t" * 11 + "S\t20301231\n"
+
+
+def _arquivo(tmp_path, nome, linhas):
+    caminho = tmp_path / nome
+    caminho.write_text("".join(linhas), encoding='latin-1')
+    return str(caminho)
+
+
+def test_ler_campos_ignora_linhas_em_branco_e_reporta_as_curtas(tmp_path):
+    caminho = _arquivo(tmp_path, "dados.txt", ["a\tb\tc\n", "\n", "   \n", "a\tb\n", "x\ty\tz\tw\n"])
+    erros = []
+    linhas = list(ler_campos(caminho, 3, erros.append))
+    assert [numero for numero, _ in linhas] == [1, 5]
+    assert len(erros) == 1
+    assert (erros[0].numero_linha, erros[0].conteudo) == (4, "a\tb")
+    assert erros[0].motivo == "esperados ao menos 3 campos, encontrados 2"
+    # Sem destino de erros, as linhas inválidas só são ignoradas
+    assert len(list(ler_campos(caminho, 3))) == 2
+
+
+def test_municipio_com_codigo_invalido_vai_para_os_erros(tmp_path):
+    caminho = _arquivo(tmp_path, "TACES06.TXT", [MUNICIPIO.format(1), MUNICIPIO.format("X1"), "SP\t2\n"])
+    erros = []
+    municipios = list(parsear_municipios(caminho, erros.append))
+    assert [(m.cod_estado, m.cod_municipio, m.descricao) for m in municipios] == [("SP", 1, "JACAREI")]
+    assert [(erro.numero_linha, erro.motivo) for erro in erros] == [
+        (2, "código de município inválido: 'X1'"),
+        (3, "esperados ao menos 8 campos, encontrados 2"),
+    ]
+    assert all(erro.arquivo == caminho for erro in erros)
+
+
+def test_validadores_convertidos_e_erros_reportados(tmp_path):
+    caminho = _arquivo(tmp_path, "TFIX105.txt", [VALIDADOR.format(1), VALIDADOR.format("?"), "SP\t1\tX\n"])
+    erros = []
+    validadores = list(parsear_validadores(caminho, erros.append))
+    assert len(validadores) == 1
+    chave, validador = validadores[0]
+    assert chave == ("SP", 1)
+    assert (validador.cod_validador, validador.data_inicial, validador.valid_validador, validador.valid_final) == \
+        ("GINFES", "01/01/2020", "31/12/2030", "S")
+    assert [erro.numero_linha for erro in erros] == [2, 3]
+
+
+def test_associador_conta_todos_os_erros_e_guarda_os_primeiros(tmp_path, monkeypatch):
+    monkeypatch.setattr(amv, 'LIMITE_ERROS_GUARDADOS', 2)
+    municipios = _arquivo(tmp_path, "TACES06.TXT", [MUNICIPIO.format(1)] + ["curta\n"] * 3)
+    validadores = _arquivo(tmp_path, "TFIX105.txt", [VALIDADOR.format(1), "curta\n"])
+    mensagens = []
+    associador = amv.AssociadorMunicipiosValidadores(municipios, validadores, ao_progresso=mensagens.append)
+    assert associador.carregar_dados()
+    assert associador.total_erros_carga == 4
+    assert len(associador.erros_carga) == 2
+    assert f"Linhas inválidas ignoradas em {municipios}: 3" in mensagens
+    assert f"Linhas inválidas ignoradas em {validadores}: 1" in mensagens
+
+
+def test_destino_de_erros_proprio_substitui_o_padrao(tmp_path):
+    municipios = _arquivo(tmp_path, "TACES06.TXT", [MUNICIPIO.format(1), "curta\n"])
+    validadores = _arquivo(tmp_path, "TFIX105.txt", [VALIDADOR.format(1)])
+    erros = []
+    associador = amv.AssociadorMunicipiosValidadores(municipios, validadores, ao_erro=erros.append,
+                                                     ao_progresso=lambda mensagem: None)
+    assert associador.carregar_dados()
+    assert len(erros) == 1 and associador.erros_carga == []
+
+
+def test_presetfiles_sinteticos_sem_erros(presetfiles):
+    associador = novo_associador(*presetfiles)
+    assert associador.carregar_dados()
+    assert associador.total_erros_carga == 0
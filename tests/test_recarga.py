@@ -0,0 +1,71 @@
+"""Recarga a quente: detecção de alterações nos PresetFiles e troca atômica dos dados"""
+
+import asyncio
+import os
+
+from src import mcp_server
+from src.recarga import MonitorFontes
+
+NOVA_LINHA = b"SP\t99999\tMUNICIPIO NOVO\t35\t\t\t9999\tMunicipio Novo\n"
+
+
+def _alterar(arquivo, conteudo=NOVA_LINHA):
+    with open(arquivo, 'ab') as saida:
+        saida.write(conteudo)
+
+
+def test_monitor_confirma_alteracao_estavel(presetfiles):
+    monitor = MonitorFontes(presetfiles)
+    assert not monitor.verificar()
+    _alterar(presetfiles[0])
+    # A primeira verificação só registra a assinatura nova (arquivo pode estar em cópia)
+    assert not monitor.verificar()
+    assert monitor.verificar()
+    assert not monitor.verificar()
+
+
+def test_monitor_aguarda_arquivo_recriado(presetfiles):
+    monitor = MonitorFontes(presetfiles)
+    conteudo = presetfiles[1].read_bytes()
+    os.remove(presetfiles[1])
+    assert not monitor.verificar() and not monitor.verificar()
+    presetfiles[1].write_bytes(conteudo + b"\n")
+    assert not monitor.verificar()
+    assert monitor.verificar()
+
+
+def test_recarga_troca_os_dados_so_quando_a_versao_muda(servidor_sintetico):
+    async def cenario():
+        anterior = await mcp_server.aguardar_associador()
+        resultado = await mcp_server.recarregar_dados()
+        assert resultado == {'recarregado': False, 'versao_dados': anterior.versao_dados}
+        
+        mcp_server._buscar_com_cache(anterior, "municipio novo")
+        _alterar(servidor_sintetico[0])
+        resultado = await mcp_server.recarregar_dados(motivo='teste')
+        return anterior, resultado
+    
+    anterior, resultado = asyncio.run(cenario())
+    novo = mcp_server._associador_cache
+    assert resultado['recarregado'] and resultado['motivo'] == 'teste'
+    assert resultado['versao_anterior'] == anterior.versao_dados != resultado['versao_dados'] == novo.versao_dados
+    # O associador anterior não é alterado: requisições em andamento seguem com ele
+    assert novo is not anterior
+    assert anterior.buscar_municipios("municipio novo") == ([], False)
+    assert novo.buscar_municipios("municipio novo")[1]
+    assert mcp_server._cache_resultados.estatisticas()['invalidacoes'] == 1
+    assert mcp_server._estado_recarga['recargas'] == 1
+
+
+def test_recarga_que_falha_mantem_os_dados_em_uso(servidor_sintetico, monkeypatch):
+    async def cenario():
+        anterior = await mcp_server.aguardar_associador()
+        monkeypatch.setattr(mcp_server, '_carregar_dados', lambda associador: False)
+        return anterior, await mcp_server.recarregar_dados(forcar=True)
+    
+    anterior, resultado = asyncio.run(cenario())
+    assert not resultado['recarregado']
+    assert resultado['erro'] == 'Falha ao ler os arquivos de dados'
+    assert mcp_server._associador_cache is anterior
+    assert mcp_server._estado_recarga['ultima'] is resultado
+
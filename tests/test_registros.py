@@ -0,0 +1,97 @@
+"""Registros compactos (__slots__, leitura por nome) e a visão dos resultados associados"""
+
+import pickle
+import sys
+
+import pytest
+
+from registros import SEM_VALIDADOR, Municipio, RegistroAssociado, RegistroValidador, VisaoResultados, ordinal_data
+
+
+def _validador(codigo, validade=''):
+    return RegistroValidador(codigo, f"Validador {codigo}", '01/01/2020', validade, 'S')
+
+
+@pytest.fixture
+def visao():
+    municipios = {
+        ('SP', 1): Municipio('SP', 1, 'JACAREI'),
+        ('SP', 2): Municipio('SP', 2, 'SANTOS'),
+        ('RJ', 3): Municipio('RJ', 3, 'NITEROI'),
+    }
+    validadores = {
+        ('SP', 1): [_validador('A'), _validador('B', '31/12/2021')],
+        ('RJ', 3): [_validador('C')],
+    }
+    return VisaoResultados(municipios, validadores)
+
+
+def test_registros_sem_dicionario_e_lidos_como_dicts():
+    municipio = Municipio('SP', 1, 'JACAREI')
+    assert not hasattr(municipio, '__dict__')
+    assert municipio['descricao'] == municipio.descricao == 'JACAREI'
+    assert municipio.get('inexistente', '') == ''
+    assert dict(municipio) == {'cod_estado': 'SP', 'cod_municipio': 1, 'descricao': 'JACAREI'}
+    with pytest.raises(KeyError):
+        municipio['inexistente']
+    # Campos internos (ordinais) não aparecem como chaves
+    assert set(_validador('A').keys()) == set(RegistroValidador.CAMPOS)
+
+
+def test_textos_repetidos_sao_internados():
+    codigo = ''.join(['GIN', 'FES'])
+    assert RegistroValidador(codigo, 'x', '', '', 'S').cod_validador is sys.intern('GINFES')
+
+
+def test_datas_convertidas_em_ordinais_e_situacao():
+    validador = _validador('B', '31/12/2021')
+    assert validador.ordinal_validade == ordinal_data('31/12/2021')
+    assert validador.ativo(validador.ordinal_validade - 1)
+    assert not validador.ativo(validador.ordinal_validade)
+    assert _validador('A').ativo(10 ** 6)
+    assert ordinal_data('') == ordinal_data('31/02/2021') == 0
+
+
+def test_igualdade_hash_e_pickle():
+    validador = _validador('A')
+    copia = pickle.loads(pickle.dumps(validador))
+    assert copia == validador and hash(copia) == hash(validador)
+    assert copia.ordinal_inicial == validador.ordinal_inicial
+    assert Municipio('SP', 1, 'X') != Municipio('SP', 2, 'X')
+
+
+def test_visao_equivale_a_lista_materializada(visao):
+    materializada = [
+        {**municipio, **validador}
+        for chave, municipio in visao.municipios.items()
+        for validador in (visao.validadores.get(chave) or [SEM_VALIDADOR])
+    ]
+    assert len(visao) == len(materializada) == 4
+    assert [dict(registro) for registro in visao] == materializada
+    assert [dict(visao[i]) for i in range(len(visao))] == materializada
+    assert [dict(registro) for registro in visao[1:3]] == materializada[1:3]
+    assert dict(visao[-1]) == materializada[-1]
+    assert visao[2]['desc_validador'] == 'SEM VALIDADOR'
+
+
+def test_visao_indice_fora_dos_limites(visao):
+    with pytest.raises(IndexError):
+        visao[4]
+    with pytest.raises(IndexError):
+        visao[-5]
+
+
+def test_registro_associado_referencia_sem_copiar(visao):
+    registro = visao[0]
+    assert isinstance(registro, RegistroAssociado)
+    assert registro.municipio is visao.municipios[('SP', 1)]
+    assert registro.validador is visao.validadores[('SP', 1)][0]
+    assert registro.get('inexistente') is None
+
+
+def test_resultados_reais_cobrem_todos_os_municipios(associador):
+    resultados = associador.resultados
+    assert isinstance(resultados, VisaoResultados)
+    assert len(resultados) == sum(len(associador.validadores.get(chave) or [None])
+                                  for chave in associador.municipios)
+    assert {(r['cod_estado'], r['cod_municipio']) for r in resultados} == set(associador.municipios)
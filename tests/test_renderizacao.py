@@ -0,0 +1,17 @@
+"""Formato das respostas das ferramentas"""
+
+import pytest
+
+from src.renderizacao import FORMATO_JSON, FORMATO_TEXTO, formato_resposta
+
+
+def test_formato_padrao_e_sem_distincao_de_caixa():
+    assert formato_resposta(None) == FORMATO_TEXTO
+    assert formato_resposta('') == FORMATO_TEXTO
+    assert formato_resposta('JSON') == FORMATO_JSON
+
+
+@pytest.mark.parametrize("valor", ['xml', 1, 0, ['json'], {'formato': 'json'}, False])
+def test_formato_invalido(valor):
+    with pytest.raises(ValueError, match="formato inválido"):
+        formato_resposta(valor)
@@ -0,0 +1,70 @@
+"""Totais pré-calculados dos validadores (listagem geral/por UF e participação por UF)"""
+
+import json
+from collections import defaultdict
+
+from indices_busca import ResumoValidadores
+from registros import Municipio, RegistroValidador
+from src import mcp_server
+from src.renderizacao import FORMATO_AMBOS, FORMATO_JSON
+
+
+def _validador(codigo):
+    return RegistroValidador(codigo, f"Validador {codigo}", '', '', 'S')
+
+
+def _resumo():
+    municipios = {chave: Municipio(chave[0], chave[1], f"M{chave[1]}")
+                  for chave in [('SP', 1), ('SP', 2), ('SP', 3), ('SP', 4), ('RJ', 5)]}
+    validadores = {
+        ('SP', 1): [_validador('A'), _validador('A'), _validador('B')],
+        ('SP', 2): [_validador('A')],
+        ('RJ', 5): [_validador('B')],
+        ('MG', 9): [_validador('C')],  # município ausente do TACES06
+    }
+    return ResumoValidadores(validadores, municipios)
+
+
+def test_listagem_geral_e_por_estado():
+    resumo = _resumo()
+    assert resumo.listagem() == [
+        ('A', 'Validador A', ('SP',), 3),
+        ('B', 'Validador B', ('RJ', 'SP'), 2),
+        ('C', 'Validador C', ('MG',), 1),
+    ]
+    assert resumo.listagem('RJ') == [('B', 'Validador B', ('RJ',), 1)]
+    assert resumo.listagem('XX') == []
+
+
+def test_participacao_conta_municipios_distintos_do_taces06():
+    resumo = _resumo()
+    sp = resumo.participacao_estado('SP')
+    assert (sp['municipios'], sp['municipios_com_validador']) == (4, 2)
+    assert [(uso['codigo'], uso['municipios'], uso['participacao'], uso['participacao_com_validador'])
+            for uso in sp['validadores']] == [('A', 2, 0.5, 1.0), ('B', 1, 0.25, 0.5)]
+    assert list(resumo.participacao) == ['RJ', 'SP']
+    assert resumo.participacao_estado('MG') is None
+
+
+def test_listagem_real_igual_a_contagem_direta(associador):
+    contagem = defaultdict(int)
+    estados = defaultdict(set)
+    for (estado, _), registros in associador.validadores.items():
+        for registro in registros:
+            contagem[registro.cod_validador] += 1
+            estados[registro.cod_validador].add(estado)
+    listagem = associador.resumo_validadores.listagem()
+    assert {codigo: (quantidade, estados_linha) for codigo, _, estados_linha, quantidade in listagem} == \
+        {codigo: (quantidade, tuple(sorted(estados[codigo]))) for codigo, quantidade in contagem.items()}
+    quantidades = [linha[3] for linha in listagem]
+    assert quantidades == sorted(quantidades, reverse=True)
+
+
+def test_ferramenta_participacao_validadores(associador):
+    texto, dados = mcp_server.participacao_validadores_tool(" sp ", associador, FORMATO_AMBOS)
+    assert texto.startswith("PARTICIPAÇÃO DOS VALIDADORES POR ESTADO")
+    assert "ESTADO: SP" in texto
+    assert json.loads(dados) == [associador.resumo_validadores.participacao_estado('SP')]
+    todos = json.loads(mcp_server.participacao_validadores_tool(None, associador, FORMATO_JSON)[0])
+    assert [estado['estado'] for estado in todos] == sorted(associador.resumo_validadores.participacao)
+    assert mcp_server.participacao_validadores_tool("XX", associador) == ["Estado 'XX' não encontrado"]
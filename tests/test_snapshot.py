@@ -0,0 +1,98 @@
+"""Snapshot binário: restauração e invalidação por alteração das fontes ou corrupção"""
+
+import os
+
+import pytest
+
+import snapshot_associador
+from snapshot_associador import SnapshotInvalido, caminho_snapshot, carregar_snapshot, salvar_snapshot
+from tests.conftest import novo_associador
+
+
+@pytest.fixture
+def com_snapshot(presetfiles, tmp_path):
+    """(arquivos fonte, diretório do cache, caminho do snapshot) com um snapshot gravado"""
+    cache = tmp_path / "cache"
+    associador = novo_associador(*presetfiles)
+    assert associador.carregar_dados(str(cache))
+    return presetfiles, cache, caminho_snapshot(cache, [str(arquivo) for arquivo in presetfiles])
+
+
+def test_snapshot_restaura_os_mesmos_dados_e_indices(com_snapshot):
+    arquivos, cache, destino = com_snapshot
+    assert destino.exists()
+    lido = novo_associador(*arquivos)
+    lido.carregar_dados()
+    restaurado = novo_associador(*arquivos)
+    assert carregar_snapshot(restaurado, cache) == destino
+    
+    assert restaurado.municipios == lido.municipios
+    assert list(restaurado.resultados) == list(lido.resultados)
+    assert restaurado.indice_nomes == lido.indice_nomes
+    nome = next(iter(lido.indice_nomes))
+    assert restaurado.buscar_municipios(nome[:5]) == lido.buscar_municipios(nome[:5])
+
+
+def test_snapshot_invalido_quando_a_fonte_muda(com_snapshot):
+    (municipios, _), cache, _ = com_snapshot
+    with open(municipios, 'ab') as arquivo:
+        arquivo.write(b"SP\t99999\tMUNICIPIO NOVO\t35\t\t\t9999\tMunicipio Novo\n")
+    
+    with pytest.raises(SnapshotInvalido, match="fontes alteradas"):
+        carregar_snapshot(novo_associador(*com_snapshot[0]), cache)
+    
+    # A carga volta para os arquivos texto e grava um snapshot novo
+    associador = novo_associador(*com_snapshot[0])
+    assert associador.carregar_dados(str(cache))
+    assert 'snapshot' in associador.tempos_carga and 'municipios' in associador.tempos_carga
+    assert associador.buscar_municipios("municipio novo")[1]
+    assert carregar_snapshot(novo_associador(*com_snapshot[0]), cache)
+
+
+def test_so_o_mtime_mudou_o_hash_decide(com_snapshot):
+    arquivos, cache, _ = com_snapshot
+    info = os.stat(arquivos[0])
+    os.utime(arquivos[0], ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+    assert carregar_snapshot(novo_associador(*arquivos), cache)
+
+
+def test_snapshot_corrompido_e_ignorado(com_snapshot):
+    arquivos, cache, destino = com_snapshot
+    conteudo = bytearray(destino.read_bytes())
+    conteudo[-10] ^= 0xFF
+    destino.write_bytes(bytes(conteudo))
+    
+    with pytest.raises(SnapshotInvalido, match="corrompido"):
+        carregar_snapshot(novo_associador(*arquivos), cache)
+    
+    associador = novo_associador(*arquivos)
+    assert associador.carregar_dados(str(cache))
+    assert 'municipios' in associador.tempos_carga
+    assert carregar_snapshot(novo_associador(*arquivos), cache)
+
+
+@pytest.mark.parametrize("conteudo, motivo", [
+    (b"AMVSNAP", "truncado"),
+    (b"OUTROFMT" + bytes(8), "incompat"),
+])
+def test_snapshot_truncado_ou_de_outro_formato(com_snapshot, conteudo, motivo):
+    arquivos, cache, destino = com_snapshot
+    destino.write_bytes(conteudo)
+    with pytest.raises(SnapshotInvalido, match=motivo):
+        carregar_snapshot(novo_associador(*arquivos), cache)
+
+
+def test_snapshot_de_outra_versao(com_snapshot, monkeypatch):
+    arquivos, cache, _ = com_snapshot
+    monkeypatch.setattr(snapshot_associador, 'SNAPSHOT_VERSAO', snapshot_associador.SNAPSHOT_VERSAO + 1)
+    with pytest.raises(SnapshotInvalido):
+        carregar_snapshot(novo_associador(*arquivos), cache)
+
+
+def test_gravacao_atomica_nao_deixa_temporarios(com_snapshot):
+    arquivos, cache, destino = com_snapshot
+    associador = novo_associador(*arquivos)
+    assert carregar_snapshot(associador, cache)
+    salvar_snapshot(associador, cache)
+    assert sorted(cache.iterdir()) == [destino]
+
@@ -0,0 +1,98 @@
+"""Tabelas TFIX/TACES lidas pelo esquema do tfixes.xml"""
+
+from datetime import date
+
+import pytest
+
+from tabelas_tfix import CatalogoTabelas, esquema_tabela, ler_registros, nomes_tabelas
+
+ESQUEMA = """<?xml version="1.0"?>
+<tabelas>
+  <tabela>
+    <nome_tabela>TTEST01</nome_tabela>
+    <nome_tabela_banco>TESTE</nome_tabela_banco>
+    <colunas>
+      <coluna nome='cod_estado' tipo='VARCHAR2' ind_chave='TRUE'/>
+      <coluna nome='ident_estado' tipo='NUMBER' ind_chave='TRUE'/>
+      <coluna nome='codigo' tipo='NUMBER' ind_chave='TRUE'/>
+      <coluna nome='nome' tipo='VARCHAR2' ind_trim='FALSE'/>
+      <coluna nome='indicador' tipo='CHAR'/>
+      <coluna nome='inicio' tipo='DATE'/>
+      <coluna nome='usuario' tipo='VARCHAR2' existe_so_no_banco='TRUE'/>
+    </colunas>
+    <validacoes>
+      <recuperar coluna='1' coluna_ref='0'/>
+    </validacoes>
+  </tabela>
+  <tabela>
+    <nome_tabela>TTEST02</nome_tabela>
+    <colunas><coluna nome='valor' tipo='NUMBER'/></colunas>
+  </tabela>
+</tabelas>
+"""
+
+
+@pytest.fixture
+def diretorio(tmp_path):
+    (tmp_path / "tfixes.xml").write_text(ESQUEMA, encoding='utf-8')
+    (tmp_path / "ttest01.TXT").write_text(
+        "SP\t1\t Jacarei \t S \t20200131\n"
+        "\n"
+        "SP\tX\tInvalido\tN\t20200101\n"
+        "RJ\t2\tNiteroi\tN\t19000101\n"
+        "SP\t1\tDuplicado\tN\n",
+        encoding='latin-1')
+    return tmp_path
+
+
+def test_esquema_posicoes_tipos_e_chave(diretorio):
+    esquema = esquema_tabela('ttest01', diretorio / "tfixes.xml")
+    assert esquema.nome == 'TTEST01' and esquema.nome_banco == 'TESTE'
+    # ident_estado é recuperada no banco a partir de cod_estado; usuario só existe no banco
+    assert [coluna.posicao for coluna in esquema.colunas] == [0, None, 1, 2, 3, 4, None]
+    assert esquema.nomes_chave == ('cod_estado', 'cod_estado', 'codigo')
+    assert esquema.posicao('inicio') == 4
+    with pytest.raises(KeyError):
+        esquema.posicao('usuario')
+    assert esquema_tabela('TTEST01', diretorio / "tfixes.xml") is esquema
+
+
+def test_esquema_inexistente(diretorio):
+    with pytest.raises(KeyError):
+        esquema_tabela('TNADA', diretorio / "tfixes.xml")
+    assert nomes_tabelas(diretorio / "tfixes.xml") == frozenset({'TTEST01', 'TTEST02'})
+
+
+def test_registros_decodificados_e_linhas_invalidas(diretorio):
+    esquema = esquema_tabela('TTEST01', diretorio / "tfixes.xml")
+    erros = []
+    registros = list(ler_registros(esquema, diretorio / "ttest01.TXT", erros.append))
+    assert len(registros) == 3
+    primeiro = registros[0]
+    assert (primeiro.cod_estado, primeiro.codigo, primeiro.nome, primeiro.indicador, primeiro.inicio) == \
+        ('SP', 1, ' Jacarei ', 'S', date(2020, 1, 31))
+    assert primeiro.ident_estado is None and primeiro.usuario is None
+    assert registros[1].inicio is None  # 19000101 = sem data
+    assert registros[2].inicio is None  # campo ausente no fim da linha
+    assert [(erro.numero_linha, erro.motivo) for erro in erros] == [(3, "coluna codigo: could not convert string to float: 'X'")]
+
+
+def test_catalogo_carrega_sob_demanda_e_busca_pela_chave(diretorio):
+    catalogo = CatalogoTabelas(diretorio, diretorio / "tfixes.xml")
+    assert catalogo.tabelas_disponiveis() == ['TTEST01']
+    tabela = catalogo.tabela('ttest01')
+    assert catalogo['TTEST01'] is tabela
+    assert len(tabela) == 3 and len(tabela.erros) == 1
+    assert [registro.nome for registro in tabela.buscar('SP', 'SP', 1)] == [' Jacarei ', 'Duplicado']
+    assert tabela.buscar('MG', 'MG', 9) == []
+    with pytest.raises(FileNotFoundError):
+        catalogo.tabela('TTEST02')
+    with pytest.raises(KeyError):
+        catalogo.tabela('TNADA')
+
+
+def test_catalogo_real_busca_jacarei():
+    catalogo = CatalogoTabelas()
+    assert {'TACES06', 'TFIX105'} <= set(catalogo.tabelas_disponiveis())
+    municipios = catalogo.tabela('TACES06').buscar(24402, 'SP')
+    assert [registro.descricao for registro in municipios] == ['JACAREI']